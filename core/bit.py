@@ -1,6 +1,7 @@
-from typing import List, Dict, Union
+from typing import List, Dict, Union, Optional
 from dataclasses import dataclass, field
 import time
+from core.bit_register import BitRegister
 
 @dataclass
 class BitState:
@@ -10,27 +11,45 @@ class BitState:
     source: str = "manual"
     description: str = ""
 
+# Registro de los bits creados sin registro propio: así un `Bit` suelto es
+# solo una vista y no arrastra palabras, columnas y estadísticas propias
+DEFAULT_BIT_REGISTER = BitRegister()
+
 class Bit:
     """
     Representa un bit clásico con estado y operaciones.
     Incluye registro de cambios y estadísticas.
+    
+    El bit es una vista ligera sobre un `BitRegister`; el valor y el
+    historial se guardan empaquetados en el registro.
     """
     
-    def __init__(self, name: str, initial_state: int = 0):
+    __slots__ = ('name', 'register', 'index')
+    
+    def __init__(self, name: str, initial_state: int = 0,
+                 register: Optional[BitRegister] = None):
         """
         Inicializa un bit.
         
         Args:
             name: Nombre del bit
             initial_state: Estado inicial (0 o 1)
+            register: Registro compartido (si es None se usa DEFAULT_BIT_REGISTER)
         """
         if initial_state not in [0, 1]:
             raise ValueError("El estado debe ser 0 o 1")
             
         self.name = name
-        self._history: List[BitState] = []
-        self._state = BitState(initial_state)
-        self._record_state("initialization")
+        self.register = register if register is not None else DEFAULT_BIT_REGISTER
+        self.index = self.register.add_bit(initial_state)
+        
+    @property
+    def _history(self) -> List[BitState]:
+        """Historial del bit reconstruido desde el registro columnar."""
+        return [
+            BitState(value, timestamp, source, description)
+            for value, timestamp, source, description in self.register.history(self.index)
+        ]
         
     def set_state(self, value: int, source: str = "manual") -> None:
         """
@@ -43,8 +62,7 @@ class Bit:
         if value not in [0, 1]:
             raise ValueError("El estado debe ser 0 o 1")
             
-        self._state = BitState(value, time.time(), source)
-        self._record_state(f"set to {value}")
+        self.register.set(self.index, value, source)
         
     def get_state(self) -> int:
         """
@@ -53,12 +71,11 @@ class Bit:
         Returns:
             int: Estado actual (0 o 1)
         """
-        return self._state.value
+        return self.register.get(self.index)
         
     def toggle(self) -> None:
         """Invierte el estado del bit."""
-        new_value = 1 - self._state.value
-        self.set_state(new_value, "toggle")
+        self.register.toggle(self.index)
         
     def get_history(self) -> List[BitState]:
         """
@@ -67,44 +84,19 @@ class Bit:
         Returns:
             List[BitState]: Historial completo
         """
-        return self._history.copy()
+        return self._history
         
     def get_statistics(self) -> Dict[str, Union[int, float]]:
         """
         Calcula estadísticas del bit.
         
+        Los valores son agregados que el registro mantiene al registrar
+        cada cambio, por lo que la consulta es O(1).
+        
         Returns:
             Dict: Estadísticas de uso
         """
-        if not self._history:
-            return {}
-            
-        # Conteo de estados
-        zeros = sum(1 for state in self._history if state.value == 0)
-        ones = sum(1 for state in self._history if state.value == 1)
-        
-        # Duración total y promedio en cada estado
-        total_time = self._history[-1].timestamp - self._history[0].timestamp
-        time_in_zero = 0
-        time_in_one = 0
-        
-        for i in range(len(self._history) - 1):
-            duration = self._history[i+1].timestamp - self._history[i].timestamp
-            if self._history[i].value == 0:
-                time_in_zero += duration
-            else:
-                time_in_one += duration
-                
-        return {
-            'total_changes': len(self._history) - 1,
-            'zero_count': zeros,
-            'one_count': ones,
-            'total_time': total_time,
-            'time_in_zero': time_in_zero,
-            'time_in_one': time_in_one,
-            'average_time_zero': time_in_zero/zeros if zeros > 0 else 0,
-            'average_time_one': time_in_one/ones if ones > 0 else 0
-        }
+        return self.register.statistics(self.index)
         
     def get_transition_counts(self) -> Dict[str, int]:
         """
@@ -113,14 +105,7 @@ class Bit:
         Returns:
             Dict: Conteo de transiciones
         """
-        transitions = {'0->0': 0, '0->1': 0, '1->0': 0, '1->1': 0}
-        
-        for i in range(len(self._history) - 1):
-            prev = str(self._history[i].value)
-            curr = str(self._history[i+1].value)
-            transitions[f'{prev}->{curr}'] += 1
-            
-        return transitions
+        return self.register.transition_counts(self.index)
         
     def get_stability_metric(self) -> float:
         """
@@ -129,12 +114,13 @@ class Bit:
         Returns:
             float: Métrica entre 0 (inestable) y 1 (estable)
         """
-        if len(self._history) < 2:
+        transitions = self.get_transition_counts()
+        total = sum(transitions.values())
+        if total == 0:
             return 1.0
             
-        changes = sum(1 for i in range(len(self._history)-1)
-                     if self._history[i].value != self._history[i+1].value)
-        return 1 - (changes / (len(self._history) - 1))
+        changes = transitions['0->1'] + transitions['1->0']
+        return 1 - (changes / total)
         
     def get_state_summary(self) -> str:
         """
@@ -145,28 +131,13 @@ class Bit:
         """
         stats = self.get_statistics()
         if not stats:
-            return f"Bit '{self.name}' en estado {self._state.value}"
+            return f"Bit '{self.name}' en estado {self.get_state()}"
             
         return (
             f"Bit '{self.name}':\n"
-            f"  Estado actual: {self._state.value}\n"
+            f"  Estado actual: {self.get_state()}\n"
             f"  Cambios totales: {stats['total_changes']}\n"
             f"  Tiempo en 0: {stats['time_in_zero']:.2f}s\n"
             f"  Tiempo en 1: {stats['time_in_one']:.2f}s\n"
             f"  Estabilidad: {self.get_stability_metric():.2%}"
         )
-        
-    def _record_state(self, description: str) -> None:
-        """
-        Registra un cambio de estado.
-        
-        Args:
-            description: Descripción del cambio
-        """
-        state = BitState(
-            value=self._state.value,
-            timestamp=self._state.timestamp,
-            source=self._state.source,
-            description=description
-        )
-        self._history.append(state)
\ No newline at end of file
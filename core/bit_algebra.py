@@ -61,6 +61,54 @@ class BitAlgebra:
             'overflow': carry
         }
         
+    @staticmethod
+    def quantum_adder_operations(bits1: List[int], bits2: List[int]) -> Dict[str, Union[int, List]]:
+        """
+        Construye el sumador con acarreo en cascada como circuito reversible.
+        
+        Usa Toffoli y CNOT sobre 3n+1 qubits: a (0..n-1), b (n..2n-1) y
+        acarreos c (2n..3n). Al terminar, b contiene la suma y c[n] el
+        desbordamiento, igual que `ripple_carry_adder` (bits de menor peso
+        primero).
+        
+        Args:
+            bits1: Primera lista de bits
+            bits2: Segunda lista de bits
+            
+        Returns:
+            Dict: Operaciones del circuito, número de qubits y posiciones
+            de los qubits de suma y desbordamiento
+        """
+        if len(bits1) != len(bits2):
+            raise ValueError("Las listas deben tener igual longitud")
+        if not all(b in [0,1] for b in bits1 + bits2):
+            raise ValueError("Los bits deben ser 0 o 1")
+            
+        n = len(bits1)
+        a = list(range(n))
+        b = list(range(n, 2*n))
+        c = list(range(2*n, 3*n + 1))
+        
+        # Cargar las entradas
+        operations = [{'type': 'single', 'gate': 'X', 'target': a[i]}
+                      for i in range(n) if bits1[i]]
+        operations += [{'type': 'single', 'gate': 'X', 'target': b[i]}
+                       for i in range(n) if bits2[i]]
+        
+        for i in range(n):
+            # c[i+1] = mayoría(a, b, c[i]);  b[i] = a ⊕ b ⊕ c[i]
+            operations.append({'type': 'three', 'gate': 'TOFFOLI', 'controls': [a[i], b[i]], 'target': c[i+1]})
+            operations.append({'type': 'two', 'gate': 'CNOT', 'control': a[i], 'target': b[i]})
+            operations.append({'type': 'three', 'gate': 'TOFFOLI', 'controls': [c[i], b[i]], 'target': c[i+1]})
+            operations.append({'type': 'two', 'gate': 'CNOT', 'control': c[i], 'target': b[i]})
+            
+        return {
+            'operations': operations,
+            'num_qubits': 3*n + 1,
+            'sum_qubits': b,
+            'overflow_qubit': c[n]
+        }
+        
     @staticmethod
     def multiply_bits(bits1: List[int], bits2: List[int]) -> List[int]:
         """
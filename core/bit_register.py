@@ -0,0 +1,400 @@
+import numpy as np
+import time
+from array import array
+from typing import List, Dict, Sequence, Tuple, Union
+
+_WORD_BITS = 64
+
+class BitRegister:
+    """
+    Registro de bits clásicos empaquetados en palabras uint64.
+
+    Los objetos `Bit` creados sobre el registro son vistas ligeras que solo
+    guardan su índice. El registro de cambios es opcional y columnar: cada
+    columna es un `array` compacto en lugar de un objeto por cambio.
+    """
+
+    def __init__(self, size: int = 0, log_changes: bool = True):
+        """
+        Inicializa un registro con todos los bits a 0.
+
+        Args:
+            size: Número inicial de bits
+            log_changes: Si se guardan los cambios de cada bit
+        """
+        if size < 0:
+            raise ValueError("El tamaño del registro no puede ser negativo")
+        self._size = 0
+        self._words = np.zeros(max(1, -(-size // _WORD_BITS)), dtype=np.uint64)
+        self.log_changes = log_changes
+        # Columnas del registro de cambios
+        self._log_bit = array('q')
+        self._log_value = array('B')
+        self._log_time = array('d')
+        self._log_source = array('H')
+        self._log_description = array('H')
+        # Cadenas internadas de fuentes y descripciones
+        self._labels: List[str] = []
+        self._label_ids: Dict[str, int] = {}
+        self._reset_statistics()
+        for _ in range(size):
+            self.add_bit()
+
+    @classmethod
+    def from_array(cls, values: Sequence[int], log_changes: bool = False) -> 'BitRegister':
+        """
+        Crea un registro a partir de un array de bits.
+
+        Args:
+            values: Valores 0/1 de cada bit
+            log_changes: Si se guardan los cambios de cada bit
+
+        Returns:
+            BitRegister: Registro con los valores indicados
+        """
+        register = cls(log_changes=log_changes)
+        register._load(np.asarray(values, dtype=np.uint8))
+        return register
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def words(self) -> np.ndarray:
+        """Palabras uint64 que contienen los bits (bit 0 en el menos significativo)."""
+        return self._words[:self._num_words()]
+
+    def add_bit(self, value: int = 0, source: str = "manual") -> int:
+        """
+        Añade un bit al final del registro.
+
+        Args:
+            value: Valor inicial (0 o 1)
+            source: Fuente del valor inicial
+
+        Returns:
+            int: Índice del nuevo bit
+        """
+        value = self._check_value(value)
+        if self._size == len(self._words) * _WORD_BITS:
+            # Duplicar capacidad para que añadir bits cueste O(1) amortizado
+            words = np.zeros(2 * len(self._words), dtype=np.uint64)
+            words[:len(self._words)] = self._words
+            self._words = words
+        index = self._size
+        self._size += 1
+        self._write(index, value)
+        self._record(index, value, source, "initialization")
+        return index
+
+    def get(self, index: int) -> int:
+        """
+        Obtiene el valor de un bit.
+
+        Args:
+            index: Índice del bit
+
+        Returns:
+            int: Valor del bit (0 o 1)
+        """
+        self._check_index(index)
+        return (int(self._words[index >> 6]) >> (index & 63)) & 1
+
+    def set(self, index: int, value: int, source: str = "manual") -> None:
+        """
+        Establece el valor de un bit.
+
+        Args:
+            index: Índice del bit
+            value: Nuevo valor (0 o 1)
+            source: Fuente del cambio
+        """
+        self._check_index(index)
+        value = self._check_value(value)
+        self._write(index, value)
+        self._record(index, value, source, f"set to {value}")
+
+    def toggle(self, index: int) -> None:
+        """
+        Invierte un bit.
+
+        Args:
+            index: Índice del bit
+        """
+        self.set(index, 1 - self.get(index), "toggle")
+
+    def to_array(self) -> np.ndarray:
+        """
+        Desempaqueta el registro.
+
+        Returns:
+            np.ndarray: Array uint8 con el valor de cada bit
+        """
+        raw = self.words.astype('<u8').view(np.uint8)
+        return np.unpackbits(raw, bitorder='little')[:self._size]
+
+    def set_array(self, values: Sequence[int], source: str = "register") -> None:
+        """
+        Sobrescribe todos los bits de una vez.
+
+        Args:
+            values: Valores 0/1 de cada bit
+            source: Fuente del cambio
+
+        Raises:
+            ValueError: Si el tamaño no coincide
+        """
+        values = np.asarray(values, dtype=np.uint8)
+        if len(values) != self._size:
+            raise ValueError("El tamaño de los valores no coincide con el registro")
+        self._load(values)
+        if self.log_changes:
+            for index, value in enumerate(values.tolist()):
+                self._record(index, value, source, f"set to {value}")
+
+    def gather(self, indices: Sequence[int]) -> 'BitRegister':
+        """
+        Copia un subconjunto de bits en un registro nuevo.
+
+        Args:
+            indices: Índices de los bits
+
+        Returns:
+            BitRegister: Registro sin historial con los bits seleccionados
+        """
+        return BitRegister.from_array(self.to_array()[list(indices)])
+
+    def scatter(self, indices: Sequence[int], values: 'BitRegister',
+                source: str = "register") -> None:
+        """
+        Escribe los bits de otro registro en las posiciones indicadas.
+
+        Args:
+            indices: Índices destino
+            values: Registro con los valores
+            source: Fuente del cambio
+        """
+        for index, value in zip(indices, values.to_array()):
+            self.set(int(index), int(value), source)
+
+    def count_ones(self) -> int:
+        """
+        Cuenta los bits a 1.
+
+        Returns:
+            int: Número de unos
+        """
+        return int(self.to_array().sum())
+
+    def history(self, index: int) -> List[Tuple[int, float, str, str]]:
+        """
+        Obtiene los cambios registrados de un bit.
+
+        Args:
+            index: Índice del bit
+
+        Returns:
+            List[Tuple[int, float, str, str]]: (valor, instante, fuente, descripción)
+        """
+        self._check_index(index)
+        if not len(self._log_bit):
+            return []
+        rows = np.flatnonzero(np.frombuffer(self._log_bit, dtype=np.int64) == index)
+        return [
+            (self._log_value[r], self._log_time[r],
+             self._labels[self._log_source[r]], self._labels[self._log_description[r]])
+            for r in rows
+        ]
+
+    def statistics(self, index: int) -> Dict[str, Union[int, float]]:
+        """
+        Estadísticas del historial de un bit en tiempo constante.
+
+        Args:
+            index: Índice del bit
+
+        Returns:
+            Dict[str, Union[int, float]]: Conteos y tiempos por estado (vacío
+            si el bit no tiene historial)
+        """
+        self._check_index(index)
+        if index >= len(self._stat_entries) or not self._stat_entries[index]:
+            return {}
+        entries = self._stat_entries[index]
+        ones = self._stat_ones[index]
+        zeros = entries - ones
+        time_in_zero = self._stat_time[2 * index]
+        time_in_one = self._stat_time[2 * index + 1]
+        return {
+            'total_changes': entries - 1,
+            'zero_count': zeros,
+            'one_count': ones,
+            'total_time': self._stat_last[index] - self._stat_first[index],
+            'time_in_zero': time_in_zero,
+            'time_in_one': time_in_one,
+            'average_time_zero': time_in_zero/zeros if zeros > 0 else 0,
+            'average_time_one': time_in_one/ones if ones > 0 else 0
+        }
+
+    def transition_counts(self, index: int) -> Dict[str, int]:
+        """
+        Transiciones entre entradas consecutivas del historial de un bit.
+
+        Args:
+            index: Índice del bit
+
+        Returns:
+            Dict[str, int]: Conteo de transiciones '0->0', '0->1', '1->0', '1->1'
+        """
+        self._check_index(index)
+        transitions = {'0->0': 0, '0->1': 0, '1->0': 0, '1->1': 0}
+        if index < len(self._stat_entries):
+            for key, offset in zip(transitions, range(4)):
+                transitions[key] = self._stat_transitions[4 * index + offset]
+        return transitions
+
+    def clear(self) -> None:
+        """Elimina todos los bits del registro y su registro de cambios."""
+        self._size = 0
+        self._words = np.zeros(1, dtype=np.uint64)
+        self.clear_log()
+
+    def clear_log(self) -> None:
+        """Vacía el registro de cambios y sus estadísticas."""
+        for column in (self._log_bit, self._log_value, self._log_time,
+                       self._log_source, self._log_description):
+            del column[:]
+        self._reset_statistics()
+
+    # Operaciones sobre el registro completo (palabra a palabra)
+    def __invert__(self) -> 'BitRegister':
+        result = self._empty_like()
+        result._words[:] = ~self._words
+        result._mask_tail()
+        return result
+
+    def __and__(self, other: 'BitRegister') -> 'BitRegister':
+        return self._combine(other, np.bitwise_and)
+
+    def __or__(self, other: 'BitRegister') -> 'BitRegister':
+        return self._combine(other, np.bitwise_or)
+
+    def __xor__(self, other: 'BitRegister') -> 'BitRegister':
+        return self._combine(other, np.bitwise_xor)
+
+    def _combine(self, other: 'BitRegister', op) -> 'BitRegister':
+        """Aplica una operación bit a bit entre dos registros del mismo tamaño."""
+        if len(other) != self._size:
+            raise ValueError("Los registros deben tener el mismo tamaño")
+        result = self._empty_like()
+        n = self._num_words()
+        result._words[:n] = op(self._words[:n], other._words[:n])
+        return result
+
+    def _empty_like(self) -> 'BitRegister':
+        """Registro sin historial del mismo tamaño con los bits a 0."""
+        result = BitRegister(log_changes=False)
+        result._words = np.zeros(len(self._words), dtype=np.uint64)
+        result._size = self._size
+        return result
+
+    def _load(self, values: np.ndarray) -> None:
+        """Empaqueta un array de bits en las palabras del registro."""
+        packed = np.packbits(values, bitorder='little')
+        num_words = max(1, -(-len(values) // _WORD_BITS))
+        raw = np.zeros(num_words * 8, dtype=np.uint8)
+        raw[:len(packed)] = packed
+        self._words = raw.view('<u8').astype(np.uint64)
+        self._size = len(values)
+
+    def _mask_tail(self) -> None:
+        """Pone a 0 los bits sin usar de la última palabra y las sobrantes."""
+        n = self._num_words()
+        self._words[n:] = 0
+        tail = self._size & 63
+        if tail and n:
+            self._words[n - 1] &= np.uint64((1 << tail) - 1)
+
+    def _num_words(self) -> int:
+        """Número de palabras ocupadas."""
+        return -(-self._size // _WORD_BITS)
+
+    def _write(self, index: int, value: int) -> None:
+        """Escribe un bit sin registrar el cambio."""
+        word, bit = index >> 6, index & 63
+        current = int(self._words[word])
+        self._words[word] = (current & ~(1 << bit)) | (value << bit)
+
+    def _record(self, index: int, value: int, source: str, description: str) -> None:
+        """
+        Añade un cambio al registro columnar y actualiza las estadísticas.
+
+        Las estadísticas son agregados acumulados por bit, de modo que
+        consultarlas no requiere recorrer el historial.
+        """
+        if not self.log_changes:
+            return
+        now = time.time()
+        if index >= len(self._stat_entries):
+            self._grow_statistics(index + 1)
+        if self._stat_entries[index]:
+            previous = self._stat_last_value[index]
+            self._stat_time[2 * index + previous] += now - self._stat_last[index]
+            self._stat_transitions[4 * index + 2 * previous + value] += 1
+        else:
+            self._stat_first[index] = now
+        self._stat_entries[index] += 1
+        self._stat_ones[index] += value
+        self._stat_last[index] = now
+        self._stat_last_value[index] = value
+
+        self._log_bit.append(index)
+        self._log_value.append(value)
+        self._log_time.append(now)
+        self._log_source.append(self._label_id(source))
+        self._log_description.append(self._label_id(description))
+
+    def _reset_statistics(self) -> None:
+        """Inicializa los agregados de estadísticas por bit."""
+        self._stat_entries = array('q')
+        self._stat_ones = array('q')
+        self._stat_time = array('d')         # 2 por bit: tiempo en 0 y en 1
+        self._stat_first = array('d')
+        self._stat_last = array('d')
+        self._stat_last_value = array('B')
+        self._stat_transitions = array('q')  # 4 por bit: 00, 01, 10, 11
+        self._grow_statistics(self._size)
+
+    def _grow_statistics(self, size: int) -> None:
+        """Amplía los agregados hasta cubrir `size` bits."""
+        extra = size - len(self._stat_entries)
+        if extra <= 0:
+            return
+        self._stat_entries.extend([0] * extra)
+        self._stat_ones.extend([0] * extra)
+        self._stat_time.extend([0.0] * (2 * extra))
+        self._stat_first.extend([0.0] * extra)
+        self._stat_last.extend([0.0] * extra)
+        self._stat_last_value.extend([0] * extra)
+        self._stat_transitions.extend([0] * (4 * extra))
+
+    def _label_id(self, label: str) -> int:
+        """Identificador de una cadena internada."""
+        label_id = self._label_ids.get(label)
+        if label_id is None:
+            label_id = len(self._labels)
+            self._labels.append(label)
+            self._label_ids[label] = label_id
+        return label_id
+
+    def _check_index(self, index: int) -> None:
+        """Valida el índice de un bit."""
+        if not 0 <= index < self._size:
+            raise ValueError(f"Índice de bit {index} fuera de rango")
+
+    @staticmethod
+    def _check_value(value: int) -> int:
+        """Valida un valor de bit."""
+        if value not in [0, 1]:
+            raise ValueError("El estado debe ser 0 o 1")
+        return int(value)
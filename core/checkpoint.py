@@ -0,0 +1,156 @@
+import hashlib
+import numpy as np
+from collections import OrderedDict
+from typing import List, Dict, Optional, Sequence, Tuple, Any
+
+def canonical_operation(op: Dict) -> str:
+    """
+    Forma canónica de una operación (independiente del orden de las claves).
+
+    Args:
+        op: Operación de circuito
+
+    Returns:
+        str: Texto con las claves ordenadas y los ángulos en `repr` exacto
+    """
+    return '{' + ','.join(f'{key}={op[key]!r}' for key in sorted(op)) + '}'
+
+def prefix_hashes(operations: Sequence[Dict], num_qubits: int, precision: str = 'double') -> List[str]:
+    """
+    Hash encadenado de cada prefijo del circuito.
+
+    hashes[k] identifica las k primeras operaciones: cada hash se obtiene del
+    anterior y de la forma canónica de la siguiente operación, de modo que
+    todos los prefijos se calculan en una sola pasada.
+
+    Args:
+        operations: Operaciones del circuito
+        num_qubits: Número de qubits
+        precision: Precisión de la simulación
+
+    Returns:
+        List[str]: len(operations) + 1 hashes hexadecimales
+    """
+    digest = hashlib.blake2b(f'{num_qubits}:{precision}'.encode(), digest_size=16).digest()
+    hashes = [digest.hex()]
+    for op in operations:
+        digest = hashlib.blake2b(digest + canonical_operation(op).encode(), digest_size=16).digest()
+        hashes.append(digest.hex())
+    return hashes
+
+class CheckpointCache:
+    """
+    Caché LRU de vectores de estado indexada por el hash de un prefijo.
+
+    Permite reanudar una simulación desde el prefijo más largo ya calculado,
+    de modo que editar el final de un circuito solo cuesta el sufijo
+    modificado. La memoria total de los estados guardados no supera
+    `max_bytes`.
+
+    Se usa a través de la opción `checkpoints` de `run_circuit`, con una
+    caché de larga duración en el llamador. La aplicación web no la usa:
+    /simulate trabaja con NUM_QUBITS = 2 qubits, donde calcular los hashes
+    de los prefijos cuesta más que repetir la simulación, y sus resultados
+    completos ya se reutilizan con `quantum_simulator.run_cached`.
+    """
+
+    def __init__(self, max_bytes: int = 256 * 2**20):
+        """
+        Crea una caché vacía.
+
+        Args:
+            max_bytes: Presupuesto de memoria para los estados guardados
+        """
+        if max_bytes <= 0:
+            raise ValueError("El presupuesto de memoria debe ser positivo")
+        self.max_bytes = max_bytes
+        self.bytes_used = 0
+        self.hits = 0
+        self.misses = 0
+        self._states: 'OrderedDict[str, np.ndarray]' = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._states)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._states
+
+    def get(self, key: str) -> Optional[np.ndarray]:
+        """
+        Obtiene un estado guardado y lo marca como usado recientemente.
+
+        Args:
+            key: Hash del prefijo
+
+        Returns:
+            Optional[np.ndarray]: Estado (de solo lectura) o None
+        """
+        state = self._states.get(key)
+        if state is None:
+            self.misses += 1
+            return None
+        self._states.move_to_end(key)
+        self.hits += 1
+        return state
+
+    def put(self, key: str, state: np.ndarray) -> bool:
+        """
+        Guarda una copia de solo lectura de un estado.
+
+        Args:
+            key: Hash del prefijo
+            state: Vector de estado
+
+        Returns:
+            bool: False si el estado no cabe en el presupuesto
+        """
+        if state.nbytes > self.max_bytes:
+            return False
+        if key in self._states:
+            self._states.move_to_end(key)
+            return True
+        copy = np.array(state)
+        copy.setflags(write=False)
+        self._states[key] = copy
+        self.bytes_used += copy.nbytes
+        while self.bytes_used > self.max_bytes:
+            _, evicted = self._states.popitem(last=False)
+            self.bytes_used -= evicted.nbytes
+        return True
+
+    def longest_prefix(self, hashes: Sequence[str]) -> Tuple[int, Optional[np.ndarray]]:
+        """
+        Busca el prefijo más largo con un estado guardado.
+
+        Args:
+            hashes: Hashes de los prefijos (ver `prefix_hashes`)
+
+        Returns:
+            Tuple[int, Optional[np.ndarray]]: Número de operaciones del
+            prefijo y su estado (0 y None si no hay ninguno)
+        """
+        for k in range(len(hashes) - 1, 0, -1):
+            if hashes[k] in self._states:
+                return k, self.get(hashes[k])
+        self.misses += 1
+        return 0, None
+
+    def clear(self) -> None:
+        """Vacía la caché."""
+        self._states.clear()
+        self.bytes_used = 0
+
+    def get_summary(self) -> Dict[str, Any]:
+        """
+        Resume el uso de la caché.
+
+        Returns:
+            Dict[str, Any]: Entradas, bytes usados, aciertos y fallos
+        """
+        return {
+            'entries': len(self._states),
+            'bytes_used': self.bytes_used,
+            'max_bytes': self.max_bytes,
+            'hits': self.hits,
+            'misses': self.misses
+        }
@@ -0,0 +1,112 @@
+import numpy as np
+from typing import List, Dict, Optional, Tuple
+from core.state_vector import apply_controlled
+from gates.quantum_gates import operation_controls
+
+# Hasta este número de qubits la comprobación por defecto es exacta
+EXACT_MAX_QUBITS = 10
+
+# Paso compilado: (matriz sin controles, controles, objetivos)
+Step = Tuple[np.ndarray, List[int], List[int]]
+
+def _compile(operations: List[Dict], num_qubits: int) -> List[Step]:
+    """Compila las operaciones y valida sus qubits."""
+    program = []
+    for op in operations:
+        matrix, controls, targets = operation_controls(op)
+        for q in controls + targets:
+            if not 0 <= q < num_qubits:
+                raise ValueError(f"Índice de qubit {q} fuera de rango")
+        program.append((matrix, controls, targets))
+    return program
+
+def _strip_common(ops1: List[Dict], ops2: List[Dict]) -> Tuple[List[Dict], List[Dict]]:
+    """
+    Elimina las operaciones idénticas al principio y al final de ambos circuitos.
+
+    Si U1 = S·R1·P y U2 = S·R2·P, entonces U1 = U2 (salvo fase) si y solo
+    si R1 = R2 (salvo la misma fase), así que basta simular los restos.
+    """
+    start = 0
+    while start < min(len(ops1), len(ops2)) and ops1[start] == ops2[start]:
+        start += 1
+    end = 0
+    while (end < min(len(ops1), len(ops2)) - start
+           and ops1[len(ops1) - 1 - end] == ops2[len(ops2) - 1 - end]):
+        end += 1
+    return ops1[start:len(ops1) - end], ops2[start:len(ops2) - end]
+
+def _apply(state: np.ndarray, program: List[Step], num_qubits: int, inverse: bool = False) -> None:
+    """Aplica in situ el circuito (o su inverso: puertas adjuntas en orden inverso)."""
+    steps = reversed(program) if inverse else program
+    for matrix, controls, targets in steps:
+        if inverse:
+            matrix = matrix.conj().T
+        apply_controlled(state, matrix, controls, targets, num_qubits)
+
+def circuits_equivalent(ops1: List[Dict], ops2: List[Dict], num_qubits: int,
+                        method: str = 'auto', num_states: int = 4, tolerance: float = 1e-8,
+                        up_to_global_phase: bool = False, seed: Optional[int] = None) -> bool:
+    """
+    Comprueba si dos circuitos implementan la misma unitaria.
+
+    Se aplica U2†·U1 a vectores de estado y se comprueba que cada vector
+    vuelve a sí mismo (salvo una fase global común si se permite), de modo
+    que la memoria es O(2^n) y nunca se construye una matriz de 2^n × 2^n.
+    'exact' recorre todos los estados base (veredicto exacto, coste
+    O(2^n) simulaciones); 'random' usa `num_states` estados aleatorios
+    (veredicto probabilístico: dos circuitos distintos coinciden sobre un
+    estado aleatorio con probabilidad nula). Antes se descartan las
+    operaciones comunes al principio y al final de ambos circuitos.
+
+    Args:
+        ops1: Primer circuito
+        ops2: Segundo circuito
+        num_qubits: Número de qubits
+        method: 'exact', 'random' o 'auto' (exacto hasta EXACT_MAX_QUBITS)
+        num_states: Estados aleatorios del método 'random'
+        tolerance: Tolerancia por amplitud
+        up_to_global_phase: Si se ignora una fase global
+        seed: Semilla de los estados aleatorios
+
+    Returns:
+        bool: True si los circuitos son equivalentes
+
+    Raises:
+        ValueError: Si el método no existe o un qubit está fuera de rango
+    """
+    if method == 'auto':
+        method = 'exact' if num_qubits <= EXACT_MAX_QUBITS else 'random'
+    if method not in ('exact', 'random'):
+        raise ValueError(f"Método de comparación {method} no soportado")
+    _compile(ops1 + ops2, num_qubits)  # valida todos los qubits
+    ops1, ops2 = _strip_common(ops1, ops2)
+    if not ops1 and not ops2:
+        return True
+    program1 = _compile(ops1, num_qubits)
+    program2 = _compile(ops2, num_qubits)
+    dim = 2**num_qubits
+    rng = np.random.default_rng(seed)
+    phase = None
+
+    for k in range(dim if method == 'exact' else num_states):
+        if method == 'exact':
+            start = np.zeros(dim, dtype=complex)
+            start[k] = 1
+        else:
+            start = rng.normal(size=dim) + 1j * rng.normal(size=dim)
+            start /= np.linalg.norm(start)
+        state = start.copy()
+        _apply(state, program1, num_qubits)
+        _apply(state, program2, num_qubits, inverse=True)
+        if up_to_global_phase:
+            # La fase la fija el primer estado y debe ser la misma en todos
+            if phase is None:
+                overlap = np.vdot(start, state)
+                if abs(abs(overlap) - 1) > tolerance:
+                    return False
+                phase = overlap / abs(overlap)
+            state = state / phase
+        if not np.allclose(state, start, atol=tolerance):
+            return False
+    return True
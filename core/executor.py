@@ -0,0 +1,259 @@
+import numpy as np
+from typing import List, Dict, Optional, Tuple, Any
+from core.state_vector import StateVectorRegister
+from core.stabilizer import StabilizerTableau, is_clifford_circuit
+from core.mps import MatrixProductState
+from core.sparse_state import SparseStateVector
+from core.memmap_state import MemmapStateVector, MAX_GATE_QUBITS
+from core.parallel_state import SharedMemoryStateVector
+from core.sampling import sample_histogram, histogram_to_counts, counts_from_bit_samples
+from gates.quantum_gates import operation_matrix, operation_controls
+from core.fusion import fuse_gates, merge_diagonal_gates
+from core.checkpoint import CheckpointCache, prefix_hashes
+
+# Backends disponibles (mismos nombres que `HardwareProfile.simulator_backend`)
+BACKENDS = ('statevector', 'stabilizer', 'mps', 'sparse', 'memmap', 'parallel', 'auto')
+
+# Límite de qubits para devolver el vector de estado denso
+MAX_DENSE_OUTPUT_QUBITS = 20
+
+# Límite de qubits para que el backend disperso pase a un vector denso
+MAX_DENSIFY_QUBITS = 28
+
+# Backends densos que aplican la fusión de puertas antes de ejecutar
+FUSION_BACKENDS = ('statevector', 'memmap', 'parallel')
+
+def run_circuit(operations: List[Dict], num_qubits: int, backend: str = 'statevector',
+                shots: int = 0, seed: Optional[int] = None, **options: Any) -> Dict[str, Any]:
+    """
+    Ejecuta un circuito con el backend de simulación elegido.
+
+    Args:
+        operations: Lista de operaciones en el formato de `circuit_operations`
+        num_qubits: Número de qubits
+        backend: 'statevector', 'stabilizer', 'mps', 'sparse', 'memmap',
+            'parallel' o 'auto'
+        shots: Número de mediciones a muestrear (0 para no muestrear)
+        seed: Semilla del generador aleatorio
+        **options: Opciones del backend (p. ej. `max_bond_dim`,
+            `truncation_threshold` para 'mps', `densify_threshold` para
+            'sparse', `memory_budget` y `path` para 'memmap' o `num_workers`
+            para 'parallel'). `precision` ('double' o 'single') fija el tipo de
+            las amplitudes y `norm_tolerance` activa la comprobación de
+            deriva de la norma del vector denso tras cada puerta (sin ella
+            solo se informa `norm_drift`). En los backends densos
+            `fuse` (True por defecto) y `max_fused_qubits` controlan la
+            fusión de puertas, y `max_diagonal_qubits` la unión de rachas
+            de puertas diagonales. En 'statevector' las operaciones
+            'controlled' se aplican sin construir la matriz controlada, y
+            `checkpoints` (una `CheckpointCache`) reanuda la simulación desde
+            el prefijo más largo ya calculado, guardando estados cada
+            `checkpoint_interval` operaciones
+
+    Returns:
+        Dict[str, Any]: Resultado con el backend usado y, según el caso,
+        conteos, vector de estado y métricas de truncación
+
+    Raises:
+        ValueError: Si el backend no existe
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"Backend {backend} no soportado")
+    if backend == 'auto':
+        backend = 'stabilizer' if is_clifford_circuit(operations) else 'statevector'
+
+    rng = np.random.default_rng(seed)
+    precision = options.get('precision', 'double')
+    result: Dict[str, Any] = {'backend': backend, 'num_qubits': num_qubits}
+    if backend != 'stabilizer':
+        result['precision'] = precision
+
+    checkpoints: Optional[CheckpointCache] = options.get('checkpoints')
+    program, gates = None, None
+    if backend in FUSION_BACKENDS and not (backend == 'statevector' and checkpoints is not None):
+        program, fusion = _compile_dense(operations, backend, options)
+        if fusion is not None:
+            result['fusion'] = fusion
+        gates = [(matrix, targets) for matrix, targets, _ in program]
+
+    if backend == 'stabilizer':
+        tableau = StabilizerTableau(num_qubits)
+        tableau.apply_operations(operations)
+        if shots:
+            result['counts'] = counts_from_bit_samples(tableau.sample(shots, rng))
+        return result
+
+    if backend == 'mps':
+        mps = MatrixProductState(
+            num_qubits,
+            max_bond_dim=options.get('max_bond_dim', 64),
+            truncation_threshold=options.get('truncation_threshold', 1e-10),
+            precision=precision
+        )
+        for op in operations:
+            matrix, targets = operation_matrix(op)
+            mps.apply_gate(matrix, targets)
+        result.update(mps.get_summary())
+        if shots:
+            result['counts'] = counts_from_bit_samples(mps.sample(shots, rng))
+        if num_qubits <= MAX_DENSE_OUTPUT_QUBITS:
+            result['state_vector'] = mps.to_statevector()
+        return result
+
+    if backend == 'memmap':
+        with MemmapStateVector(num_qubits, memory_budget=options.get('memory_budget', 2**30),
+                               path=options.get('path'), precision=precision) as state:
+            state.apply_gates(gates)
+            result.update(state.get_summary())
+            if shots:
+                result['counts'] = counts_from_bit_samples(state.sample(shots, rng))
+            if num_qubits <= MAX_DENSE_OUTPUT_QUBITS:
+                result['state_vector'] = state.to_statevector()
+        return result
+
+    if backend == 'parallel':
+        with SharedMemoryStateVector(num_qubits, num_workers=options.get('num_workers'),
+                                     precision=precision) as state:
+            for matrix, targets in gates:
+                state.apply_gate(matrix, targets)
+            state.flush()
+            result.update(state.get_summary())
+            if shots:
+                result['counts'] = counts_from_bit_samples(state.sample(shots, rng))
+            if num_qubits <= MAX_DENSE_OUTPUT_QUBITS:
+                result['state_vector'] = state.to_statevector()
+        return result
+
+    if backend == 'sparse':
+        state = SparseStateVector(
+            num_qubits, densify_threshold=options.get('densify_threshold', 0.1),
+            precision=precision)
+        for op in operations:
+            matrix, targets = operation_matrix(op)
+            state.apply_gate(matrix, targets)
+            if (isinstance(state, SparseStateVector) and state.should_densify()
+                    and num_qubits <= MAX_DENSIFY_QUBITS):
+                # Demasiadas amplitudes: seguir con el vector denso
+                state = state.to_dense()
+        result['densified'] = not isinstance(state, SparseStateVector)
+        if not result['densified']:
+            result['nnz'] = state.nnz
+            if shots:
+                result['counts'] = counts_from_bit_samples(state.sample(shots, rng))
+            if num_qubits <= MAX_DENSE_OUTPUT_QUBITS:
+                result['state_vector'] = state.to_dense().state
+            return result
+        register = state
+    else:
+        register = StateVectorRegister(
+            num_qubits, precision=precision,
+            norm_tolerance=options.get('norm_tolerance'))
+        if checkpoints is not None:
+            _run_with_checkpoints(register, operations, checkpoints, options, result)
+        else:
+            for matrix, targets, controls in program:
+                register.apply_gate(matrix, targets, controls)
+    probabilities = register.probabilities()
+    result['state_vector'] = register.state
+    result['probabilities'] = probabilities
+    result['norm_drift'] = register.norm_drift()
+    if shots:
+        # Un único muestreo vectorizado sobre el vector de probabilidades
+        histogram = sample_histogram(probabilities, shots, rng)
+        result['histogram'] = histogram
+        result['counts'] = histogram_to_counts(histogram, num_qubits)
+    return result
+
+def _compile_dense(operations: List[Dict], backend: str,
+                   options: Dict[str, Any]) -> Tuple[List[Tuple], Optional[Dict[str, int]]]:
+    """
+    Compila las operaciones para un backend denso y aplica la fusión.
+
+    En 'statevector' las operaciones 'controlled' se conservan con sus
+    controles (sin expandir la matriz) y separan los tramos que se fusionan;
+    los demás backends reciben siempre la matriz completa.
+
+    Args:
+        operations: Operaciones del circuito
+        backend: Backend denso
+        options: Opciones de `run_circuit`
+
+    Returns:
+        Tuple[List[Tuple], Optional[Dict[str, int]]]: Lista de (matriz,
+        objetivos, controles) y estadísticas de fusión (None sin fusión)
+    """
+    fuse = options.get('fuse', True)
+    # Fuera de memoria o repartido, una racha diagonal debe caber como una puerta más
+    width = 10 if backend == 'statevector' else MAX_GATE_QUBITS
+    program: List[Tuple] = []
+    fusion = {'original_gates': 0, 'fused_gates': 0, 'sweeps_saved': 0,
+              'diagonal_merged': 0} if fuse else None
+    segment: List[Tuple] = []
+
+    def close_segment() -> None:
+        """Fusiona el tramo pendiente de puertas sin controles."""
+        gates = list(segment)
+        segment.clear()
+        if fuse and gates:
+            gates, stats = fuse_gates(gates, options.get('max_fused_qubits', 2))
+            gates, merged = merge_diagonal_gates(gates, options.get('max_diagonal_qubits', width))
+            fusion['original_gates'] += stats['original_gates']
+            fusion['fused_gates'] += stats['fused_gates'] - merged
+            fusion['sweeps_saved'] += stats['sweeps_saved'] + merged
+            fusion['diagonal_merged'] += merged
+        program.extend((matrix, targets, []) for matrix, targets in gates)
+
+    for op in operations:
+        if backend == 'statevector' and op.get('type') == 'controlled':
+            close_segment()
+            matrix, controls, targets = operation_controls(op)
+            program.append((matrix, targets, controls))
+            if fuse:
+                fusion['original_gates'] += 1
+                fusion['fused_gates'] += 1
+        else:
+            segment.append(operation_matrix(op))
+    close_segment()
+    return program, fusion
+
+def _run_with_checkpoints(register: StateVectorRegister, operations: List[Dict],
+                          checkpoints: CheckpointCache, options: Dict[str, Any],
+                          result: Dict[str, Any]) -> None:
+    """
+    Simula en el registro reanudando desde el prefijo guardado más largo.
+
+    El sufijo pendiente se compila y fusiona por tramos que terminan en
+    los puntos de control (múltiplos de `checkpoint_interval` y el final),
+    y el estado se guarda al acabar cada tramo.
+
+    Args:
+        register: Registro en |0...0⟩
+        operations: Operaciones del circuito
+        checkpoints: Caché de prefijos
+        options: Opciones de `run_circuit`
+        result: Resultado donde se anotan la reanudación y la fusión
+    """
+    interval = options.get('checkpoint_interval', 16)
+    if interval <= 0:
+        raise ValueError("El intervalo entre puntos de control debe ser positivo")
+    hashes = prefix_hashes(operations, register.num_qubits, register.precision)
+    start, state = checkpoints.longest_prefix(hashes)
+    if state is not None:
+        register.load_state(state)
+    stops = list(range(start - start % interval + interval, len(operations), interval))
+    stops.append(len(operations))
+    position = start
+    for stop in stops:
+        if stop <= position:
+            continue
+        program, fusion = _compile_dense(operations[position:stop], 'statevector', options)
+        for matrix, targets, controls in program:
+            register.apply_gate(matrix, targets, controls)
+        if fusion is not None:
+            totals = result.setdefault('fusion', dict.fromkeys(fusion, 0))
+            for key, value in fusion.items():
+                totals[key] += value
+        checkpoints.put(hashes[stop], register.state)
+        position = stop
+    result['resumed_from'] = start
+    result['checkpoints'] = checkpoints.get_summary()
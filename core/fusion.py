@@ -0,0 +1,171 @@
+import numpy as np
+from typing import List, Dict, Tuple, Sequence
+from core.state_vector import apply_matrix, is_diagonal
+from gates.quantum_gates import operation_matrix
+
+Gate = Tuple[np.ndarray, List[int]]
+
+def expand_matrix(matrix: np.ndarray, targets: Sequence[int], qubits: Sequence[int]) -> np.ndarray:
+    """
+    Expresa una puerta sobre un conjunto mayor de qubits.
+
+    Args:
+        matrix: Matriz de la puerta sobre `targets`
+        targets: Qubits de la puerta
+        qubits: Qubits del resultado (deben contener a `targets`)
+
+    Returns:
+        np.ndarray: Matriz 2^u × 2^u sobre `qubits` en ese orden
+    """
+    u = len(qubits)
+    dim = 2**u
+    # Cada fila de la identidad es un vector base: se aplica la puerta a todas a la vez
+    basis = np.eye(dim, dtype=np.result_type(matrix, np.complex64)).reshape(-1)
+    positions = [u + list(qubits).index(t) for t in targets]
+    apply_matrix(basis, matrix, positions, 2 * u)
+    return basis.reshape(dim, dim).T.copy()
+
+def fuse_gates(gates: Sequence[Gate], max_fused_qubits: int = 2) -> Tuple[List[Gate], Dict[str, int]]:
+    """
+    Fusiona puertas consecutivas para reducir los recorridos del vector.
+
+    Las rachas de puertas de un qubit sobre el mismo cable se multiplican
+    en una sola matriz 2×2 y se absorben en la siguiente (o la anterior)
+    puerta de varios qubits que actúe sobre ese cable. Además, una puerta
+    de varios qubits se une al último bloque si ninguna puerta posterior
+    toca sus qubits y la unión no supera `max_fused_qubits`.
+
+    Args:
+        gates: Lista de (matriz, qubits) en orden del circuito
+        max_fused_qubits: Anchura máxima de un bloque fusionado
+
+    Returns:
+        Tuple[List[Gate], Dict[str, int]]: Bloques fusionados y estadísticas
+        (puertas originales, bloques y recorridos ahorrados)
+    """
+    if max_fused_qubits < 1:
+        raise ValueError("La anchura de fusión debe ser al menos 1")
+    blocks: List[Gate] = []
+    pending: Dict[int, np.ndarray] = {}
+    last_block: Dict[int, int] = {}
+
+    def flush(qubit: int) -> None:
+        """Emite como bloque propio la racha pendiente de un qubit."""
+        blocks.append((pending.pop(qubit), [qubit]))
+        last_block[qubit] = len(blocks) - 1
+
+    for matrix, targets in gates:
+        targets = list(targets)
+        if len(targets) == 1:
+            q = targets[0]
+            pending[q] = matrix @ pending[q] if q in pending else matrix
+            continue
+
+        if len(targets) > max_fused_qubits:
+            for q in targets:
+                if q in pending:
+                    flush(q)
+            blocks.append((matrix, targets))
+            for q in targets:
+                last_block[q] = len(blocks) - 1
+            continue
+
+        # Absorber las rachas de un qubit que preceden a la puerta
+        for q in targets:
+            if q in pending:
+                matrix = matrix @ expand_matrix(pending.pop(q), [q], targets)
+
+        # Unir con el último bloque si nada posterior toca sus qubits
+        previous = [last_block[q] for q in targets if q in last_block]
+        if previous:
+            b = max(previous)
+            block_matrix, block_targets = blocks[b]
+            union = block_targets + [q for q in targets if q not in block_targets]
+            if (len(union) <= max_fused_qubits
+                    and all(last_block[q] == b for q in block_targets)):
+                fused = expand_matrix(matrix, targets, union) @ expand_matrix(
+                    block_matrix, block_targets, union)
+                blocks[b] = (fused, union)
+                for q in union:
+                    last_block[q] = b
+                continue
+        blocks.append((matrix, targets))
+        for q in targets:
+            last_block[q] = len(blocks) - 1
+
+    # Las rachas finales se absorben en el último bloque de su cable
+    for q in list(pending):
+        if q in last_block:
+            b = last_block[q]
+            block_matrix, block_targets = blocks[b]
+            blocks[b] = (expand_matrix(pending.pop(q), [q], block_targets) @ block_matrix,
+                         block_targets)
+        else:
+            flush(q)
+
+    stats = {
+        'original_gates': len(gates),
+        'fused_gates': len(blocks),
+        'sweeps_saved': len(gates) - len(blocks)
+    }
+    return blocks, stats
+
+def merge_diagonal_gates(gates: Sequence[Gate], max_diagonal_qubits: int = 10) -> Tuple[List[Gate], int]:
+    """
+    Une las rachas de puertas diagonales consecutivas en un único vector de fases.
+
+    Cada racha se guarda como un vector de 2^u fases sobre la unión de sus
+    qubits (u ≤ `max_diagonal_qubits`), que `apply_matrix` aplica con un solo
+    recorrido. Las fases de cada puerta se colocan en la unión mediante
+    máscaras de índices precalculadas.
+
+    Args:
+        gates: Lista de (matriz, qubits)
+        max_diagonal_qubits: Anchura máxima de una racha diagonal
+
+    Returns:
+        Tuple[List[Gate], int]: Puertas resultantes y recorridos ahorrados
+    """
+    result: List[Gate] = []
+    phases, union, merged = None, [], 0
+    for matrix, targets in gates:
+        if not is_diagonal(matrix):
+            if phases is not None:
+                result.append((phases, union))
+                phases, union = None, []
+            result.append((matrix, list(targets)))
+            continue
+        diagonal = matrix if matrix.ndim == 1 else np.diagonal(matrix)
+        new_union = union + [q for q in targets if q not in union]
+        if phases is not None and len(new_union) <= max_diagonal_qubits:
+            merged += 1
+        else:
+            if phases is not None:
+                result.append((phases, union))
+            phases, new_union = None, list(targets)
+        u = len(new_union)
+        index = np.arange(2**u)
+        local = np.zeros(2**u, dtype=np.int64)
+        for j, q in enumerate(targets):
+            local |= ((index >> (u - 1 - new_union.index(q))) & 1) << (len(targets) - 1 - j)
+        extended = diagonal[local]
+        if phases is not None:
+            # La unión anterior es un prefijo de la nueva
+            extended = extended * phases[index >> (u - len(union))]
+        phases, union = extended, new_union
+    if phases is not None:
+        result.append((phases, union))
+    return result, merged
+
+def fuse_operations(operations: List[Dict], max_fused_qubits: int = 2) -> Tuple[List[Gate], Dict[str, int]]:
+    """
+    Compila y fusiona una lista de operaciones de circuito.
+
+    Args:
+        operations: Operaciones en el formato de `circuit_operations`
+        max_fused_qubits: Anchura máxima de un bloque fusionado
+
+    Returns:
+        Tuple[List[Gate], Dict[str, int]]: Bloques fusionados y estadísticas
+    """
+    return fuse_gates([operation_matrix(op) for op in operations], max_fused_qubits)
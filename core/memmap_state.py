@@ -0,0 +1,241 @@
+import numpy as np
+import os
+import tempfile
+from itertools import product
+from typing import List, Dict, Optional, Sequence, Tuple, Any
+from core.state_vector import apply_matrix
+from core.precision import complex_dtype
+from core.sampling import indices_to_bits
+
+# Mayor número de qubits sobre el que actúa una puerta del circuito (Toffoli)
+MAX_GATE_QUBITS = 3
+
+class MemmapStateVector:
+    """
+    Vector de estado fuera de memoria sobre un fichero `numpy.memmap`.
+
+    Las amplitudes viven en disco y solo se carga en RAM una ventana de
+    2^m amplitudes que cabe en el presupuesto de memoria. Las puertas se
+    agrupan en pasadas: cada pasada recorre el fichero una vez y aplica
+    todas las puertas cuyos qubits caben juntos en la ventana.
+    """
+
+    def __init__(self, num_qubits: int, memory_budget: int = 2**30,
+                 path: Optional[str] = None, precision: str = 'double'):
+        """
+        Crea el fichero e inicializa el estado en |0...0⟩.
+
+        Args:
+            num_qubits: Número de qubits
+            memory_budget: Bytes de RAM disponibles para la ventana de trabajo
+            path: Fichero de amplitudes (None para un fichero temporal)
+            precision: 'double' (complex128) o 'single' (complex64)
+
+        Raises:
+            ValueError: Si el presupuesto no alcanza para aplicar las puertas
+        """
+        if num_qubits <= 0:
+            raise ValueError("El número de qubits debe ser positivo")
+        self.num_qubits = num_qubits
+        self.dtype = complex_dtype(precision)
+        # La ventana se copia a RAM y `apply_matrix` necesita otra del mismo tamaño
+        window = int(np.log2(max(1, memory_budget // (2 * self.dtype.itemsize))))
+        self.window_qubits = min(num_qubits, window)
+        if self.window_qubits < min(num_qubits, MAX_GATE_QUBITS):
+            raise ValueError("El presupuesto de memoria es demasiado pequeño")
+
+        self._owns_file = path is None
+        if path is None:
+            fd, path = tempfile.mkstemp(suffix='.amps')
+            os.close(fd)
+        self.path = path
+        self._data = np.memmap(path, dtype=self.dtype, mode='w+', shape=(2**num_qubits,))
+        self._data[0] = 1
+        self.passes = 0
+        self.gates_applied = 0
+
+    def close(self) -> None:
+        """Libera el fichero (y lo borra si es temporal)."""
+        if self._data is None:
+            return
+        self._data.flush()
+        self._data = None
+        if self._owns_file and os.path.exists(self.path):
+            os.remove(self.path)
+
+    def __enter__(self) -> 'MemmapStateVector':
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def apply_gate(self, matrix: np.ndarray, targets: Sequence[int]) -> None:
+        """
+        Aplica una sola puerta (una pasada completa sobre el fichero).
+
+        Args:
+            matrix: Matriz de la puerta (2^k × 2^k)
+            targets: Qubits sobre los que actúa
+        """
+        self.apply_gates([(matrix, list(targets))])
+
+    def apply_gates(self, gates: Sequence[Tuple[np.ndarray, List[int]]]) -> None:
+        """
+        Aplica una secuencia de puertas minimizando las pasadas sobre el fichero.
+
+        Args:
+            gates: Lista de (matriz, qubits objetivo) en orden del circuito
+
+        Raises:
+            ValueError: Si una puerta actúa sobre demasiados qubits
+        """
+        for matrix, targets in gates:
+            if len(targets) > self.window_qubits:
+                raise ValueError("La puerta no cabe en la ventana de memoria")
+        for batch in self.schedule(gates, self.window_qubits):
+            self._apply_pass(batch)
+
+    @staticmethod
+    def schedule(gates: Sequence[Tuple[np.ndarray, List[int]]],
+                 window_qubits: int) -> List[List[Tuple[np.ndarray, List[int]]]]:
+        """
+        Agrupa las puertas en pasadas respetando sus dependencias.
+
+        Cada pasada admite puertas mientras la unión de sus qubits quepa en
+        la ventana. Una puerta que no cabe se aplaza junto con todas las
+        posteriores que comparten qubits con ella, pero las puertas
+        independientes pueden adelantarse a la pasada actual.
+
+        Args:
+            gates: Puertas en orden del circuito
+            window_qubits: Qubits que caben en la ventana
+
+        Returns:
+            List[List[Tuple[np.ndarray, List[int]]]]: Puertas de cada pasada
+        """
+        remaining = list(gates)
+        passes = []
+        while remaining:
+            current, deferred = [], []
+            window, blocked = set(), set()
+            for gate in remaining:
+                qubits = set(gate[1])
+                if qubits & blocked or len(window | qubits) > window_qubits:
+                    deferred.append(gate)
+                    blocked |= qubits
+                else:
+                    current.append(gate)
+                    window |= qubits
+            passes.append(current)
+            remaining = deferred
+        return passes
+
+    def _apply_pass(self, gates: Sequence[Tuple[np.ndarray, List[int]]]) -> None:
+        """Recorre el fichero una vez aplicando las puertas de una pasada."""
+        n = self.num_qubits
+        active = sorted({t for _, targets in gates for t in targets})
+        # Completar la ventana con los qubits menos significativos (tramos contiguos)
+        window = set(active)
+        for q in range(n - 1, -1, -1):
+            if len(window) >= self.window_qubits:
+                break
+            window.add(q)
+        window = sorted(window)
+        outside = [q for q in range(n) if q not in window]
+        position = {q: i for i, q in enumerate(window)}
+        local_gates = [
+            (matrix.astype(self.dtype, copy=False), [position[t] for t in targets])
+            for matrix, targets in gates
+        ]
+
+        psi = self._data.reshape((2,) * n)
+        for bits in product((0, 1), repeat=len(outside)):
+            index: List[Any] = [slice(None)] * n
+            for q, b in zip(outside, bits):
+                index[q] = b
+            index = tuple(index)
+            local = np.array(psi[index], dtype=self.dtype).reshape(-1)
+            for matrix, targets in local_gates:
+                apply_matrix(local, matrix, targets, len(window))
+            psi[index] = local.reshape((2,) * len(window))
+        self._data.flush()
+        self.passes += 1
+        self.gates_applied += len(gates)
+
+    def _chunks(self):
+        """Recorre el vector en bloques contiguos del tamaño de la ventana."""
+        size = 2**self.window_qubits
+        for start in range(0, len(self._data), size):
+            yield start, np.asarray(self._data[start:start + size])
+
+    def norm(self) -> float:
+        """
+        Calcula la norma del estado por bloques.
+
+        Returns:
+            float: ‖ψ‖
+        """
+        total = sum(np.sum(np.abs(chunk)**2, dtype=np.float64) for _, chunk in self._chunks())
+        return float(np.sqrt(total))
+
+    def sample(self, shots: int, rng: Optional[np.random.Generator] = None) -> np.ndarray:
+        """
+        Muestrea mediciones de todos los qubits con dos recorridos por bloques.
+
+        Primero se reparten las mediciones entre bloques según su peso y
+        después se muestrea dentro de cada bloque.
+
+        Args:
+            shots: Número de muestras
+            rng: Generador aleatorio
+
+        Returns:
+            np.ndarray: Matriz (shots, n) de bits medidos
+        """
+        rng = rng if rng is not None else np.random.default_rng()
+        weights = np.array([np.sum(np.abs(chunk)**2, dtype=np.float64)
+                            for _, chunk in self._chunks()])
+        per_chunk = rng.multinomial(shots, weights / weights.sum())
+        indices = []
+        for (start, chunk), count in zip(self._chunks(), per_chunk):
+            if count:
+                probs = np.abs(chunk).astype(np.float64)**2
+                indices.append(start + rng.choice(len(chunk), size=count, p=probs / probs.sum()))
+        indices = np.concatenate(indices) if indices else np.zeros(0, dtype=np.int64)
+        rng.shuffle(indices)
+        return indices_to_bits(indices, self.num_qubits)
+
+    def amplitude(self, index: int) -> complex:
+        """
+        Lee la amplitud de un estado base.
+
+        Args:
+            index: Índice del estado base
+
+        Returns:
+            complex: Amplitud
+        """
+        return complex(self._data[index])
+
+    def to_statevector(self) -> np.ndarray:
+        """
+        Carga el vector completo en memoria (solo para n pequeño).
+
+        Returns:
+            np.ndarray: Vector de 2^n amplitudes
+        """
+        return np.array(self._data)
+
+    def get_summary(self) -> Dict[str, Any]:
+        """
+        Resume el uso de disco y de pasadas.
+
+        Returns:
+            Dict[str, Any]: Pasadas, puertas, qubits de la ventana y bytes en disco
+        """
+        return {
+            'passes': self.passes,
+            'gates_applied': self.gates_applied,
+            'window_qubits': self.window_qubits,
+            'file_bytes': 2**self.num_qubits * self.dtype.itemsize
+        }
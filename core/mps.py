@@ -0,0 +1,230 @@
+import numpy as np
+from typing import List, Dict, Optional, Sequence
+from core.precision import complex_dtype
+
+class MatrixProductState:
+    """
+    Estado de n qubits como producto de matrices (MPS).
+
+    Cada qubit guarda un tensor (χ_izq, 2, χ_der). Las puertas de dos qubits
+    se aplican con una SVD truncada según `max_bond_dim` y
+    `truncation_threshold`. Cada truncación multiplica la fidelidad
+    estimada por (1 - peso descartado), y `truncation_error` es
+    1 - fidelidad, acotado en [0, 1], para valorar la fiabilidad del
+    resultado.
+
+    Solo se admiten puertas de uno o dos qubits: Toffoli, Fredkin y las
+    operaciones 'controlled' que abarcan más de dos qubits lanzan
+    ValueError, así que `backend='mps'` rechaza esos circuitos.
+    """
+
+    def __init__(self, num_qubits: int, max_bond_dim: int = 64,
+                 truncation_threshold: float = 1e-10, precision: str = 'double'):
+        """
+        Inicializa el MPS en el estado |0...0⟩.
+
+        Args:
+            num_qubits: Número de qubits
+            max_bond_dim: Dimensión máxima de enlace χ
+            truncation_threshold: Peso máximo descartado por SVD
+            precision: 'double' (complex128) o 'single' (complex64)
+        """
+        if num_qubits <= 0:
+            raise ValueError("El número de qubits debe ser positivo")
+        if max_bond_dim < 1:
+            raise ValueError("La dimensión de enlace debe ser al menos 1")
+        self.num_qubits = num_qubits
+        self.max_bond_dim = max_bond_dim
+        self.truncation_threshold = truncation_threshold
+        self.dtype = complex_dtype(precision)
+        self._fidelity = 1.0
+        self.tensors: List[np.ndarray] = []
+        for _ in range(num_qubits):
+            tensor = np.zeros((1, 2, 1), dtype=self.dtype)
+            tensor[0, 0, 0] = 1
+            self.tensors.append(tensor)
+        # Centro de ortogonalidad (forma canónica mixta)
+        self._center = 0
+
+    @property
+    def bond_dimensions(self) -> List[int]:
+        """Dimensiones de los enlaces entre qubits consecutivos."""
+        return [t.shape[2] for t in self.tensors[:-1]]
+
+    @property
+    def fidelity_estimate(self) -> float:
+        """Estimación de la fidelidad: producto de (1 - peso descartado)."""
+        return self._fidelity
+
+    @property
+    def truncation_error(self) -> float:
+        """Error de truncación estimado: 1 - fidelidad estimada."""
+        return 1.0 - self._fidelity
+
+    def apply_single(self, matrix: np.ndarray, q: int) -> None:
+        """
+        Aplica una puerta de un qubit.
+
+        Args:
+            matrix: Matriz 2x2
+            q: Índice del qubit
+        """
+        matrix = matrix.astype(self.dtype, copy=False)
+        self.tensors[q] = np.einsum('ij,ajb->aib', matrix, self.tensors[q])
+
+    def apply_two(self, matrix: np.ndarray, q1: int, q2: int) -> None:
+        """
+        Aplica una puerta de dos qubits (q1 es el primer índice de la matriz).
+
+        Los qubits no adyacentes se acercan con SWAPs y se devuelven a su
+        posición después.
+
+        Args:
+            matrix: Matriz 4x4
+            q1: Primer qubit
+            q2: Segundo qubit
+        """
+        if q1 == q2:
+            raise ValueError("Los qubits deben ser distintos")
+        if q1 > q2:
+            # Reordenar la matriz para que actúe como (q2, q1)
+            matrix = matrix.reshape(2, 2, 2, 2).transpose(1, 0, 3, 2).reshape(4, 4)
+            q1, q2 = q2, q1
+        swap = np.eye(4, dtype=self.dtype)[[0, 2, 1, 3]]
+        for q in range(q2 - 1, q1, -1):
+            self._apply_adjacent(swap, q)
+        self._apply_adjacent(matrix, q1)
+        for q in range(q1 + 1, q2):
+            self._apply_adjacent(swap, q)
+
+    def apply_gate(self, matrix: np.ndarray, targets: Sequence[int]) -> None:
+        """
+        Aplica una puerta de uno o dos qubits.
+
+        Args:
+            matrix: Matriz de la puerta
+            targets: Qubits sobre los que actúa
+
+        Raises:
+            ValueError: Si la puerta actúa sobre más de dos qubits
+        """
+        if len(targets) == 1:
+            self.apply_single(matrix, targets[0])
+        elif len(targets) == 2:
+            self.apply_two(matrix, targets[0], targets[1])
+        else:
+            raise ValueError("El MPS solo admite puertas de uno o dos qubits")
+
+    def sample(self, shots: int, rng: Optional[np.random.Generator] = None) -> np.ndarray:
+        """
+        Muestrea mediciones de todos los qubits sin modificar el estado.
+
+        Con el centro de ortogonalidad en el qubit 0, las probabilidades
+        condicionales se obtienen qubit a qubit, vectorizando sobre las
+        muestras.
+
+        Args:
+            shots: Número de muestras
+            rng: Generador aleatorio
+
+        Returns:
+            np.ndarray: Matriz (shots, n) de bits medidos
+        """
+        rng = rng if rng is not None else np.random.default_rng()
+        self._move_center(0)
+        samples = np.zeros((shots, self.num_qubits), dtype=np.uint8)
+        env = np.ones((shots, 1), dtype=self.dtype)
+        for q, tensor in enumerate(self.tensors):
+            branches = np.einsum('sa,aib->sib', env, tensor)
+            weights = np.sum(np.abs(branches)**2, axis=2)
+            p1 = weights[:, 1] / np.sum(weights, axis=1)
+            bits = (rng.random(shots) < p1).astype(np.uint8)
+            samples[:, q] = bits
+            env = branches[np.arange(shots), bits]
+            env /= np.linalg.norm(env, axis=1, keepdims=True)
+        return samples
+
+    def amplitude(self, bits: Sequence[int]) -> complex:
+        """
+        Calcula la amplitud de un estado base.
+
+        Args:
+            bits: Valor de cada qubit (qubit 0 primero)
+
+        Returns:
+            complex: Amplitud ⟨bits|ψ⟩
+        """
+        env = np.ones(1, dtype=complex)
+        for tensor, b in zip(self.tensors, bits):
+            env = env @ tensor[:, b, :]
+        return complex(env[0])
+
+    def to_statevector(self) -> np.ndarray:
+        """
+        Contrae el MPS en un vector de estado denso (solo para n pequeño).
+
+        Returns:
+            np.ndarray: Vector de 2^n amplitudes
+        """
+        psi = np.ones((1, 1), dtype=self.dtype)
+        for tensor in self.tensors:
+            psi = np.einsum('pa,aib->pib', psi, tensor).reshape(-1, tensor.shape[2])
+        return psi.reshape(-1)
+
+    def _apply_adjacent(self, matrix: np.ndarray, q: int) -> None:
+        """Aplica una puerta 4x4 sobre los qubits adyacentes (q, q+1)."""
+        self._move_center(q)
+        a, b = self.tensors[q], self.tensors[q + 1]
+        chi_l, chi_r = a.shape[0], b.shape[2]
+        theta = np.einsum('aib,bjc->aijc', a, b)
+        matrix = matrix.astype(self.dtype, copy=False)
+        theta = np.einsum('ijkl,aklc->aijc', matrix.reshape(2, 2, 2, 2), theta)
+        u, s, vh = np.linalg.svd(theta.reshape(chi_l * 2, 2 * chi_r), full_matrices=False)
+
+        # Truncar valores singulares según χ máximo y peso descartado
+        weights = s**2
+        total = np.sum(weights)
+        discarded = np.cumsum(weights[::-1])[::-1] / total
+        keep = int(np.sum(discarded > self.truncation_threshold))
+        keep = max(1, min(keep, self.max_bond_dim))
+        self._fidelity *= 1.0 - float(np.sum(weights[keep:]) / total)
+
+        s = s[:keep] / np.linalg.norm(s[:keep])
+        self.tensors[q] = u[:, :keep].reshape(chi_l, 2, keep)
+        self.tensors[q + 1] = (s[:, None] * vh[:keep]).reshape(keep, 2, chi_r)
+        self._center = q + 1
+
+    def _move_center(self, target: int) -> None:
+        """Desplaza el centro de ortogonalidad hasta el qubit indicado."""
+        while self._center < target:
+            q = self._center
+            t = self.tensors[q]
+            chi_l, _, chi_r = t.shape
+            qm, r = np.linalg.qr(t.reshape(chi_l * 2, chi_r))
+            self.tensors[q] = qm.reshape(chi_l, 2, -1)
+            self.tensors[q + 1] = np.einsum('ab,bjc->ajc', r, self.tensors[q + 1])
+            self._center += 1
+        while self._center > target:
+            q = self._center
+            t = self.tensors[q]
+            chi_l, _, chi_r = t.shape
+            qm, r = np.linalg.qr(t.reshape(chi_l, 2 * chi_r).conj().T)
+            self.tensors[q] = qm.conj().T.reshape(-1, 2, chi_r)
+            self.tensors[q - 1] = np.einsum('aib,bc->aic', self.tensors[q - 1], r.conj().T)
+            self._center -= 1
+
+    def get_summary(self) -> Dict[str, float]:
+        """
+        Resume el estado del MPS.
+
+        Returns:
+            Dict[str, float]: Error de truncación (1 - fidelidad), fidelidad
+            estimada, dimensión de enlace máxima y memoria
+        """
+        bonds = self.bond_dimensions
+        return {
+            'truncation_error': self.truncation_error,
+            'fidelity_estimate': self.fidelity_estimate,
+            'max_bond_dimension': max(bonds) if bonds else 1,
+            'memory_bytes': int(sum(t.nbytes for t in self.tensors))
+        }
@@ -0,0 +1,197 @@
+import numpy as np
+from typing import List, Dict, Sequence, Tuple, Union
+from core.state_vector import apply_batch
+from gates.quantum_gates import H, Sdg
+
+# Cambio de base que lleva cada Pauli a Z (U P U† = Z)
+BASIS_ROTATIONS = {'X': H, 'Y': H @ Sdg}
+
+# Término de Pauli: (coeficiente, cadena con un carácter I/X/Y/Z por qubit)
+Term = Tuple[complex, str]
+
+def parity_sum(tensor: np.ndarray, axes: Sequence[int]) -> np.ndarray:
+    """
+    Calcula Σ_i t[i] · (−1)^(suma de los bits de i en `axes`).
+
+    Primero se suman los ejes que no intervienen y después cada eje de
+    paridad se reduce como t[..., 0] − t[..., 1], sin vectores de signos.
+
+    Args:
+        tensor: Tensor (B, 2, ..., 2) con un eje por qubit tras el del lote
+        axes: Qubits de la paridad
+
+    Returns:
+        np.ndarray: Suma con signo, forma (B,)
+    """
+    others = tuple(q + 1 for q in range(tensor.ndim - 1) if q not in axes)
+    reduced = tensor.sum(axis=others) if others else tensor
+    for _ in axes:
+        reduced = reduced[..., 0] - reduced[..., 1]
+    return reduced
+
+class PauliSum:
+    """
+    Observable como suma ponderada de cadenas de Pauli.
+
+    Cada cadena tiene un carácter por qubit (el qubit 0 a la izquierda, como
+    en los resultados de medición) y se guarda como dos máscaras de bits:
+    `x` (qubits con X o Y) y `z` (qubits con Z o Y). Los valores esperados se
+    calculan sobre el vector de estado sin construir ninguna matriz.
+    """
+
+    def __init__(self, terms: Union[Dict[str, complex], Sequence[Term]]):
+        """
+        Crea el observable.
+
+        Args:
+            terms: Diccionario {cadena: coeficiente} o lista de (coeficiente, cadena)
+
+        Raises:
+            ValueError: Si las cadenas no son válidas o tienen longitudes distintas
+        """
+        if isinstance(terms, dict):
+            terms = [(coef, pauli) for pauli, coef in terms.items()]
+        if not terms:
+            raise ValueError("El observable debe tener al menos un término")
+        self.num_qubits = len(terms[0][1])
+        self.terms: List[Term] = []
+        self._masks: List[Tuple[int, int, int]] = []
+        for coef, pauli in terms:
+            pauli = pauli.upper()
+            if len(pauli) != self.num_qubits or set(pauli) - set('IXYZ'):
+                raise ValueError(f"Cadena de Pauli no válida: {pauli}")
+            x_mask = z_mask = 0
+            for q, p in enumerate(pauli):
+                bit = 1 << (self.num_qubits - 1 - q)
+                if p in 'XY':
+                    x_mask |= bit
+                if p in 'ZY':
+                    z_mask |= bit
+            self.terms.append((coef, pauli))
+            self._masks.append((x_mask, z_mask, pauli.count('Y')))
+
+    def __len__(self) -> int:
+        return len(self.terms)
+
+    def group_commuting(self) -> List[List[int]]:
+        """
+        Agrupa los términos que conmutan qubit a qubit.
+
+        Dentro de un grupo cada qubit tiene como mucho un Pauli distinto de
+        I, de modo que un único cambio de base diagonaliza todo el grupo.
+        El agrupamiento es voraz, en el orden de los términos.
+
+        Returns:
+            List[List[int]]: Índices de los términos de cada grupo
+        """
+        groups: List[List[int]] = []
+        bases: List[List[str]] = []
+        for i, (_, pauli) in enumerate(self.terms):
+            for group, basis in zip(groups, bases):
+                if all(p == 'I' or b in ('I', p) for p, b in zip(pauli, basis)):
+                    group.append(i)
+                    for q, p in enumerate(pauli):
+                        if p != 'I':
+                            basis[q] = p
+                    break
+            else:
+                groups.append([i])
+                bases.append(list(pauli))
+        return groups
+
+    def term_expectation(self, state: np.ndarray, index: int) -> np.ndarray:
+        """
+        Valor esperado de un término mediante volteos de bits.
+
+        P|i⟩ = i^{#Y} (−1)^popcount(i & z) |i ⊕ x⟩, así que
+        ⟨ψ|P|ψ⟩ = Σ_i conj(ψ[i ⊕ x]) · i^{#Y} (−1)^popcount(i & z) · ψ[i].
+        El volteo de los bits de x es una vista invertida sobre esos ejes.
+
+        Args:
+            state: Vector de estado (2^n,) o lote (B, 2^n)
+            index: Índice del término
+
+        Returns:
+            np.ndarray: Valor esperado real (escalar o (B,)), sin el coeficiente
+        """
+        n = self.num_qubits
+        x_mask, z_mask, num_y = self._masks[index]
+        psi = state.reshape((-1,) + (2,) * n)
+        flip_axes = [q + 1 for q in range(n) if x_mask >> (n - 1 - q) & 1]
+        flipped = np.flip(psi, axis=flip_axes) if flip_axes else psi
+        z_axes = [q for q in range(n) if z_mask >> (n - 1 - q) & 1]
+        value = np.real(parity_sum(np.conj(flipped) * psi, z_axes) * 1j**num_y)
+        return value if state.ndim > 1 else value[0]
+
+    def apply(self, state: np.ndarray) -> np.ndarray:
+        """
+        Calcula O|ψ⟩ con volteos de bits y cambios de signo.
+
+        Args:
+            state: Vector de estado (2^n,)
+
+        Returns:
+            np.ndarray: Vector O|ψ⟩ (no normalizado)
+
+        Raises:
+            ValueError: Si el estado no tiene 2^n amplitudes
+        """
+        n = self.num_qubits
+        if state.shape != (2**n,):
+            raise ValueError(f"El estado debe tener {2**n} amplitudes")
+        result = np.zeros_like(state)
+        for (coef, pauli), (_, _, num_y) in zip(self.terms, self._masks):
+            term = state.reshape((2,) * n).copy()
+            for q, p in enumerate(pauli):
+                if p in 'ZY':
+                    index = [slice(None)] * n
+                    index[q] = 1
+                    term[tuple(index)] *= -1
+            flip_axes = [q for q, p in enumerate(pauli) if p in 'XY']
+            if flip_axes:
+                term = np.flip(term, axis=flip_axes)
+            result += (coef * 1j**num_y) * term.reshape(-1)
+        return result
+
+    def expectation(self, state: np.ndarray, grouped: bool = True) -> np.ndarray:
+        """
+        Calcula ⟨ψ|O|ψ⟩ exactamente, sin muestrear.
+
+        Con `grouped`, cada grupo de términos que conmutan se evalúa con un
+        solo cambio de base: se rota una copia del estado, se calculan las
+        probabilidades y cada término queda como una paridad de bits.
+
+        Args:
+            state: Vector de estado (2^n,) o lote (B, 2^n)
+            grouped: Si se agrupan los términos que conmutan
+
+        Returns:
+            np.ndarray: Valor esperado (escalar o (B,))
+
+        Raises:
+            ValueError: Si el estado no tiene 2^n amplitudes
+        """
+        n = self.num_qubits
+        if state.shape[-1] != 2**n:
+            raise ValueError(f"El estado debe tener {2**n} amplitudes")
+        if not grouped:
+            return np.real(sum(coef * self.term_expectation(state, i)
+                               for i, (coef, _) in enumerate(self.terms)))
+        states = state.reshape(-1, 2**n)
+        total = np.zeros(len(states), dtype=complex)
+        for group in self.group_commuting():
+            rotated = states.copy()
+            basis: Dict[int, str] = {}
+            for i in group:
+                for q, p in enumerate(self.terms[i][1]):
+                    if p in BASIS_ROTATIONS:
+                        basis[q] = p
+            for q, p in basis.items():
+                apply_batch(rotated, BASIS_ROTATIONS[p].astype(rotated.dtype)[None], [q], n)
+            probs = (np.abs(rotated)**2).reshape((-1,) + (2,) * n)
+            for i in group:
+                coef, pauli = self.terms[i]
+                support = [q for q, p in enumerate(pauli) if p != 'I']
+                total += coef * parity_sum(probs, support)
+        result = np.real(total)
+        return result if state.ndim > 1 else result[0]
@@ -0,0 +1,234 @@
+import numpy as np
+import os
+import multiprocessing
+from multiprocessing import shared_memory
+from typing import List, Dict, Optional, Sequence, Tuple, Any
+from core.state_vector import apply_matrix
+from core.precision import complex_dtype
+from core.sampling import sample_indices, indices_to_bits
+
+# Mayor número de qubits sobre el que actúa una puerta del circuito (Toffoli)
+MAX_GATE_QUBITS = 3
+
+# Vista del vector compartido en cada proceso trabajador
+_worker_state: Dict[str, Any] = {}
+
+def _attach_worker(name: str, size: int, dtype: str) -> None:
+    """Inicializador de los trabajadores: se conecta a la memoria compartida."""
+    # Los trabajadores comparten el resource_tracker del proceso principal,
+    # que es quien libera el bloque en `close()`
+    shm = shared_memory.SharedMemory(name=name)
+    _worker_state['shm'] = shm
+    _worker_state['state'] = np.ndarray((size,), dtype=np.dtype(dtype), buffer=shm.buf)
+
+def _run_task(task: Tuple) -> None:
+    """Ejecuta una tarea sobre la memoria compartida (en un trabajador o en local)."""
+    state = _worker_state['state']
+    _apply_task(state, task)
+
+def _apply_task(state: np.ndarray, task: Tuple) -> None:
+    """
+    Aplica una tarea sobre el vector completo.
+
+    Args:
+        state: Vector de estado compartido
+        task: ('gates', partición, tamaño, qubits locales, puertas) o
+            ('swap', partición 0, partición 1, tamaño, qubits locales, posición)
+    """
+    if task[0] == 'gates':
+        _, part, size, local_qubits, gates = task
+        chunk = state[part * size:(part + 1) * size]
+        for matrix, targets in gates:
+            apply_matrix(chunk, matrix, targets, local_qubits)
+    else:
+        _, part0, part1, size, local_qubits, position = task
+        shape = (2**position, 2, 2**(local_qubits - position - 1))
+        v0 = state[part0 * size:(part0 + 1) * size].reshape(shape)
+        v1 = state[part1 * size:(part1 + 1) * size].reshape(shape)
+        buffer = v0[:, 1, :].copy()
+        v0[:, 1, :] = v1[:, 0, :]
+        v1[:, 0, :] = buffer
+
+class SharedMemoryStateVector:
+    """
+    Vector de estado en memoria compartida repartido entre procesos.
+
+    Los g qubits físicos más significativos son "globales" y eligen la
+    partición; el resto son locales a cada partición. Las puertas sobre
+    qubits locales se aplican en paralelo (una tarea por partición). Para
+    actuar sobre un qubit global se intercambia antes con uno local
+    (intercambio de qubits entre particiones), actualizando la
+    correspondencia lógico→físico en lugar de mover el estado de vuelta.
+    """
+
+    def __init__(self, num_qubits: int, num_workers: Optional[int] = None,
+                 precision: str = 'double'):
+        """
+        Reserva la memoria compartida e inicializa el estado en |0...0⟩.
+
+        Args:
+            num_qubits: Número de qubits
+            num_workers: Procesos trabajadores (por defecto, núcleos disponibles)
+            precision: 'double' (complex128) o 'single' (complex64)
+        """
+        if num_qubits <= 0:
+            raise ValueError("El número de qubits debe ser positivo")
+        self.num_qubits = num_qubits
+        self.dtype = complex_dtype(precision)
+        workers = num_workers or os.cpu_count() or 1
+        # Particiones: potencia de dos, dejando al menos una puerta entera en local
+        self.global_qubits = min(int(np.log2(workers)), max(0, num_qubits - MAX_GATE_QUBITS))
+        self.num_partitions = 2**self.global_qubits
+        self.local_qubits = num_qubits - self.global_qubits
+        self.partition_size = 2**self.local_qubits
+
+        size = 2**num_qubits
+        self._shm = shared_memory.SharedMemory(create=True, size=size * self.dtype.itemsize)
+        self._state = np.ndarray((size,), dtype=self.dtype, buffer=self._shm.buf)
+        self._state[:] = 0
+        self._state[0] = 1
+
+        # physical[q]: posición física del qubit lógico q
+        self.physical = list(range(num_qubits))
+        self._last_use = [0] * num_qubits
+        self._clock = 0
+        self._pending: List[Tuple[np.ndarray, List[int]]] = []
+        self.qubit_swaps = 0
+
+        self._pool = None
+        if self.num_partitions > 1:
+            self._pool = multiprocessing.Pool(
+                self.num_partitions, initializer=_attach_worker,
+                initargs=(self._shm.name, size, self.dtype.str))
+
+    def close(self) -> None:
+        """Detiene los trabajadores y libera la memoria compartida."""
+        if self._shm is None:
+            return
+        if self._pool is not None:
+            self._pool.terminate()
+            self._pool.join()
+            self._pool = None
+        self._state = None
+        self._shm.close()
+        self._shm.unlink()
+        self._shm = None
+
+    def __enter__(self) -> 'SharedMemoryStateVector':
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def apply_gate(self, matrix: np.ndarray, targets: Sequence[int]) -> None:
+        """
+        Aplica una puerta (se acumula hasta el siguiente intercambio o lectura).
+
+        Args:
+            matrix: Matriz de la puerta (2^k × 2^k)
+            targets: Qubits lógicos sobre los que actúa
+        """
+        targets = list(targets)
+        if len(targets) > self.local_qubits:
+            raise ValueError("La puerta no cabe en una partición")
+        self._clock += 1
+        for q in targets:
+            self._last_use[q] = self._clock
+        for q in targets:
+            if self.physical[q] < self.global_qubits:
+                self._swap_to_local(q, targets)
+        local = [self.physical[q] - self.global_qubits for q in targets]
+        self._pending.append((matrix.astype(self.dtype, copy=False), local))
+
+    def flush(self) -> None:
+        """Aplica en paralelo las puertas locales pendientes."""
+        if not self._pending:
+            return
+        gates, self._pending = self._pending, []
+        self._run([
+            ('gates', part, self.partition_size, self.local_qubits, gates)
+            for part in range(self.num_partitions)
+        ])
+
+    def _swap_to_local(self, qubit: int, keep: Sequence[int]) -> None:
+        """
+        Intercambia un qubit global con el qubit local usado hace más tiempo.
+
+        Args:
+            qubit: Qubit lógico que está en posición global
+            keep: Qubits lógicos que deben quedarse en local
+        """
+        self.flush()
+        candidates = [q for q in range(self.num_qubits)
+                      if self.physical[q] >= self.global_qubits and q not in keep]
+        other = min(candidates, key=lambda q: self._last_use[q])
+        g_pos, l_pos = self.physical[qubit], self.physical[other]
+        # Parejas de particiones que solo difieren en el bit global g_pos
+        bit = 1 << (self.global_qubits - 1 - g_pos)
+        tasks = [
+            ('swap', part, part | bit, self.partition_size, self.local_qubits,
+             l_pos - self.global_qubits)
+            for part in range(self.num_partitions) if not part & bit
+        ]
+        self._run(tasks)
+        self.physical[qubit], self.physical[other] = l_pos, g_pos
+        self.qubit_swaps += 1
+
+    def _run(self, tasks: List[Tuple]) -> None:
+        """Ejecuta las tareas en los trabajadores (o en local si no hay)."""
+        if self._pool is None:
+            for task in tasks:
+                _apply_task(self._state, task)
+        else:
+            self._pool.map(_run_task, tasks)
+
+    def to_statevector(self) -> np.ndarray:
+        """
+        Devuelve el vector de estado en el orden lógico de los qubits.
+
+        Returns:
+            np.ndarray: Vector de 2^n amplitudes
+        """
+        self.flush()
+        psi = self._state.reshape((2,) * self.num_qubits)
+        return np.transpose(psi, self.physical).reshape(-1).copy()
+
+    def probabilities(self) -> np.ndarray:
+        """
+        Probabilidades de los estados base en orden lógico.
+
+        Returns:
+            np.ndarray: Vector de probabilidades
+        """
+        return np.abs(self.to_statevector())**2
+
+    def sample(self, shots: int, rng: Optional[np.random.Generator] = None) -> np.ndarray:
+        """
+        Muestrea mediciones de todos los qubits.
+
+        Se muestrea sobre el orden físico y después se reordenan las
+        columnas al orden lógico, sin deshacer los intercambios.
+
+        Args:
+            shots: Número de muestras
+            rng: Generador aleatorio
+
+        Returns:
+            np.ndarray: Matriz (shots, n) de bits medidos
+        """
+        self.flush()
+        indices = sample_indices(np.abs(self._state)**2, shots, rng)
+        return indices_to_bits(indices, self.num_qubits)[:, self.physical]
+
+    def get_summary(self) -> Dict[str, int]:
+        """
+        Resume el reparto del vector.
+
+        Returns:
+            Dict[str, int]: Particiones, qubits globales e intercambios
+        """
+        return {
+            'partitions': self.num_partitions,
+            'global_qubits': self.global_qubits,
+            'qubit_swaps': self.qubit_swaps
+        }
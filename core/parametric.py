@@ -0,0 +1,462 @@
+import numpy as np
+from typing import List, Dict, Optional, Sequence, Tuple, Union, Callable, Any
+from core.state_vector import (apply_batch, apply_controlled, apply_dense, apply_diagonal,
+                                apply_permutation, as_permutation, is_diagonal)
+from core.precision import complex_dtype
+from core.observables import PauliSum
+from core.fusion import fuse_gates, merge_diagonal_gates
+from gates.quantum_gates import (operation_controls, rx_matrix, ry_matrix, u3_matrix,
+                                 rx_batch, ry_batch, u3_batch)
+
+# Claves de ángulo de las operaciones que pueden ser parámetros
+ANGLE_KEYS = ('theta', 'phi', 'lambda')
+
+def _rz_phases(theta: float) -> np.ndarray:
+    """Diagonal de RZ(θ) como vector de fases."""
+    return np.exp(np.array([-0.5j, 0.5j]) * theta)
+
+def _cphase_phases(theta: float) -> np.ndarray:
+    """Diagonal de CPHASE(θ) como vector de fases."""
+    return np.array([1, 1, 1, np.exp(1j * theta)])
+
+def _rz_phases_batch(theta: np.ndarray) -> np.ndarray:
+    """Lote de diagonales de RZ, forma (B, 2)."""
+    return np.exp(np.multiply.outer(theta, np.array([-0.5j, 0.5j])))
+
+def _cphase_phases_batch(theta: np.ndarray) -> np.ndarray:
+    """Lote de diagonales de CPHASE, forma (B, 4)."""
+    phases = np.ones((len(theta), 4), dtype=complex)
+    phases[:, 3] = np.exp(1j * theta)
+    return phases
+
+def _rotation_derivative(builder: Callable[..., np.ndarray]) -> Callable[..., np.ndarray]:
+    """Derivada de una rotación e^{-iθG/2} con G² = I: dU/dθ = U(θ + π) / 2."""
+    return lambda theta: builder(theta + np.pi) / 2
+
+def _cphase_derivative(theta: float) -> np.ndarray:
+    """Derivada de la diagonal de CPHASE."""
+    return np.array([0, 0, 0, 1j * np.exp(1j * theta)])
+
+def _u3_derivative(theta: float, phi: float, lambda_: float, angle: int) -> np.ndarray:
+    """Derivada de U3 respecto de θ (0), φ (1) o λ (2)."""
+    if angle == 0:
+        return u3_matrix(theta + np.pi, phi, lambda_) / 2
+    factor = [[0, 0], [1j, 1j]] if angle == 1 else [[0, 1j], [0, 1j]]
+    return u3_matrix(theta, phi, lambda_) * np.array(factor)
+
+# Derivada de cada constructor respecto de su ángulo `angle`
+DERIVATIVES: Dict[Callable[..., np.ndarray], Callable[..., np.ndarray]] = {
+    rx_matrix: lambda theta, angle: _rotation_derivative(rx_matrix)(theta),
+    ry_matrix: lambda theta, angle: _rotation_derivative(ry_matrix)(theta),
+    _rz_phases: lambda theta, angle: _rotation_derivative(_rz_phases)(theta),
+    _cphase_phases: lambda theta, angle: _cphase_derivative(theta),
+    u3_matrix: _u3_derivative
+}
+
+# Regla de desplazamiento de cuatro términos para generadores con
+# autovalores {0, ±1/2} (rotaciones controladas): (coeficiente, desplazamiento)
+FOUR_TERM_SHIFTS = (
+    ((np.sqrt(2) + 1) / (4 * np.sqrt(2)), np.pi / 2),
+    (-(np.sqrt(2) - 1) / (4 * np.sqrt(2)), 3 * np.pi / 2)
+)
+
+# Constructores vectorizados (un ángulo por elemento del lote) de cada constructor
+BATCH_BUILDERS: Dict[Callable[..., np.ndarray], Callable[..., np.ndarray]] = {
+    rx_matrix: rx_batch, ry_matrix: ry_batch, u3_matrix: u3_batch,
+    _rz_phases: _rz_phases_batch, _cphase_phases: _cphase_phases_batch
+}
+
+# Constructores de las puertas que dependen de ángulos (por puerta o eje)
+ANGLE_GATES: Dict[str, Tuple[Callable[..., np.ndarray], Tuple[str, ...]]] = {
+    'RX': (rx_matrix, ('theta',)),
+    'RY': (ry_matrix, ('theta',)),
+    'RZ': (_rz_phases, ('theta',)),
+    'U3': (u3_matrix, ANGLE_KEYS),
+    'CPHASE': (_cphase_phases, ('theta',))
+}
+
+# Paso compilado: (núcleo, operando fijo o None, objetivos, controles,
+# constructor, índices de parámetros)
+Step = Tuple[Callable[..., None], Optional[np.ndarray], List[int], List[int],
+             Optional[Callable[..., np.ndarray]], Optional[List[Any]]]
+
+def _kernel(matrix: np.ndarray) -> Tuple[Callable[..., None], np.ndarray]:
+    """Elige una vez el núcleo de una puerta fija y su operando (fases, permutación o matriz)."""
+    if is_diagonal(matrix):
+        return apply_diagonal, matrix if matrix.ndim == 1 else np.diagonal(matrix).copy()
+    perm = as_permutation(matrix)
+    if perm is not None:
+        return apply_permutation, perm
+    return apply_dense, matrix
+
+class ParametricCircuit:
+    """
+    Circuito compilado una vez y evaluado con distintos parámetros.
+
+    Los ángulos de una operación (`theta`, `phi`, `lambda`) pueden ser el
+    nombre de un parámetro en lugar de un número. Al compilar se validan
+    las operaciones, se fusionan los tramos fijos entre puertas
+    parametrizadas, se elige el núcleo de cada paso (diagonal, permutación
+    o denso) y se resuelven los índices de qubits y parámetros; al evaluar
+    solo se recalculan las matrices que dependen de los ángulos.
+    """
+
+    def __init__(self, operations: List[Dict], num_qubits: int, fuse: bool = True,
+                 max_fused_qubits: int = 2, precision: str = 'double'):
+        """
+        Compila el circuito.
+
+        Args:
+            operations: Operaciones en el formato de `circuit_operations`
+                (se admiten también las de tipo 'controlled' y la puerta 'U3')
+            num_qubits: Número de qubits
+            fuse: Si se fusionan los tramos de puertas fijas
+            max_fused_qubits: Anchura máxima de un bloque fusionado
+            precision: 'double' (complex128) o 'single' (complex64)
+
+        Raises:
+            ValueError: Si una operación no es válida
+        """
+        if num_qubits <= 0:
+            raise ValueError("El número de qubits debe ser positivo")
+        self.num_qubits = num_qubits
+        self.dtype = complex_dtype(precision)
+        self.parameters: List[str] = []
+        self._steps: List[Step] = []
+        self._index: Dict[str, int] = {}
+        segment: List[Tuple[np.ndarray, List[int]]] = []
+
+        def close_segment() -> None:
+            """Compila (y fusiona) el tramo pendiente de puertas fijas."""
+            gates = list(segment)
+            segment.clear()
+            if fuse and gates:
+                gates, _ = fuse_gates(gates, max_fused_qubits)
+                gates, _ = merge_diagonal_gates(gates)
+            for matrix, targets in gates:
+                kernel, operand = _kernel(matrix)
+                if operand.dtype.kind == 'c':
+                    operand = operand.astype(self.dtype)
+                self._steps.append((kernel, operand, targets, [], None, None))
+
+        for op in operations:
+            names = [op[key] for key in ANGLE_KEYS if isinstance(op.get(key), str)]
+            if not names:
+                matrix, controls, targets = operation_controls(op)
+                self._check_qubits(controls + targets)
+                if controls:
+                    close_segment()
+                    self._steps.append((apply_controlled, matrix.astype(self.dtype),
+                                        targets, controls, None, None))
+                else:
+                    segment.append((matrix, targets))
+                continue
+            close_segment()
+            self._steps.append(self._compile_parametric(op))
+        close_segment()
+
+    @property
+    def num_parameters(self) -> int:
+        """Número de parámetros libres."""
+        return len(self.parameters)
+
+    def _check_qubits(self, qubits: Sequence[int]) -> None:
+        """Valida que los qubits existan y no se repitan."""
+        if len(set(qubits)) != len(qubits):
+            raise ValueError("Los qubits objetivo y de control deben ser distintos")
+        for q in qubits:
+            if not 0 <= q < self.num_qubits:
+                raise ValueError(f"Índice de qubit {q} fuera de rango")
+
+    def _compile_parametric(self, op: Dict) -> Step:
+        """Resuelve el constructor, los qubits y los parámetros de una puerta parametrizada."""
+        gate = op.get('gate', '')
+        if op.get('type') == 'rotation' and op.get('axis'):
+            gate = f"R{op['axis'].upper()}"
+        if gate not in ANGLE_GATES:
+            raise ValueError(f"La puerta {gate} no admite parámetros")
+        builder, keys = ANGLE_GATES[gate]
+        controls = list(op.get('controls', [])) if op.get('type') == 'controlled' else []
+        if gate == 'CPHASE':
+            targets = [op['control'], op['target']]
+        else:
+            targets = list(op['targets']) if 'targets' in op else [op['target']]
+        self._check_qubits(controls + targets)
+        # Cada ángulo es un índice de parámetro (int) o un valor fijo (float)
+        slots: List[Any] = []
+        for key in keys:
+            value = op.get(key, 0.0)
+            if isinstance(value, str):
+                if value not in self._index:
+                    self._index[value] = len(self.parameters)
+                    self.parameters.append(value)
+                slots.append(self._index[value])
+            else:
+                slots.append(float(value))
+        if controls:
+            kernel = apply_controlled
+        elif builder in (_rz_phases, _cphase_phases):
+            kernel = apply_diagonal
+        else:
+            kernel = apply_dense
+        return kernel, None, targets, controls, builder, slots
+
+    def _values(self, values: Union[Sequence[float], Dict[str, float]]) -> np.ndarray:
+        """Convierte los parámetros a un vector en el orden de `parameters`."""
+        if isinstance(values, dict):
+            missing = [name for name in self.parameters if name not in values]
+            if missing:
+                raise ValueError(f"Faltan parámetros: {', '.join(missing)}")
+            return np.array([values[name] for name in self.parameters], dtype=float)
+        values = np.asarray(values, dtype=float)
+        if values.shape != (self.num_parameters,):
+            raise ValueError(f"Se esperaban {self.num_parameters} parámetros")
+        return values
+
+    def run(self, values: Union[Sequence[float], Dict[str, float]] = ()) -> np.ndarray:
+        """
+        Evalúa el circuito para unos parámetros.
+
+        Args:
+            values: Vector de parámetros (orden de `parameters`) o diccionario
+
+        Returns:
+            np.ndarray: Vector de estado final de 2^n amplitudes
+
+        Raises:
+            ValueError: Si faltan parámetros o sobran
+        """
+        values = self._values(values)
+        n = self.num_qubits
+        state = np.zeros(2**n, dtype=self.dtype)
+        state[0] = 1
+        for kernel, operand, targets, controls, builder, slots in self._steps:
+            if builder is not None:
+                angles = [values[s] if isinstance(s, int) else s for s in slots]
+                operand = builder(*angles).astype(self.dtype, copy=False)
+            if controls:
+                kernel(state, operand, controls, targets, n)
+            else:
+                kernel(state, operand, targets, n)
+        return state
+
+    def probabilities(self, values: Union[Sequence[float], Dict[str, float]] = ()) -> np.ndarray:
+        """
+        Probabilidades de los estados base para unos parámetros.
+
+        Args:
+            values: Vector de parámetros o diccionario
+
+        Returns:
+            np.ndarray: Vector de 2^n probabilidades
+        """
+        return np.abs(self.run(values))**2
+
+    def _batch_values(self, values: np.ndarray) -> np.ndarray:
+        """Valida un lote de vectores de parámetros, forma (B, P)."""
+        values = np.asarray(values, dtype=float)
+        if values.ndim != 2 or values.shape[1] != self.num_parameters:
+            raise ValueError(f"El lote debe tener forma (B, {self.num_parameters})")
+        return values
+
+    def _occurrences(self) -> List[Tuple[int, bool]]:
+        """Parámetro y si la puerta es controlada para cada ángulo parametrizado, en orden."""
+        return [(slot, bool(controls))
+                for _, _, _, controls, builder, slots in self._steps if builder is not None
+                for slot in slots if isinstance(slot, int)]
+
+    def expectation(self, observable: PauliSum,
+                    values: Union[Sequence[float], Dict[str, float]] = ()) -> float:
+        """
+        Valor esperado exacto de un observable en el estado final.
+
+        Args:
+            observable: Suma de cadenas de Pauli
+            values: Vector de parámetros o diccionario
+
+        Returns:
+            float: ⟨ψ(θ)|O|ψ(θ)⟩
+        """
+        return float(observable.expectation(self.run(values)))
+
+    def gradient(self, observable: PauliSum, values: Union[Sequence[float], Dict[str, float]] = (),
+                 method: str = 'adjoint') -> Tuple[float, np.ndarray]:
+        """
+        Calcula el valor esperado y su gradiente respecto de los parámetros.
+
+        'adjoint' recorre el circuito hacia atrás con dos vectores
+        (|ψ⟩ y O|ψ⟩), deshaciendo cada puerta; cada ángulo aporta
+        2·Re⟨λ|∂U|ψ⟩. El coste total es de unas tres pasadas hacia delante.
+        'parameter_shift' evalúa todos los circuitos desplazados en un solo
+        lote con `run_batch` (regla de cuatro términos para las rotaciones
+        controladas).
+
+        Args:
+            observable: Suma de cadenas de Pauli
+            values: Vector de parámetros o diccionario
+            method: 'adjoint' o 'parameter_shift'
+
+        Returns:
+            Tuple[float, np.ndarray]: Valor esperado y gradiente (P,)
+
+        Raises:
+            ValueError: Si el método no existe
+        """
+        values = self._values(values)
+        if method == 'adjoint':
+            return self._adjoint_gradient(observable, values)
+        if method == 'parameter_shift':
+            return self._shift_gradient(observable, values)
+        raise ValueError(f"Método de gradiente {method} no soportado")
+
+    def _adjoint_gradient(self, observable: PauliSum, values: np.ndarray) -> Tuple[float, np.ndarray]:
+        """Diferenciación adjunta: un recorrido hacia delante y otro hacia atrás."""
+        n = self.num_qubits
+        psi = self.run(values)
+        lam = observable.apply(psi)
+        value = float(np.real(np.vdot(psi, lam)))
+        grad = np.zeros(self.num_parameters)
+        for kernel, operand, targets, controls, builder, slots in reversed(self._steps):
+            if builder is not None:
+                angles = [values[s] if isinstance(s, int) else s for s in slots]
+                operand = builder(*angles).astype(self.dtype, copy=False)
+            # Deshacer la puerta sobre |ψ⟩: U† (o la permutación inversa)
+            inverse = np.argsort(operand) if kernel is apply_permutation else operand.conj().T
+            if controls:
+                kernel(psi, inverse, controls, targets, n)
+            else:
+                kernel(psi, inverse, targets, n)
+            if builder is not None:
+                for angle, slot in enumerate(slots):
+                    if not isinstance(slot, int):
+                        continue
+                    derivative = DERIVATIVES[builder](*angles, angle).astype(self.dtype)
+                    mu = psi.copy()
+                    if controls:
+                        # ∂(CU) = |1..1⟩⟨1..1| ⊗ ∂U: anular la parte sin controles activos
+                        tensor = mu.reshape((2,) * n)
+                        for c in controls:
+                            index: List[Any] = [slice(None)] * n
+                            index[c] = 0
+                            tensor[tuple(index)] = 0
+                        apply_controlled(mu, derivative, controls, targets, n)
+                    elif derivative.ndim == 1:
+                        apply_diagonal(mu, derivative, targets, n)
+                    else:
+                        apply_dense(mu, derivative, targets, n)
+                    grad[slot] += 2 * np.real(np.vdot(lam, mu))
+            if controls:
+                kernel(lam, inverse, controls, targets, n)
+            else:
+                kernel(lam, inverse, targets, n)
+        return value, grad
+
+    def _shift_gradient(self, observable: PauliSum, values: np.ndarray) -> Tuple[float, np.ndarray]:
+        """Regla de desplazamiento de parámetros evaluada en un único lote."""
+        occurrences = self._occurrences()
+        rows: List[np.ndarray] = [np.zeros(len(occurrences))]
+        weights: List[Tuple[int, float]] = [(-1, 1.0)]
+        for o, (param, controlled) in enumerate(occurrences):
+            rules = FOUR_TERM_SHIFTS if controlled else ((0.5, np.pi / 2),)
+            for coef, shift in rules:
+                for sign in (1, -1):
+                    row = np.zeros(len(occurrences))
+                    row[o] = sign * shift
+                    rows.append(row)
+                    weights.append((param, sign * coef))
+        batch = np.repeat(values[None], len(rows), axis=0)
+        results = observable.expectation(self.run_batch(batch, shifts=np.array(rows)))
+        grad = np.zeros(self.num_parameters)
+        for (param, coef), result in zip(weights[1:], results[1:]):
+            grad[param] += coef * result
+        return float(results[0]), grad
+
+    def run_batch(self, values: np.ndarray, shifts: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Evalúa el circuito para B vectores de parámetros en una sola pasada.
+
+        Los estados se guardan como una matriz (B, 2^n); cada puerta
+        parametrizada se aplica como un lote de matrices (o diagonales), una
+        por fila, y las puertas fijas se difunden sobre todo el lote.
+
+        Args:
+            values: Parámetros, forma (B, P) en el orden de `parameters`
+            shifts: Desplazamientos opcionales de cada ángulo parametrizado,
+                forma (B, A) en el orden de aparición en el circuito
+
+        Returns:
+            np.ndarray: Estados finales, forma (B, 2^n)
+
+        Raises:
+            ValueError: Si el lote no tiene la forma esperada
+        """
+        values = self._batch_values(values)
+        batch, n = len(values), self.num_qubits
+        states = np.zeros((batch, 2**n), dtype=self.dtype)
+        states[:, 0] = 1
+        occurrence = 0
+        for kernel, operand, targets, controls, builder, slots in self._steps:
+            if builder is not None:
+                angles = []
+                for s in slots:
+                    if not isinstance(s, int):
+                        angles.append(np.full(batch, s))
+                        continue
+                    angle = values[:, s]
+                    if shifts is not None:
+                        angle = angle + shifts[:, occurrence]
+                    angles.append(angle)
+                    occurrence += 1
+                operands = BATCH_BUILDERS[builder](*angles).astype(self.dtype, copy=False)
+            elif kernel is apply_permutation:
+                dim = len(operand)
+                operands = np.zeros((1, dim, dim), dtype=self.dtype)
+                operands[0, operand, np.arange(dim)] = 1
+            else:
+                operands = operand[None]
+            apply_batch(states, operands, targets, n, controls)
+        return states
+
+    def probabilities_batch(self, values: np.ndarray) -> np.ndarray:
+        """
+        Probabilidades de los estados base para un lote de parámetros.
+
+        Args:
+            values: Parámetros, forma (B, P)
+
+        Returns:
+            np.ndarray: Probabilidades, forma (B, 2^n)
+        """
+        return np.abs(self.run_batch(values))**2
+
+    def z_expectations_batch(self, values: np.ndarray) -> np.ndarray:
+        """
+        Valores esperados ⟨Z_q⟩ de cada qubit para un lote de parámetros.
+
+        Args:
+            values: Parámetros, forma (B, P)
+
+        Returns:
+            np.ndarray: Valores esperados, forma (B, n)
+        """
+        n = self.num_qubits
+        probs = self.probabilities_batch(values).reshape((-1,) + (2,) * n)
+        result = np.empty((probs.shape[0], n))
+        for q in range(n):
+            marginal = probs.sum(axis=tuple(a + 1 for a in range(n) if a != q))
+            result[:, q] = marginal[:, 0] - marginal[:, 1]
+        return result
+
+    def get_summary(self) -> Dict[str, int]:
+        """
+        Resume la compilación.
+
+        Returns:
+            Dict[str, int]: Qubits, parámetros, pasos y puertas parametrizadas
+        """
+        return {
+            'num_qubits': self.num_qubits,
+            'num_parameters': self.num_parameters,
+            'steps': len(self._steps),
+            'parametric_gates': sum(1 for step in self._steps if step[4] is not None)
+        }
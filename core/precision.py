@@ -0,0 +1,24 @@
+import numpy as np
+
+# Precisiones de simulación disponibles y su tipo complejo
+PRECISIONS = {
+    'double': np.dtype(np.complex128),
+    'single': np.dtype(np.complex64)
+}
+
+def complex_dtype(precision: str) -> np.dtype:
+    """
+    Obtiene el tipo complejo de una precisión.
+
+    Args:
+        precision: 'double' (complex128) o 'single' (complex64)
+
+    Returns:
+        np.dtype: Tipo de las amplitudes
+
+    Raises:
+        ValueError: Si la precisión no existe
+    """
+    if precision not in PRECISIONS:
+        raise ValueError(f"Precisión {precision} no soportada")
+    return PRECISIONS[precision]
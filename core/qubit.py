@@ -1,26 +1,65 @@
 import numpy as np
-from typing import List, Set, Dict, Optional
-import random
+from collections import deque
+from typing import List, Set, Dict, Optional, Deque
+from core.state_vector import StateVectorRegister
+from gates.gate_registry import GATE_REGISTRY
 
 class Qubit:
-    """Representa un qubit con estado y operaciones cuánticas."""
+    """
+    Representa un qubit con estado y operaciones cuánticas.
     
-    def __init__(self, name: str):
+    El qubit es una vista ligera sobre un `StateVectorRegister` compartido;
+    solo guarda su índice dentro del registro.
+    
+    El historial admite tres políticas según `history_size`: completo
+    (None), desactivado (0) o búfer circular con las últimas N entradas.
+    Cada entrada guarda solo la matriz de densidad reducida 2×2 (un
+    recorrido del vector, sin diagonalizar); el estado, las probabilidades
+    y las coordenadas de Bloch se calculan al consultar `get_history()`.
+    """
+    
+    def __init__(self, name: str, register: Optional[StateVectorRegister] = None,
+                 history_size: Optional[int] = None):
         """
         Inicializa un qubit en estado |0⟩.
         
         Args:
             name: Nombre del qubit
+            register: Registro compartido (si es None se crea uno propio)
+            history_size: Entradas de historial a conservar (None para
+                todas, 0 para desactivarlo)
         """
         self.name = name
-        self._state = np.array([1, 0], dtype=complex)
+        self.register = register if register is not None else StateVectorRegister(renormalize_interval=64)
+        self.index = self.register.add_qubit()
         self.entangled_with: Set[str] = set()
-        self._history: List[Dict] = []
+        self._history: Deque[Dict] = deque()
+        self.set_history_size(history_size)
+        
+    @property
+    def history_size(self) -> Optional[int]:
+        """Número máximo de entradas del historial (None si no hay límite)."""
+        return self._history.maxlen
+        
+    def set_history_size(self, history_size: Optional[int]) -> None:
+        """
+        Cambia la política de historial conservando las entradas más recientes.
+        
+        Args:
+            history_size: Entradas a conservar (None para todas, 0 para
+                desactivar el historial)
+        
+        Raises:
+            ValueError: Si el tamaño es negativo
+        """
+        if history_size is not None and history_size < 0:
+            raise ValueError("El tamaño del historial no puede ser negativo")
+        self._history = deque(self._history, maxlen=history_size)
         
     @property
     def state(self) -> np.ndarray:
-        """Estado actual del qubit."""
-        return self._state
+        """Estado actual del qubit (reducido si está entrelazado)."""
+        return self.register.qubit_state(self.index)
         
     @state.setter
     def state(self, new_state: np.ndarray):
@@ -43,7 +82,7 @@ class Qubit:
         if not np.isclose(np.linalg.norm(new_state), 1):
             raise ValueError("El estado debe estar normalizado")
             
-        self._state = new_state.astype(complex)
+        self.register.set_qubit_state(self.index, new_state.astype(complex))
         self._log_state_change()
         
     def apply_gate(self, gate: np.ndarray) -> None:
@@ -56,19 +95,20 @@ class Qubit:
         Raises:
             ValueError: Si la puerta no es válida
         """
-        if not isinstance(gate, np.ndarray):
-            raise ValueError("La puerta debe ser un array numpy")
-            
-        if gate.shape != (2, 2):
-            raise ValueError("La puerta debe ser 2x2")
+        # Las puertas del registro ya están validadas: solo queda el producto
+        if not GATE_REGISTRY.is_validated(gate):
+            if not isinstance(gate, np.ndarray):
+                raise ValueError("La puerta debe ser un array numpy")
+                
+            if gate.shape != (2, 2):
+                raise ValueError("La puerta debe ser 2x2")
+                
+            # Verificar unitariedad
+            if not np.allclose(gate @ gate.conj().T, np.eye(2)):
+                raise ValueError("La puerta debe ser unitaria")
             
-        # Verificar unitariedad
-        if not np.allclose(gate @ gate.conj().T, np.eye(2)):
-            raise ValueError("La puerta debe ser unitaria")
-            
-        self._state = gate @ self._state
-        # Asegurar normalización después de la operación
-        self._state = self._state / np.linalg.norm(self._state)
+        # La renormalización periódica la decide el registro
+        self.register.apply_gate(gate, [self.index])
         self._log_gate_application(gate)
         
     def measure(self) -> int:
@@ -78,14 +118,10 @@ class Qubit:
         Returns:
             int: Resultado de la medición (0 o 1)
         """
-        prob_0 = abs(self._state[0])**2
-        outcome = 0 if random.random() < prob_0 else 1
-        
-        # Colapsar estado
-        self._state = np.array([1, 0], dtype=complex) if outcome == 0 \
-                     else np.array([0, 1], dtype=complex)
-                     
-        self._log_measurement(outcome)
+        state_before = self.get_density_matrix() if self._recording else None
+        # Medir y colapsar el registro compartido
+        outcome = self.register.measure(self.index)
+        self._log_measurement(outcome, state_before)
         return outcome
         
     def get_bloch_coords(self) -> Dict[str, float]:
@@ -95,26 +131,22 @@ class Qubit:
         Returns:
             Dict[str, float]: Coordenadas x, y, z
         """
-        # Calcular matrices de Pauli
-        sigma_x = np.array([[0, 1], [1, 0]])
-        sigma_y = np.array([[0, -1j], [1j, 0]])
-        sigma_z = np.array([[1, 0], [0, -1]])
-        
-        # Calcular valores esperados
-        x = float(np.real(self._state.conj() @ sigma_x @ self._state))
-        y = float(np.real(self._state.conj() @ sigma_y @ self._state))
-        z = float(np.real(self._state.conj() @ sigma_z @ self._state))
+        # Valores esperados de σx, σy, σz sobre la matriz de densidad reducida
+        rho = self.get_density_matrix()
+        x = float(2 * np.real(rho[1, 0]))
+        y = float(2 * np.imag(rho[1, 0]))
+        z = float(np.real(rho[0, 0] - rho[1, 1]))
         
         return {'x': x, 'y': y, 'z': z}
         
     def get_density_matrix(self) -> np.ndarray:
         """
-        Calcula la matriz de densidad.
+        Calcula la matriz de densidad reducida del qubit.
         
         Returns:
             np.ndarray: Matriz de densidad
         """
-        return np.outer(self._state, self._state.conj())
+        return self.register.reduced_density_matrix(self.index)
         
     def get_probabilities(self) -> Dict[str, float]:
         """
@@ -123,9 +155,10 @@ class Qubit:
         Returns:
             Dict[str, float]: Probabilidades de |0⟩ y |1⟩
         """
+        probs = self.register.qubit_probabilities(self.index)
         return {
-            '|0⟩': float(abs(self._state[0])**2),
-            '|1⟩': float(abs(self._state[1])**2)
+            '|0⟩': float(probs[0]),
+            '|1⟩': float(probs[1])
         }
         
     def get_phase(self) -> Dict[str, float]:
@@ -135,9 +168,10 @@ class Qubit:
         Returns:
             Dict[str, float]: Fases de las amplitudes
         """
+        state = self.state
         return {
-            '|0⟩': float(np.angle(self._state[0])),
-            '|1⟩': float(np.angle(self._state[1]))
+            '|0⟩': float(np.angle(state[0])),
+            '|1⟩': float(np.angle(state[1]))
         }
         
     def get_purity(self) -> float:
@@ -171,31 +205,87 @@ class Qubit:
         Returns:
             float: Fidelidad entre 0 y 1
         """
-        return float(abs(np.vdot(self._state, other.state))**2)
+        return float(abs(np.vdot(self.state, other.state))**2)
         
     def get_history(self) -> List[Dict]:
         """
         Obtiene el historial de operaciones.
         
+        Los estados, probabilidades y coordenadas de Bloch se calculan aquí
+        a partir de la matriz de densidad reducida guardada en cada entrada.
+        
         Returns:
             List[Dict]: Lista de operaciones realizadas
         """
-        return self._history.copy()
+        history = []
+        for entry in self._history:
+            entry = dict(entry)
+            rho = entry.pop('density_matrix')
+            state = self._state_from_density(rho)
+            if entry['type'] == 'state_change':
+                probs = np.real(np.diag(rho))
+                entry['state'] = state
+                entry['probabilities'] = {'|0⟩': float(probs[0]), '|1⟩': float(probs[1])}
+                entry['bloch_coords'] = self._bloch_from_density(rho)
+            elif entry['type'] == 'gate':
+                entry['resulting_state'] = state
+            else:
+                entry['state_before'] = state
+            history.append(entry)
+        return history
         
     def reset(self) -> None:
         """Reinicia el qubit al estado |0⟩."""
-        self._state = np.array([1, 0], dtype=complex)
+        self.register.reset_qubit(self.index)
         self.entangled_with.clear()
         self._history.clear()
         self._log_state_change()
         
+    @property
+    def _recording(self) -> bool:
+        """Indica si el historial está activo."""
+        return self._history.maxlen != 0
+        
+    @staticmethod
+    def _bloch_from_density(rho: np.ndarray) -> Dict[str, float]:
+        """
+        Coordenadas de Bloch de una matriz de densidad 2×2.
+        
+        Args:
+            rho: Matriz de densidad guardada en el historial
+            
+        Returns:
+            Dict[str, float]: Coordenadas x, y, z
+        """
+        return {
+            'x': float(2 * np.real(rho[1, 0])),
+            'y': float(2 * np.imag(rho[1, 0])),
+            'z': float(np.real(rho[0, 0] - rho[1, 1]))
+        }
+        
+    @staticmethod
+    def _state_from_density(rho: np.ndarray) -> np.ndarray:
+        """
+        Estado puro más cercano a una matriz de densidad (como `qubit_state`).
+        
+        Args:
+            rho: Matriz de densidad 2×2
+            
+        Returns:
+            np.ndarray: Autovector principal, con la primera amplitud no nula real
+        """
+        _, vecs = np.linalg.eigh(rho)
+        state = vecs[:, -1]
+        pivot = state[np.argmax(np.abs(state) > 1e-12)]
+        return state * (abs(pivot) / pivot)
+        
     def _log_state_change(self) -> None:
         """Registra un cambio de estado."""
+        if not self._recording:
+            return
         self._history.append({
             'type': 'state_change',
-            'state': self._state.copy(),
-            'probabilities': self.get_probabilities(),
-            'bloch_coords': self.get_bloch_coords()
+            'density_matrix': self.get_density_matrix()
         })
         
     def _log_gate_application(self, gate: np.ndarray) -> None:
@@ -205,21 +295,27 @@ class Qubit:
         Args:
             gate: Matriz de la puerta aplicada
         """
+        if not self._recording:
+            return
         self._history.append({
             'type': 'gate',
-            'matrix': gate.copy(),
-            'resulting_state': self._state.copy()
+            # Las matrices de solo lectura se comparten sin copiar
+            'matrix': gate.copy() if gate.flags.writeable else gate,
+            'density_matrix': self.get_density_matrix()
         })
         
-    def _log_measurement(self, outcome: int) -> None:
+    def _log_measurement(self, outcome: int, state_before: Optional[np.ndarray]) -> None:
         """
         Registra una medición.
         
         Args:
              outcome: Resultado de la medición
+             state_before: Matriz de densidad del qubit antes de medir
         """
+        if not self._recording:
+            return
         self._history.append({
             'type': 'measurement',
             'outcome': outcome,
-            'state_before': self._state.copy()
+            'density_matrix': state_before
         })
@@ -0,0 +1,137 @@
+import numpy as np
+from typing import Dict, Optional, Sequence
+
+def sample_histogram(probabilities: np.ndarray, shots: int,
+                     rng: Optional[np.random.Generator] = None) -> np.ndarray:
+    """
+    Muestrea todas las mediciones de una vez a partir del vector de probabilidades.
+
+    El circuito se simula una sola vez; el coste del muestreo es
+    O(2^n + shots) en lugar de O(shots × circuito).
+
+    Args:
+        probabilities: Probabilidades de los 2^n estados base
+        shots: Número de mediciones
+        rng: Generador aleatorio
+
+    Returns:
+        np.ndarray: Histograma de conteos por índice de estado base
+    """
+    if shots < 0:
+        raise ValueError("El número de mediciones no puede ser negativo")
+    rng = rng if rng is not None else np.random.default_rng()
+    probs = np.asarray(probabilities, dtype=np.float64)
+    probs = probs / probs.sum()
+    if shots < len(probs):
+        # Pocas mediciones: elegir índices y agruparlos con bincount
+        return np.bincount(rng.choice(len(probs), size=shots, p=probs), minlength=len(probs))
+    return rng.multinomial(shots, probs)
+
+def sample_indices(probabilities: np.ndarray, shots: int,
+                   rng: Optional[np.random.Generator] = None) -> np.ndarray:
+    """
+    Muestrea los índices de estado base de cada medición individual.
+
+    Args:
+        probabilities: Probabilidades de los 2^n estados base
+        shots: Número de mediciones
+        rng: Generador aleatorio
+
+    Returns:
+        np.ndarray: Índice medido en cada disparo
+    """
+    rng = rng if rng is not None else np.random.default_rng()
+    probs = np.asarray(probabilities, dtype=np.float64)
+    return rng.choice(len(probs), size=shots, p=probs / probs.sum())
+
+def histogram_to_counts(histogram: np.ndarray, num_qubits: int) -> Dict[str, int]:
+    """
+    Convierte un histograma en conteos indexados por cadena de bits.
+
+    Args:
+        histogram: Conteos por índice de estado base
+        num_qubits: Número de qubits (qubit 0 a la izquierda)
+
+    Returns:
+        Dict[str, int]: Conteos de los resultados observados
+    """
+    observed = np.flatnonzero(histogram)
+    return {format(int(i), f'0{num_qubits}b'): int(histogram[i]) for i in observed}
+
+def counts_from_indices(indices: np.ndarray, num_qubits: int) -> Dict[str, int]:
+    """
+    Agrupa los índices medidos en conteos por cadena de bits.
+
+    Args:
+        indices: Índice medido en cada disparo
+        num_qubits: Número de qubits
+
+    Returns:
+        Dict[str, int]: Conteos por cadena de bits
+    """
+    observed, counts = np.unique(indices, return_counts=True)
+    return {format(int(i), f'0{num_qubits}b'): int(c) for i, c in zip(observed, counts)}
+
+def indices_to_bits(indices: np.ndarray, num_qubits: int) -> np.ndarray:
+    """
+    Expande índices de estado base en una matriz de bits.
+
+    Args:
+        indices: Índices medidos
+        num_qubits: Número de qubits
+
+    Returns:
+        np.ndarray: Matriz (shots, n) con el qubit 0 en la primera columna
+    """
+    shifts = np.arange(num_qubits - 1, -1, -1, dtype=np.int64)
+    return ((np.asarray(indices, dtype=np.int64)[:, None] >> shifts) & 1).astype(np.uint8)
+
+def bits_to_indices(bits: np.ndarray) -> np.ndarray:
+    """
+    Compacta una matriz de bits (shots, n) en índices de estado base.
+
+    Args:
+        bits: Matriz de bits con el qubit 0 en la primera columna
+
+    Returns:
+        np.ndarray: Índice de cada fila
+    """
+    num_qubits = bits.shape[1]
+    weights = np.int64(1) << np.arange(num_qubits - 1, -1, -1, dtype=np.int64)
+    return bits.astype(np.int64) @ weights
+
+def counts_from_bit_samples(samples: np.ndarray) -> Dict[str, int]:
+    """
+    Agrupa muestras en forma de matriz de bits (p. ej. de MPS o estabilizadores).
+
+    Hasta 62 qubits las filas se compactan a índices enteros antes de
+    agruparlas; para registros más anchos se agrupan las filas directamente.
+
+    Args:
+        samples: Matriz (shots, n) de bits medidos
+
+    Returns:
+        Dict[str, int]: Conteos por cadena de bits
+    """
+    num_qubits = samples.shape[1]
+    if num_qubits <= 62:
+        return counts_from_indices(bits_to_indices(samples), num_qubits)
+    outcomes, counts = np.unique(samples, axis=0, return_counts=True)
+    return {''.join(map(str, row)): int(c) for row, c in zip(outcomes, counts)}
+
+def apply_readout_error(samples: np.ndarray, error_rates: Sequence[float],
+                        rng: Optional[np.random.Generator] = None) -> np.ndarray:
+    """
+    Aplica errores de lectura independientes por qubit a todas las mediciones.
+
+    Args:
+        samples: Matriz (shots, n) de bits medidos
+        error_rates: Probabilidad de invertir cada qubit
+        rng: Generador aleatorio
+
+    Returns:
+        np.ndarray: Matriz de bits tras los errores de lectura
+    """
+    rng = rng if rng is not None else np.random.default_rng()
+    flips = rng.random(samples.shape) < np.asarray(error_rates)[None, :]
+    return samples ^ flips.astype(np.uint8)
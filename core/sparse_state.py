@@ -0,0 +1,151 @@
+import numpy as np
+from typing import Dict, Optional, Sequence
+from core.state_vector import StateVectorRegister, is_diagonal, as_permutation
+from core.precision import complex_dtype
+
+# Los índices de estado base se guardan como int64
+MAX_SPARSE_QUBITS = 62
+
+class SparseStateVector:
+    """
+    Vector de estado disperso: solo guarda las amplitudes no nulas.
+
+    Los índices de los estados base (qubit 0 como bit más significativo) y
+    sus amplitudes se mantienen en dos arrays numpy ordenados, de modo que
+    los circuitos reversibles (X, CNOT, SWAP, Toffoli) cuestan O(nnz) en
+    lugar de O(2^n).
+    """
+
+    def __init__(self, num_qubits: int, densify_threshold: float = 0.1,
+                 tolerance: float = 1e-12, precision: str = 'double'):
+        """
+        Inicializa el estado disperso en |0...0⟩.
+
+        Args:
+            num_qubits: Número de qubits
+            densify_threshold: Fracción de amplitudes no nulas a partir de la
+                cual conviene pasar a un vector denso
+            tolerance: Módulo por debajo del cual una amplitud se descarta
+            precision: 'double' (complex128) o 'single' (complex64)
+        """
+        if not 0 < num_qubits <= MAX_SPARSE_QUBITS:
+            raise ValueError(f"El número de qubits debe estar entre 1 y {MAX_SPARSE_QUBITS}")
+        self.num_qubits = num_qubits
+        self.densify_threshold = densify_threshold
+        self.tolerance = tolerance
+        self.precision = precision
+        self.indices = np.zeros(1, dtype=np.int64)
+        self.amplitudes = np.ones(1, dtype=complex_dtype(precision))
+
+    @property
+    def nnz(self) -> int:
+        """Número de amplitudes no nulas."""
+        return len(self.indices)
+
+    @property
+    def fill_ratio(self) -> float:
+        """Fracción del espacio de Hilbert ocupada."""
+        return self.nnz / 2.0**self.num_qubits
+
+    def should_densify(self) -> bool:
+        """
+        Indica si el estado ha superado el umbral de llenado.
+
+        Returns:
+            bool: True si un vector denso sería más eficiente
+        """
+        return self.fill_ratio > self.densify_threshold
+
+    def apply_gate(self, matrix: np.ndarray, targets: Sequence[int]) -> None:
+        """
+        Aplica una puerta de k qubits sobre las amplitudes no nulas.
+
+        Las amplitudes se agrupan por los bits que no toca la puerta; cada
+        grupo es un vector local de 2^k elementos que se multiplica por la
+        matriz.
+
+        Args:
+            matrix: Matriz de la puerta (2^k × 2^k)
+            targets: Qubits sobre los que actúa
+        """
+        n = self.num_qubits
+        k = len(targets)
+        shifts = np.array([n - 1 - t for t in targets], dtype=np.int64)
+        mask = int(np.sum(np.int64(1) << shifts))
+
+        # Índice local (bits de los targets) y base (resto de bits)
+        local = np.zeros(self.nnz, dtype=np.int64)
+        for j, shift in enumerate(shifts):
+            local |= ((self.indices >> shift) & 1) << (k - 1 - j)
+        if is_diagonal(matrix):
+            # Puerta diagonal: cada amplitud solo cambia de fase
+            diagonal = matrix if matrix.ndim == 1 else np.diagonal(matrix)
+            self.amplitudes = self.amplitudes * diagonal.astype(self.amplitudes.dtype)[local]
+            return
+        perm = as_permutation(matrix)
+        if perm is not None:
+            # Puerta de permutación: solo cambian los índices ocupados
+            offsets = np.zeros(2**k, dtype=np.int64)
+            for j, shift in enumerate(shifts):
+                offsets |= ((perm >> (k - 1 - j)) & 1) << shift
+            indices = (self.indices & ~mask) | offsets[local]
+            order = np.argsort(indices)
+            self.indices = indices[order]
+            self.amplitudes = self.amplitudes[order]
+            return
+        bases, group = np.unique(self.indices & ~mask, return_inverse=True)
+
+        block = np.zeros((len(bases), 2**k), dtype=self.amplitudes.dtype)
+        block[group, local] = self.amplitudes
+        block = block @ matrix.T.astype(self.amplitudes.dtype, copy=False)
+
+        # Reconstruir índices de todas las salidas posibles
+        offsets = np.zeros(2**k, dtype=np.int64)
+        for j, shift in enumerate(shifts):
+            offsets |= ((np.arange(2**k) >> (k - 1 - j)) & 1) << shift
+        indices = (bases[:, None] | offsets[None, :]).reshape(-1)
+        amplitudes = block.reshape(-1)
+
+        keep = np.abs(amplitudes) > self.tolerance
+        order = np.argsort(indices[keep])
+        self.indices = indices[keep][order]
+        self.amplitudes = amplitudes[keep][order]
+
+    def probabilities(self) -> Dict[int, float]:
+        """
+        Probabilidades de los estados base ocupados.
+
+        Returns:
+            Dict[int, float]: Probabilidad por índice de estado base
+        """
+        probs = np.abs(self.amplitudes)**2
+        return {int(i): float(p) for i, p in zip(self.indices, probs)}
+
+    def sample(self, shots: int, rng: Optional[np.random.Generator] = None) -> np.ndarray:
+        """
+        Muestrea mediciones de todos los qubits.
+
+        Args:
+            shots: Número de muestras
+            rng: Generador aleatorio
+
+        Returns:
+            np.ndarray: Matriz (shots, n) de bits medidos
+        """
+        rng = rng if rng is not None else np.random.default_rng()
+        probs = np.abs(self.amplitudes)**2
+        chosen = self.indices[rng.choice(self.nnz, size=shots, p=probs / probs.sum())]
+        shifts = np.arange(self.num_qubits - 1, -1, -1, dtype=np.int64)
+        return ((chosen[:, None] >> shifts[None, :]) & 1).astype(np.uint8)
+
+    def to_dense(self) -> StateVectorRegister:
+        """
+        Convierte el estado en un registro denso.
+
+        Returns:
+            StateVectorRegister: Registro con las mismas amplitudes
+        """
+        register = StateVectorRegister(self.num_qubits, precision=self.precision)
+        register.state[:] = 0
+        register.state[self.indices] = self.amplitudes
+        return register
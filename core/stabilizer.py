@@ -0,0 +1,298 @@
+import numpy as np
+from typing import List, Dict, Optional, Sequence
+from core.sampling import counts_from_bit_samples
+
+# Puertas de Clifford soportadas por el tableau (nombres del intérprete y de la web)
+CLIFFORD_GATES = {'I', 'H', 'X', 'Y', 'Z', 'S', 'Sdg', 'CNOT', 'CX', 'CZ', 'SWAP'}
+
+def is_clifford_circuit(operations: List[Dict]) -> bool:
+    """
+    Indica si un circuito contiene solo puertas de Clifford.
+
+    Args:
+        operations: Lista de operaciones
+
+    Returns:
+        bool: True si puede simularse con el tableau de estabilizadores
+    """
+    # Las operaciones 'controlled' con varios controles no son de Clifford
+    return all(op.get('gate') in CLIFFORD_GATES and op.get('type') != 'controlled'
+               for op in operations)
+
+class StabilizerTableau:
+    """
+    Simulador de estabilizadores (tableau CHP de Aaronson–Gottesman).
+
+    Representa el estado con 2n generadores de Pauli (n desestabilizadores
+    y n estabilizadores), de modo que cada puerta de Clifford cuesta O(n) y
+    la memoria es O(n²) en lugar de O(2^n).
+    """
+
+    def __init__(self, num_qubits: int):
+        """
+        Inicializa el tableau en el estado |0...0⟩.
+
+        Args:
+            num_qubits: Número de qubits
+        """
+        if num_qubits <= 0:
+            raise ValueError("El número de qubits debe ser positivo")
+        n = num_qubits
+        self.num_qubits = n
+        # Filas 0..n-1: desestabilizadores, n..2n-1: estabilizadores, 2n: auxiliar
+        self.x = np.zeros((2 * n + 1, n), dtype=np.uint8)
+        self.z = np.zeros((2 * n + 1, n), dtype=np.uint8)
+        self.r = np.zeros(2 * n + 1, dtype=np.uint8)
+        idx = np.arange(n)
+        self.x[idx, idx] = 1
+        self.z[idx + n, idx] = 1
+
+    def copy(self) -> 'StabilizerTableau':
+        """
+        Crea una copia independiente del tableau.
+
+        Returns:
+            StabilizerTableau: Copia del estado
+        """
+        other = StabilizerTableau.__new__(StabilizerTableau)
+        other.num_qubits = self.num_qubits
+        other.x = self.x.copy()
+        other.z = self.z.copy()
+        other.r = self.r.copy()
+        return other
+
+    # Puertas de Clifford
+    def h(self, a: int) -> None:
+        """Hadamard sobre el qubit a."""
+        self.r ^= self.x[:, a] & self.z[:, a]
+        self.x[:, a], self.z[:, a] = self.z[:, a].copy(), self.x[:, a].copy()
+
+    def s(self, a: int) -> None:
+        """Puerta de fase S sobre el qubit a."""
+        self.r ^= self.x[:, a] & self.z[:, a]
+        self.z[:, a] ^= self.x[:, a]
+
+    def sdg(self, a: int) -> None:
+        """Puerta S† sobre el qubit a."""
+        self.z_gate(a)
+        self.s(a)
+
+    def x_gate(self, a: int) -> None:
+        """Pauli-X sobre el qubit a."""
+        self.r ^= self.z[:, a]
+
+    def y_gate(self, a: int) -> None:
+        """Pauli-Y sobre el qubit a."""
+        self.r ^= self.x[:, a] ^ self.z[:, a]
+
+    def z_gate(self, a: int) -> None:
+        """Pauli-Z sobre el qubit a."""
+        self.r ^= self.x[:, a]
+
+    def cnot(self, a: int, b: int) -> None:
+        """CNOT con control a y objetivo b."""
+        self.r ^= self.x[:, a] & self.z[:, b] & (self.x[:, b] ^ self.z[:, a] ^ 1)
+        self.x[:, b] ^= self.x[:, a]
+        self.z[:, a] ^= self.z[:, b]
+
+    def cz(self, a: int, b: int) -> None:
+        """CZ entre los qubits a y b."""
+        self.h(b)
+        self.cnot(a, b)
+        self.h(b)
+
+    def swap(self, a: int, b: int) -> None:
+        """SWAP entre los qubits a y b (intercambio de columnas)."""
+        self.x[:, [a, b]] = self.x[:, [b, a]]
+        self.z[:, [a, b]] = self.z[:, [b, a]]
+
+    def apply_operation(self, op: Dict) -> None:
+        """
+        Aplica una operación en el formato de `circuit_operations`.
+
+        Args:
+            op: Operación ({'gate', 'target'[, 'control']})
+
+        Raises:
+            ValueError: Si la puerta no es de Clifford
+        """
+        gate = op['gate']
+        target = op['target']
+        single = {
+            'I': lambda a: None, 'H': self.h, 'S': self.s, 'Sdg': self.sdg,
+            'X': self.x_gate, 'Y': self.y_gate, 'Z': self.z_gate
+        }
+        two = {'CNOT': self.cnot, 'CX': self.cnot, 'CZ': self.cz, 'SWAP': self.swap}
+        if gate in single:
+            single[gate](target)
+        elif gate in two:
+            two[gate](op['control'], target)
+        else:
+            raise ValueError(f"Puerta {gate} no es de Clifford")
+
+    def apply_operations(self, operations: List[Dict]) -> None:
+        """
+        Aplica una lista de operaciones.
+
+        Args:
+            operations: Lista de operaciones
+        """
+        for op in operations:
+            self.apply_operation(op)
+
+    def measure(self, a: int, rng: Optional[np.random.Generator] = None,
+                forced: Optional[int] = None) -> int:
+        """
+        Mide el qubit a en la base computacional y actualiza el tableau.
+
+        Args:
+            a: Índice del qubit
+            rng: Generador aleatorio
+            forced: Resultado impuesto cuando la medición es aleatoria
+
+        Returns:
+            int: Resultado de la medición (0 o 1)
+        """
+        n = self.num_qubits
+        candidates = np.flatnonzero(self.x[n:2 * n, a])
+        if len(candidates):
+            # Resultado aleatorio
+            p = int(candidates[0]) + n
+            rows = np.flatnonzero(self.x[:2 * n, a])
+            rows = rows[rows != p]
+            self._rowsum_many(rows, p)
+            self.x[p - n] = self.x[p]
+            self.z[p - n] = self.z[p]
+            self.r[p - n] = self.r[p]
+            self.x[p] = 0
+            self.z[p] = 0
+            self.z[p, a] = 1
+            if forced is None:
+                rng = rng if rng is not None else np.random.default_rng()
+                forced = int(rng.integers(2))
+            self.r[p] = forced
+            return int(forced)
+
+        # Resultado determinista: producto de estabilizadores en la fila auxiliar
+        scratch = 2 * n
+        self.x[scratch] = 0
+        self.z[scratch] = 0
+        self.r[scratch] = 0
+        for i in np.flatnonzero(self.x[:n, a]):
+            self._rowsum_many(np.array([scratch]), int(i) + n)
+        return int(self.r[scratch])
+
+    def sample(self, shots: int, rng: Optional[np.random.Generator] = None) -> np.ndarray:
+        """
+        Muestrea mediciones de todos los qubits sin colapsar el estado.
+
+        Los resultados posibles forman un espacio afín x0 ⊕ span(X), donde X
+        son las partes X de los estabilizadores; todas las muestras se obtienen
+        con un único producto matricial sobre GF(2).
+
+        Args:
+            shots: Número de muestras
+            rng: Generador aleatorio
+
+        Returns:
+            np.ndarray: Matriz (shots, n) de bits medidos
+        """
+        rng = rng if rng is not None else np.random.default_rng()
+        offset, basis = self._measurement_space()
+        if len(basis) == 0:
+            return np.tile(offset, (shots, 1))
+        coeffs = rng.integers(0, 2, size=(shots, len(basis)), dtype=np.uint8)
+        # float32 es exacto mientras el rango sea menor que 2^24
+        parity = (coeffs.astype(np.float32) @ basis.astype(np.float32)).astype(np.int64) & 1
+        return (parity.astype(np.uint8) ^ offset)
+
+    def sample_counts(self, shots: int, rng: Optional[np.random.Generator] = None) -> Dict[str, int]:
+        """
+        Muestrea mediciones y las agrupa como cadenas de bits.
+
+        Args:
+            shots: Número de muestras
+            rng: Generador aleatorio
+
+        Returns:
+            Dict[str, int]: Conteos por resultado (qubit 0 a la izquierda)
+        """
+        return counts_from_bit_samples(self.sample(shots, rng))
+
+    def _rowsum_many(self, rows: np.ndarray, i: int) -> None:
+        """
+        Multiplica (como operadores de Pauli) la fila i sobre varias filas.
+
+        Args:
+            rows: Filas destino
+            i: Fila fuente
+        """
+        if len(rows) == 0:
+            return
+        x1 = self.x[i].astype(np.int8)
+        z1 = self.z[i].astype(np.int8)
+        x2 = self.x[rows].astype(np.int8)
+        z2 = self.z[rows].astype(np.int8)
+        # Exponente de i de cada producto de Paulis de un qubit
+        g = np.where(
+            (x1 == 1) & (z1 == 1), z2 - x2,
+            np.where(
+                x1 == 1, z2 * (2 * x2 - 1),
+                np.where(z1 == 1, x2 * (1 - 2 * z2), 0)
+            )
+        )
+        total = 2 * self.r[rows].astype(np.int64) + 2 * int(self.r[i]) + g.sum(axis=1)
+        self.r[rows] = (total % 4 != 0).astype(np.uint8)
+        self.x[rows] ^= self.x[i]
+        self.z[rows] ^= self.z[i]
+
+    def _measurement_space(self) -> Sequence[np.ndarray]:
+        """
+        Calcula el espacio afín de resultados de medición.
+
+        Returns:
+            Sequence[np.ndarray]: (x0, base) con x0 un resultado válido y la
+            base (r, n) del subespacio de direcciones
+        """
+        n = self.num_qubits
+        tab = self.copy()
+        rows = np.arange(n, 2 * n)
+        rank = 0
+        # Eliminación gaussiana sobre la parte X de los estabilizadores
+        for col in range(n):
+            pivots = np.flatnonzero(tab.x[rows[rank:], col])
+            if len(pivots) == 0:
+                continue
+            p = rows[rank + pivots[0]]
+            rows[rank + pivots[0]], rows[rank] = rows[rank], p
+            others = rows[tab.x[rows, col] == 1]
+            tab._rowsum_many(others[others != p], int(p))
+            rank += 1
+            if rank == n:
+                break
+        basis = tab.x[rows[:rank]]
+
+        # Las filas restantes son de tipo Z: imponen z·x = r (mod 2)
+        a = tab.z[rows[rank:]].copy()
+        b = tab.r[rows[rank:]].copy()
+        offset = np.zeros(n, dtype=np.uint8)
+        pivot_cols = []
+        row = 0
+        for col in range(n):
+            if row == len(a):
+                break
+            pivots = np.flatnonzero(a[row:, col])
+            if len(pivots) == 0:
+                continue
+            p = row + pivots[0]
+            a[[row, p]] = a[[p, row]]
+            b[[row, p]] = b[[p, row]]
+            mask = a[:, col] == 1
+            mask[row] = False
+            a[mask] ^= a[row]
+            b[mask] ^= b[row]
+            pivot_cols.append(col)
+            row += 1
+        for k, col in enumerate(pivot_cols):
+            offset[col] = b[k]
+        return offset, basis
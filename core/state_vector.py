@@ -0,0 +1,563 @@
+import numpy as np
+from typing import Dict, List, Optional, Sequence
+import random
+from core.sampling import sample_histogram, histogram_to_counts
+from core.precision import complex_dtype
+
+def is_diagonal(matrix: np.ndarray) -> bool:
+    """
+    Indica si una puerta es diagonal (solo añade fases).
+
+    Args:
+        matrix: Matriz de la puerta o vector con su diagonal
+
+    Returns:
+        bool: True si todos los elementos fuera de la diagonal son nulos
+    """
+    if matrix.ndim == 1:
+        return True
+    return not np.any(matrix - np.diag(np.diagonal(matrix)))
+
+def apply_diagonal(state: np.ndarray, diagonal: np.ndarray,
+                   targets: Sequence[int], num_qubits: int) -> None:
+    """
+    Aplica in situ una puerta diagonal como producto elemento a elemento.
+
+    La diagonal (2^k fases, targets[0] como bit más significativo) se
+    difunde sobre el vector remodelado, sin ninguna multiplicación matricial.
+
+    Args:
+        state: Vector de estado contiguo de longitud 2^n
+        diagonal: Fases de la puerta
+        targets: Índices de los qubits sobre los que actúa la puerta
+        num_qubits: Número total de qubits del vector
+    """
+    _diagonal_tensor(state.reshape((2,) * num_qubits), diagonal, targets)
+
+def _diagonal_tensor(psi: np.ndarray, diagonal: np.ndarray, targets: Sequence[int]) -> None:
+    """Multiplica in situ un tensor (2,)*m por las fases de una puerta diagonal."""
+    k = len(targets)
+    order = np.argsort(targets)
+    phases = np.asarray(diagonal, dtype=psi.dtype).reshape((2,) * k).transpose(order)
+    shape = [1] * psi.ndim
+    for t in targets:
+        shape[t] = 2
+    psi *= phases.reshape(shape)
+
+def as_permutation(matrix: np.ndarray) -> Optional[np.ndarray]:
+    """
+    Obtiene la permutación de una puerta que solo reordena estados base.
+
+    Args:
+        matrix: Matriz de la puerta (2^k × 2^k)
+
+    Returns:
+        Optional[np.ndarray]: `perm` tal que la puerta lleva |j⟩ a |perm[j]⟩,
+        o None si la matriz no es de permutación
+    """
+    if matrix.ndim != 2 or np.count_nonzero(matrix) != len(matrix):
+        return None
+    rows, cols = np.nonzero(matrix)
+    if not np.all(matrix[rows, cols] == 1) or len(set(rows.tolist())) != len(matrix):
+        return None
+    perm = np.empty(len(matrix), dtype=np.int64)
+    perm[cols] = rows
+    return perm
+
+def apply_permutation(state: np.ndarray, perm: np.ndarray,
+                      targets: Sequence[int], num_qubits: int) -> None:
+    """
+    Aplica in situ una puerta de permutación sin aritmética compleja.
+
+    Cada estado local de los qubits objetivo selecciona una subvista
+    (porción con esos bits fijados) del vector. La permutación se
+    descompone en ciclos y cada ciclo se recorre copiando subvistas, de
+    modo que X intercambia dos mitades, CNOT o Toffoli solo tocan la porción
+    con todos los controles a 1 y los puntos fijos no se leen.
+
+    Args:
+        state: Vector de estado contiguo de longitud 2^n
+        perm: Permutación de los 2^k estados locales (ver `as_permutation`)
+        targets: Índices de los qubits sobre los que actúa la puerta
+        num_qubits: Número total de qubits del vector
+    """
+    _permute_tensor(state.reshape((2,) * num_qubits), perm, targets)
+
+def _permute_tensor(psi: np.ndarray, perm: np.ndarray, targets: Sequence[int]) -> None:
+    """Permuta in situ las subvistas de un tensor (2,)*m según `perm`."""
+    k = len(targets)
+
+    def block(j: int) -> np.ndarray:
+        """Subvista con los qubits objetivo en el estado local j."""
+        index: List = [slice(None)] * psi.ndim
+        for pos, t in enumerate(targets):
+            bit = (j >> (k - 1 - pos)) & 1
+            index[t] = slice(bit, bit + 1)
+        return psi[tuple(index)]
+
+    visited = np.zeros(len(perm), dtype=bool)
+    for start in range(len(perm)):
+        if visited[start] or perm[start] == start:
+            continue
+        # Ciclo start -> perm[start] -> ...: cada amplitud avanza una posición
+        cycle = [start]
+        visited[start] = True
+        while perm[cycle[-1]] != start:
+            cycle.append(int(perm[cycle[-1]]))
+            visited[cycle[-1]] = True
+        carry = block(cycle[-1]).copy()
+        for i in range(len(cycle) - 1, 0, -1):
+            block(cycle[i])[...] = block(cycle[i - 1])
+        block(start)[...] = carry
+
+def apply_matrix(state: np.ndarray, matrix: np.ndarray,
+                 targets: Sequence[int], num_qubits: int) -> None:
+    """
+    Aplica in situ una puerta de k qubits sobre un vector de estado.
+
+    El qubit 0 es el más significativo (mismo orden que `tensor_product`).
+    La puerta se aplica sobre vistas remodeladas del vector, por lo que el
+    coste es O(4^k · 2^n) y nunca se construye una matriz de 2^n×2^n.
+
+    Las puertas diagonales (o dadas directamente como vector de fases) se
+    aplican con `apply_diagonal` y las de permutación (X, CNOT, SWAP,
+    Toffoli) con `apply_permutation`.
+
+    Args:
+        state: Vector de estado contiguo de longitud 2^n
+        matrix: Matriz de la puerta (2^k × 2^k) o vector con su diagonal
+        targets: Índices de los qubits sobre los que actúa la puerta
+        num_qubits: Número total de qubits del vector
+    """
+    if is_diagonal(matrix):
+        diagonal = matrix if matrix.ndim == 1 else np.diagonal(matrix)
+        apply_diagonal(state, diagonal, targets, num_qubits)
+        return
+    perm = as_permutation(matrix)
+    if perm is not None:
+        apply_permutation(state, perm, targets, num_qubits)
+        return
+    apply_dense(state, matrix, targets, num_qubits)
+
+def apply_dense(state: np.ndarray, matrix: np.ndarray,
+                targets: Sequence[int], num_qubits: int) -> None:
+    """
+    Aplica in situ una puerta densa sin buscar caminos rápidos.
+
+    Es el núcleo general de `apply_matrix`, útil cuando ya se sabe que la
+    puerta no es diagonal ni de permutación.
+
+    Args:
+        state: Vector de estado contiguo de longitud 2^n
+        matrix: Matriz de la puerta (2^k × 2^k)
+        targets: Índices de los qubits sobre los que actúa la puerta
+        num_qubits: Número total de qubits del vector
+    """
+    k = len(targets)
+    if k == 1:
+        t = targets[0]
+        view = state.reshape(2**t, 2, 2**(num_qubits - t - 1))
+        v0 = view[:, 0, :]
+        v1 = view[:, 1, :]
+        a0 = v0.copy()
+        v0 *= matrix[0, 0]
+        v0 += matrix[0, 1] * v1
+        v1 *= matrix[1, 1]
+        v1 += matrix[1, 0] * a0
+        return
+
+    _matrix_tensor(state.reshape((2,) * num_qubits), matrix, targets)
+
+def _matrix_tensor(psi: np.ndarray, matrix: np.ndarray, targets: Sequence[int]) -> None:
+    """Aplica in situ una matriz densa de k qubits sobre un tensor (2,)*m."""
+    k = len(targets)
+    gate = matrix.reshape((2,) * (2 * k))
+    result = np.tensordot(gate, psi, axes=(list(range(k, 2 * k)), list(targets)))
+    psi[...] = np.moveaxis(result, list(range(k)), list(targets))
+
+def apply_controlled(state: np.ndarray, matrix: np.ndarray, controls: Sequence[int],
+                     targets: Sequence[int], num_qubits: int) -> None:
+    """
+    Aplica in situ una puerta controlada por un conjunto de qubits.
+
+    Solo se opera sobre la subvista con todos los controles a 1, de modo
+    que el coste es O(4^k · 2^(n−c)) para c controles y nunca se construye
+    la matriz de 2^(c+k) × 2^(c+k). La matriz de la puerta sin controles
+    sigue los mismos caminos rápidos que `apply_matrix`.
+
+    Args:
+        state: Vector de estado contiguo de longitud 2^n
+        matrix: Matriz de la puerta sobre `targets` (2^k × 2^k) o su diagonal
+        controls: Qubits de control (deben valer 1)
+        targets: Qubits sobre los que actúa la puerta
+        num_qubits: Número total de qubits del vector
+    """
+    if not controls:
+        apply_matrix(state, matrix, targets, num_qubits)
+        return
+    index: List = [slice(None)] * num_qubits
+    for c in controls:
+        index[c] = 1
+    sub = state.reshape((2,) * num_qubits)[tuple(index)]
+    free = [q for q in range(num_qubits) if q not in controls]
+    local = [free.index(t) for t in targets]
+    if is_diagonal(matrix):
+        _diagonal_tensor(sub, matrix if matrix.ndim == 1 else np.diagonal(matrix), local)
+        return
+    perm = as_permutation(matrix)
+    if perm is not None:
+        _permute_tensor(sub, perm, local)
+    else:
+        _matrix_tensor(sub, matrix, local)
+
+def apply_batch(states: np.ndarray, operands: np.ndarray, targets: Sequence[int],
+                num_qubits: int, controls: Sequence[int] = ()) -> None:
+    """
+    Aplica in situ una puerta distinta a cada estado de un lote.
+
+    Los estados forman una matriz (B, 2^n). Cada estado recibe su propia
+    matriz (B, 2^k, 2^k) mediante un producto matricial con difusión, o su
+    propia diagonal (B, 2^k) como producto elemento a elemento. Un
+    primer eje de tamaño 1 aplica la misma puerta a todo el lote.
+
+    Args:
+        states: Estados del lote, forma (B, 2^n)
+        operands: Matrices (B, 2^k, 2^k) o diagonales (B, 2^k)
+        targets: Índices de los qubits sobre los que actúa la puerta
+        num_qubits: Número de qubits de cada estado
+        controls: Qubits de control (la puerta solo actúa donde valen 1)
+    """
+    psi = states.reshape((states.shape[0],) + (2,) * num_qubits)
+    axes = [t + 1 for t in targets]
+    if controls:
+        index: List = [slice(None)] * (num_qubits + 1)
+        for c in controls:
+            index[c + 1] = 1
+        psi = psi[tuple(index)]
+        free = [q for q in range(num_qubits) if q not in controls]
+        axes = [free.index(t) + 1 for t in targets]
+    k = len(targets)
+    if operands.ndim == 2:
+        order = np.argsort(axes)
+        phases = operands.reshape((-1,) + (2,) * k).transpose([0] + [int(o) + 1 for o in order])
+        shape = [phases.shape[0]] + [1] * (psi.ndim - 1)
+        for a in axes:
+            shape[a] = 2
+        psi *= phases.reshape(shape)
+        return
+    moved = np.moveaxis(psi, axes, list(range(psi.ndim - k, psi.ndim)))
+    flat = moved.reshape(moved.shape[0], -1, 2**k)
+    moved[...] = (flat @ np.swapaxes(operands, 1, 2)).reshape(moved.shape)
+
+class StateVectorRegister:
+    """
+    Registro compartido de n qubits con un único vector de estado de 2^n amplitudes.
+
+    Los objetos `Qubit` creados sobre el mismo registro son vistas ligeras que
+    guardan únicamente su índice, de modo que el entrelazamiento se representa
+    de forma exacta.
+    """
+
+    def __init__(self, num_qubits: int = 0, renormalize_interval: int = 0,
+                 precision: str = 'double', norm_tolerance: Optional[float] = None):
+        """
+        Inicializa el registro en el estado |0...0⟩.
+
+        Args:
+            num_qubits: Número inicial de qubits
+            renormalize_interval: Puertas entre renormalizaciones para
+                corregir la deriva numérica (0 para no renormalizar)
+            precision: 'double' (complex128) o 'single' (complex64)
+            norm_tolerance: Deriva máxima de la norma antes de lanzar un
+                error (None para no comprobarla)
+        """
+        if num_qubits < 0:
+            raise ValueError("El número de qubits no puede ser negativo")
+        if renormalize_interval < 0:
+            raise ValueError("El intervalo de renormalización no puede ser negativo")
+        self.renormalize_interval = renormalize_interval
+        self.norm_tolerance = norm_tolerance
+        self.precision = precision
+        self.max_norm_drift = 0.0
+        self._gates_since_renormalize = 0
+        self._num_qubits = num_qubits
+        self._state = np.zeros(2**num_qubits, dtype=complex_dtype(precision))
+        self._state[0] = 1
+
+    @property
+    def dtype(self) -> np.dtype:
+        """Tipo de las amplitudes."""
+        return self._state.dtype
+
+    @property
+    def num_qubits(self) -> int:
+        """Número de qubits del registro."""
+        return self._num_qubits
+
+    @property
+    def state(self) -> np.ndarray:
+        """Vector de estado completo del registro."""
+        return self._state
+
+    def add_qubit(self) -> int:
+        """
+        Añade un qubit en estado |0⟩ al final del registro.
+
+        Returns:
+            int: Índice del nuevo qubit
+        """
+        new_state = np.zeros(2 * len(self._state), dtype=self._state.dtype)
+        new_state[0::2] = self._state
+        self._state = new_state
+        self._num_qubits += 1
+        return self._num_qubits - 1
+
+    def load_state(self, state: np.ndarray) -> None:
+        """
+        Sustituye el vector de estado por una copia del indicado.
+
+        Args:
+            state: Vector de 2^n amplitudes (n = qubits del registro)
+
+        Raises:
+            ValueError: Si la longitud no coincide
+        """
+        if state.shape != self._state.shape:
+            raise ValueError(f"El estado debe tener {len(self._state)} amplitudes")
+        self._state = np.array(state, dtype=self._state.dtype)
+        self._gates_since_renormalize = 0
+
+    def remove_qubit(self, index: int) -> int:
+        """
+        Elimina un qubit del registro midiéndolo y compactando el estado.
+
+        El qubit se mide (colapsando al resto si estaba entrelazado) y se
+        conserva solo la mitad del vector con el resultado obtenido, de
+        modo que el registro vuelve a ocupar 2^(n-1) amplitudes. Los qubits
+        con índice mayor bajan una posición.
+
+        Args:
+            index: Índice del qubit
+
+        Returns:
+            int: Resultado de la medición del qubit eliminado
+        """
+        outcome = self.measure(index)
+        self._state = self._qubit_view(index)[:, outcome, :].reshape(-1).copy()
+        self._num_qubits -= 1
+        return outcome
+
+    def clear(self) -> None:
+        """Elimina todos los qubits del registro."""
+        self._num_qubits = 0
+        self._state = np.ones(1, dtype=self._state.dtype)
+
+    def apply_gate(self, matrix: np.ndarray, targets: Sequence[int],
+                   controls: Sequence[int] = ()) -> None:
+        """
+        Aplica una puerta sobre los qubits indicados.
+
+        Args:
+            matrix: Matriz de la puerta (2^k × 2^k) o vector con su diagonal
+            targets: Índices de los qubits objetivo
+            controls: Qubits de control; la puerta solo actúa donde todos
+                valen 1 (ver `apply_controlled`)
+
+        Raises:
+            ValueError: Si la puerta o los índices no son válidos
+        """
+        targets = list(targets)
+        controls = list(controls)
+        dim = 2**len(targets)
+        if matrix.shape != (dim, dim) and matrix.shape != (dim,):
+            raise ValueError(f"La puerta debe ser {dim}x{dim}")
+        if len(set(targets + controls)) != len(targets) + len(controls):
+            raise ValueError("Los qubits objetivo y de control deben ser distintos")
+        for t in targets + controls:
+            self._check_index(t)
+        if matrix.dtype != self._state.dtype:
+            # Operar en la precisión del registro
+            matrix = matrix.astype(self._state.dtype)
+        if controls:
+            apply_controlled(self._state, matrix, controls, targets, self._num_qubits)
+        else:
+            apply_matrix(self._state, matrix, targets, self._num_qubits)
+        self._gates_since_renormalize += 1
+        if self.norm_tolerance is not None:
+            self.check_norm()
+        if self.renormalize_interval and self._gates_since_renormalize >= self.renormalize_interval:
+            self.renormalize()
+
+    def norm_drift(self) -> float:
+        """
+        Calcula la desviación de la norma del estado respecto de 1.
+
+        Returns:
+            float: |‖ψ‖ − 1| calculado en doble precisión
+        """
+        norm = np.sqrt(np.sum(np.abs(self._state)**2, dtype=np.float64))
+        return float(abs(norm - 1))
+
+    def check_norm(self) -> float:
+        """
+        Comprueba la deriva de la norma frente a `norm_tolerance`.
+
+        Returns:
+            float: Deriva medida
+
+        Raises:
+            ValueError: Si la deriva supera la tolerancia
+        """
+        drift = self.norm_drift()
+        self.max_norm_drift = max(self.max_norm_drift, drift)
+        if self.norm_tolerance is not None and drift > self.norm_tolerance:
+            raise ValueError(
+                f"La norma del estado se ha desviado {drift:.3e} "
+                f"(tolerancia {self.norm_tolerance:.1e})")
+        return drift
+
+    def probabilities(self) -> np.ndarray:
+        """
+        Calcula las probabilidades de todos los estados base.
+
+        Returns:
+            np.ndarray: Vector de probabilidades de longitud 2^n
+        """
+        return np.abs(self._state)**2
+
+    def sample_counts(self, shots: int, rng: Optional[np.random.Generator] = None) -> Dict[str, int]:
+        """
+        Muestrea varias mediciones de todos los qubits sin colapsar el registro.
+
+        Args:
+            shots: Número de mediciones
+            rng: Generador aleatorio
+
+        Returns:
+            Dict[str, int]: Conteos por cadena de bits (qubit 0 a la izquierda)
+        """
+        histogram = sample_histogram(self.probabilities(), shots, rng)
+        return histogram_to_counts(histogram, self._num_qubits)
+
+    def qubit_probabilities(self, index: int) -> np.ndarray:
+        """
+        Calcula las probabilidades marginales de un qubit.
+
+        Args:
+            index: Índice del qubit
+
+        Returns:
+            np.ndarray: Probabilidades de |0⟩ y |1⟩
+        """
+        view = self._qubit_view(index)
+        return np.sum(np.abs(view)**2, axis=(0, 2))
+
+    def reduced_density_matrix(self, index: int) -> np.ndarray:
+        """
+        Calcula la matriz de densidad reducida de un qubit (traza parcial).
+
+        Args:
+            index: Índice del qubit
+
+        Returns:
+            np.ndarray: Matriz de densidad 2x2
+        """
+        # Tres sumas sobre las mitades |0⟩ y |1⟩ del qubit, sin reordenar el vector
+        view = self._qubit_view(index)
+        zero, one = view[:, 0, :], view[:, 1, :]
+        zero_conj = zero.conj()
+        p0 = np.einsum('ab,ab->', zero_conj, zero).real
+        p1 = np.einsum('ab,ab->', one.conj(), one).real
+        coherence = np.einsum('ab,ab->', zero_conj, one)
+        return np.array([[p0, np.conj(coherence)], [coherence, p1]])
+
+    def qubit_state(self, index: int) -> np.ndarray:
+        """
+        Obtiene el estado puro de un qubit.
+
+        Si el qubit es separable se devuelve su estado exacto; si está
+        entrelazado se devuelve el estado puro más cercano (autovector
+        principal de la matriz de densidad reducida).
+
+        Args:
+            index: Índice del qubit
+
+        Returns:
+            np.ndarray: Estado de dimensión 2
+        """
+        m = self._qubit_matrix(index)
+        rho = m @ m.conj().T
+        if np.isclose(np.real(np.trace(rho @ rho)), 1):
+            column = m[:, np.argmax(np.sum(np.abs(m)**2, axis=0))]
+            return column / np.linalg.norm(column)
+        _, vecs = np.linalg.eigh(rho)
+        return vecs[:, -1].copy()
+
+    def set_qubit_state(self, index: int, new_state: np.ndarray) -> None:
+        """
+        Sustituye el estado de un qubit conservando el resto del registro.
+
+        Si el qubit está entrelazado, el resto del registro se proyecta sobre
+        su componente dominante y el entrelazamiento se descarta.
+
+        Args:
+            index: Índice del qubit
+            new_state: Nuevo estado normalizado de dimensión 2
+        """
+        m = self._qubit_matrix(index)
+        current = self.qubit_state(index)
+        rest = current.conj() @ m
+        rest /= np.linalg.norm(rest)
+        view = self._qubit_view(index)
+        shape = (view.shape[0], view.shape[2])
+        view[:, 0, :] = new_state[0] * rest.reshape(shape)
+        view[:, 1, :] = new_state[1] * rest.reshape(shape)
+
+    def measure(self, index: int) -> int:
+        """
+        Mide un qubit en la base computacional y colapsa el registro.
+
+        Args:
+            index: Índice del qubit
+
+        Returns:
+            int: Resultado de la medición (0 o 1)
+        """
+        prob_0 = self.qubit_probabilities(index)[0]
+        outcome = 0 if random.random() < prob_0 else 1
+        view = self._qubit_view(index)
+        view[:, 1 - outcome, :] = 0
+        self.renormalize()
+        return outcome
+
+    def reset_qubit(self, index: int) -> None:
+        """
+        Reinicia un qubit a |0⟩ midiéndolo y corrigiendo el resultado.
+
+        Args:
+            index: Índice del qubit
+        """
+        if self.measure(index) == 1:
+            view = self._qubit_view(index)
+            view[:, 0, :] = view[:, 1, :]
+            view[:, 1, :] = 0
+
+    def renormalize(self) -> None:
+        """Normaliza el vector de estado."""
+        self._state /= np.linalg.norm(self._state)
+        self._gates_since_renormalize = 0
+
+    def _check_index(self, index: int) -> None:
+        """Valida el índice de un qubit."""
+        if not 0 <= index < self._num_qubits:
+            raise ValueError(f"Índice de qubit {index} fuera de rango")
+
+    def _qubit_view(self, index: int) -> np.ndarray:
+        """Vista (antes, 2, después) del vector de estado para un qubit."""
+        self._check_index(index)
+        return self._state.reshape(2**index, 2, 2**(self._num_qubits - index - 1))
+
+    def _qubit_matrix(self, index: int) -> np.ndarray:
+        """Matriz 2 × 2^(n-1) con el qubit como primer eje."""
+        view = self._qubit_view(index)
+        return np.moveaxis(view, 1, 0).reshape(2, -1)
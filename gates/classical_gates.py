@@ -1,5 +1,6 @@
 from typing import List, Dict, Union, Optional, Callable
 from core.bit import Bit
+from core.bit_register import BitRegister
 import time
 
 def create_gate_function(truth_table: List[int]) -> Callable:
@@ -24,33 +25,49 @@ def create_gate_function(truth_table: List[int]) -> Callable:
     return gate_function
 
 # Puertas fundamentales
-def not_gate(bit: Bit) -> int:
+# Todas aceptan también registros completos (`BitRegister`), en cuyo caso
+# operan palabra a palabra y devuelven un registro nuevo.
+Operand = Union[Bit, BitRegister]
+
+def _invert(value: Union[int, BitRegister]) -> Union[int, BitRegister]:
+    """Niega un resultado escalar o un registro completo."""
+    return ~value if isinstance(value, BitRegister) else 1 - value
+
+def not_gate(bit: Operand) -> Union[int, BitRegister]:
     """NOT lógico."""
+    if isinstance(bit, BitRegister):
+        return ~bit
     return 1 - bit.get_state()
 
-def and_gate(bit1: Bit, bit2: Bit) -> int:
+def and_gate(bit1: Operand, bit2: Operand) -> Union[int, BitRegister]:
     """AND lógico."""
+    if isinstance(bit1, BitRegister):
+        return bit1 & bit2
     return bit1.get_state() & bit2.get_state()
 
-def or_gate(bit1: Bit, bit2: Bit) -> int:
+def or_gate(bit1: Operand, bit2: Operand) -> Union[int, BitRegister]:
     """OR lógico."""
+    if isinstance(bit1, BitRegister):
+        return bit1 | bit2
     return bit1.get_state() | bit2.get_state()
 
-def xor_gate(bit1: Bit, bit2: Bit) -> int:
+def xor_gate(bit1: Operand, bit2: Operand) -> Union[int, BitRegister]:
     """XOR lógico."""
+    if isinstance(bit1, BitRegister):
+        return bit1 ^ bit2
     return bit1.get_state() ^ bit2.get_state()
 
-def nand_gate(bit1: Bit, bit2: Bit) -> int:
+def nand_gate(bit1: Operand, bit2: Operand) -> Union[int, BitRegister]:
     """NAND lógico."""
-    return 1 - and_gate(bit1, bit2)
+    return _invert(and_gate(bit1, bit2))
 
-def nor_gate(bit1: Bit, bit2: Bit) -> int:
+def nor_gate(bit1: Operand, bit2: Operand) -> Union[int, BitRegister]:
     """NOR lógico."""
-    return 1 - or_gate(bit1, bit2)
+    return _invert(or_gate(bit1, bit2))
 
-def xnor_gate(bit1: Bit, bit2: Bit) -> int:
+def xnor_gate(bit1: Operand, bit2: Operand) -> Union[int, BitRegister]:
     """XNOR lógico."""
-    return 1 - xor_gate(bit1, bit2)
+    return _invert(xor_gate(bit1, bit2))
 
 # Circuitos combinacionales
 def half_adder(bit1: Bit, bit2: Bit) -> Dict[str, int]:
@@ -172,33 +189,39 @@ def encoder_4to2(inputs: List[Bit]) -> Dict[str, int]:
         'out0': pos & 1
     }
 
-def parity_generator(bits: List[Bit], even: bool = True) -> int:
+def parity_generator(bits: Union[List[Bit], BitRegister], even: bool = True) -> int:
     """
     Generador de paridad.
     
     Args:
-        bits: Lista de bits
+        bits: Lista de bits o registro completo
         even: True para paridad par, False para impar
         
     Returns:
         int: Bit de paridad
     """
-    count = sum(bit.get_state() for bit in bits)
+    count = _count_ones(bits)
     return (count + (0 if even else 1)) % 2
 
-def majority_voter(bits: List[Bit]) -> int:
+def majority_voter(bits: Union[List[Bit], BitRegister]) -> int:
     """
     Votador por mayoría.
     
     Args:
-        bits: Lista de bits (típicamente 3)
+        bits: Lista de bits (típicamente 3) o registro completo
         
     Returns:
         int: Valor mayoritario
     """
-    count = sum(bit.get_state() for bit in bits)
+    count = _count_ones(bits)
     return 1 if count > len(bits)//2 else 0
 
+def _count_ones(bits: Union[List[Bit], BitRegister]) -> int:
+    """Cuenta los bits a 1 de una lista o de un registro."""
+    if isinstance(bits, BitRegister):
+        return bits.count_ones()
+    return sum(bit.get_state() for bit in bits)
+
 # Circuitos secuenciales básicos
 class SRLatch:
     """Latch SR."""
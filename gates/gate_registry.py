@@ -0,0 +1,114 @@
+import numpy as np
+from typing import Dict, Optional, Tuple
+
+class GateRegistry:
+    """
+    Registro de puertas validadas una sola vez.
+
+    Cada puerta registrada se guarda como un array de solo lectura cuya
+    unitariedad ya se ha comprobado, de modo que `Qubit.apply_gate` puede
+    omitir la verificación al aplicarla.
+    """
+
+    def __init__(self, tolerance: float = 1e-10):
+        """
+        Inicializa un registro vacío.
+
+        Args:
+            tolerance: Tolerancia de la comprobación de unitariedad
+        """
+        self.tolerance = tolerance
+        self._gates: Dict[str, np.ndarray] = {}
+        # Matrices validadas indexadas por id (se conserva la referencia)
+        self._validated: Dict[int, np.ndarray] = {}
+        # Copias en otras precisiones: (id de la original, tipo) -> matriz
+        self._casts: Dict[Tuple[int, np.dtype], np.ndarray] = {}
+
+    def register(self, name: str, matrix: np.ndarray) -> np.ndarray:
+        """
+        Valida una puerta y la guarda como array inmutable.
+
+        Args:
+            name: Nombre de la puerta
+            matrix: Matriz cuadrada de dimensión 2^k
+
+        Returns:
+            np.ndarray: Matriz registrada (de solo lectura)
+
+        Raises:
+            ValueError: Si la matriz no es una puerta unitaria válida
+        """
+        gate = np.array(matrix, dtype=complex)
+        dim = gate.shape[0]
+        if gate.ndim != 2 or gate.shape != (dim, dim) or dim & (dim - 1) or dim < 2:
+            raise ValueError(f"La puerta {name} debe ser una matriz 2^k x 2^k")
+        if not np.allclose(gate @ gate.conj().T, np.eye(dim), atol=self.tolerance):
+            raise ValueError(f"La puerta {name} debe ser unitaria")
+        gate.setflags(write=False)
+        self._gates[name] = gate
+        self._validated[id(gate)] = gate
+        return gate
+
+    def get(self, name: str) -> Optional[np.ndarray]:
+        """
+        Obtiene una puerta registrada.
+
+        Args:
+            name: Nombre de la puerta
+
+        Returns:
+            Optional[np.ndarray]: Matriz de la puerta o None si no existe
+        """
+        return self._gates.get(name)
+
+    def as_dtype(self, matrix: np.ndarray, dtype: np.dtype) -> np.ndarray:
+        """
+        Obtiene una puerta validada en otra precisión.
+
+        La copia se crea una sola vez, es de solo lectura y también cuenta
+        como validada.
+
+        Args:
+            matrix: Puerta registrada
+            dtype: Tipo complejo deseado
+
+        Returns:
+            np.ndarray: Matriz en el tipo indicado
+
+        Raises:
+            ValueError: Si la matriz no está registrada
+        """
+        if not self.is_validated(matrix):
+            raise ValueError("La puerta no está registrada")
+        dtype = np.dtype(dtype)
+        if matrix.dtype == dtype:
+            return matrix
+        key = (id(matrix), dtype)
+        cast = self._casts.get(key)
+        if cast is None:
+            cast = matrix.astype(dtype)
+            cast.setflags(write=False)
+            self._casts[key] = cast
+            self._validated[id(cast)] = cast
+        return cast
+
+    def is_validated(self, matrix: np.ndarray) -> bool:
+        """
+        Indica si una matriz es exactamente una puerta ya validada.
+
+        Args:
+            matrix: Matriz a comprobar
+
+        Returns:
+            bool: True si puede aplicarse sin volver a verificarla
+        """
+        return self._validated.get(id(matrix)) is matrix
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._gates
+
+    def __len__(self) -> int:
+        return len(self._gates)
+
+# Registro global usado por `gates.quantum_gates` y `Qubit`
+GATE_REGISTRY = GateRegistry()
@@ -1,69 +1,176 @@
 import numpy as np
+from functools import lru_cache
 from typing import List, Dict, Optional, Tuple
 from core.qubit import Qubit
+from gates.gate_registry import GATE_REGISTRY
 
-# Puertas fundamentales de un qubit
-H = (1 / np.sqrt(2)) * np.array([[1, 1], [1, -1]], dtype=complex)  # Hadamard
-X = np.array([[0, 1], [1, 0]], dtype=complex)  # Pauli-X (NOT)
-Y = np.array([[0, -1j], [1j, 0]], dtype=complex)  # Pauli-Y 
-Z = np.array([[1, 0], [0, -1]], dtype=complex)  # Pauli-Z
-I = np.array([[1, 0], [0, 1]], dtype=complex)  # Identidad
-S = np.array([[1, 0], [0, 1j]], dtype=complex)  # Phase gate
-T = np.array([[1, 0], [0, np.exp(1j * np.pi/4)]], dtype=complex)  # π/8 gate
-Sdg = S.conj().T  # S dagger
-Tdg = T.conj().T  # T dagger
-RHW = np.array([[0, 1j], [1j, 0]], dtype=complex)  # Root of Hadamard-Walsh
+# Puertas fundamentales de un qubit (validadas una vez y de solo lectura)
+H = GATE_REGISTRY.register('H', (1 / np.sqrt(2)) * np.array([[1, 1], [1, -1]]))  # Hadamard
+X = GATE_REGISTRY.register('X', [[0, 1], [1, 0]])  # Pauli-X (NOT)
+Y = GATE_REGISTRY.register('Y', [[0, -1j], [1j, 0]])  # Pauli-Y 
+Z = GATE_REGISTRY.register('Z', [[1, 0], [0, -1]])  # Pauli-Z
+I = GATE_REGISTRY.register('I', [[1, 0], [0, 1]])  # Identidad
+S = GATE_REGISTRY.register('S', [[1, 0], [0, 1j]])  # Phase gate
+T = GATE_REGISTRY.register('T', [[1, 0], [0, np.exp(1j * np.pi/4)]])  # π/8 gate
+Sdg = GATE_REGISTRY.register('Sdg', S.conj().T)  # S dagger
+Tdg = GATE_REGISTRY.register('Tdg', T.conj().T)  # T dagger
+RHW = GATE_REGISTRY.register('RHW', [[0, 1j], [1j, 0]])  # Root of Hadamard-Walsh
 
 # Puertas de dos qubits
-CNOT = np.array([
+CNOT = GATE_REGISTRY.register('CNOT', [
     [1, 0, 0, 0],
     [0, 1, 0, 0],
     [0, 0, 0, 1],
     [0, 0, 1, 0]
-], dtype=complex)
+])
 
-CZ = np.array([
+CZ = GATE_REGISTRY.register('CZ', [
     [1, 0, 0, 0],
     [0, 1, 0, 0],
     [0, 0, 1, 0],
     [0, 0, 0, -1]
-], dtype=complex)
+])
 
-SWAP = np.array([
+SWAP = GATE_REGISTRY.register('SWAP', [
     [1, 0, 0, 0],
     [0, 0, 1, 0],
     [0, 1, 0, 0],
     [0, 0, 0, 1]
-], dtype=complex)
+])
+
+# Puertas de tres qubits
+TOFFOLI = GATE_REGISTRY.register('TOFFOLI', np.eye(8)[[0, 1, 2, 3, 4, 5, 7, 6]])  # CCNOT
+FREDKIN = GATE_REGISTRY.register('FREDKIN', np.eye(8)[[0, 1, 2, 3, 4, 6, 5, 7]])  # CSWAP
 
 # Puertas de rotación
-def rx(theta: float) -> np.ndarray:
-    """Rotación alrededor del eje X."""
+# Ángulos distintos que se guardan por constructor (caché LRU por valor exacto).
+# La caché solo compensa cuando los ángulos se repiten (intérprete, webapp);
+# el código que barre ángulos usa los constructores `*_matrix` o `*_batch`.
+ANGLE_CACHE_SIZE = 4096
+
+def rx_batch(thetas: np.ndarray) -> np.ndarray:
+    """
+    Rotaciones alrededor del eje X para un vector de ángulos.
+
+    Args:
+        thetas: Ángulos, forma (k,)
+
+    Returns:
+        np.ndarray: Matrices apiladas, forma (k, 2, 2)
+    """
+    half = np.asarray(thetas, dtype=float)[..., None, None] / 2
+    return np.cos(half) * np.eye(2) - 1j * np.sin(half) * np.array([[0, 1], [1, 0]])
+
+def ry_batch(thetas: np.ndarray) -> np.ndarray:
+    """
+    Rotaciones alrededor del eje Y para un vector de ángulos.
+
+    Args:
+        thetas: Ángulos, forma (k,)
+
+    Returns:
+        np.ndarray: Matrices apiladas, forma (k, 2, 2)
+    """
+    half = np.asarray(thetas, dtype=float)[..., None, None] / 2
+    return (np.cos(half) * np.eye(2) + np.sin(half) * np.array([[0, -1], [1, 0]])).astype(complex)
+
+def rz_batch(thetas: np.ndarray) -> np.ndarray:
+    """
+    Rotaciones alrededor del eje Z para un vector de ángulos.
+
+    Args:
+        thetas: Ángulos, forma (k,)
+
+    Returns:
+        np.ndarray: Matrices apiladas, forma (k, 2, 2)
+    """
+    half = np.asarray(thetas, dtype=float)[..., None, None] / 2
+    return np.exp(-1j * half * np.array([[1, 0], [0, -1]])) * np.eye(2)
+
+def u3_batch(thetas: np.ndarray, phis: np.ndarray, lambdas: np.ndarray) -> np.ndarray:
+    """
+    Puertas U3 para vectores de ángulos.
+
+    Args:
+        thetas: Ángulos θ, forma (k,)
+        phis: Ángulos φ, forma (k,)
+        lambdas: Ángulos λ, forma (k,)
+
+    Returns:
+        np.ndarray: Matrices apiladas, forma (k, 2, 2)
+    """
+    half = np.asarray(thetas, dtype=float)[..., None, None] / 2
+    phi = np.asarray(phis, dtype=float)[..., None, None]
+    lam = np.asarray(lambdas, dtype=float)[..., None, None]
+    # Fase de cada elemento: [[0, λ], [φ, φ+λ]]; módulo: [[cos, −sin], [sin, cos]]
+    phases = np.exp(1j * (phi * np.array([[0, 0], [1, 1]]) + lam * np.array([[0, 1], [0, 1]])))
+    return phases * (np.cos(half) * np.eye(2) + np.sin(half) * np.array([[0, -1], [1, 0]]))
+
+def rx_matrix(theta: float) -> np.ndarray:
+    """Rotación alrededor del eje X, construida sin caché."""
+    c, s = np.cos(theta / 2), np.sin(theta / 2)
+    return np.array([[c, -1j * s], [-1j * s, c]], dtype=complex)
+
+def ry_matrix(theta: float) -> np.ndarray:
+    """Rotación alrededor del eje Y, construida sin caché."""
+    c, s = np.cos(theta / 2), np.sin(theta / 2)
+    return np.array([[c, -s], [s, c]], dtype=complex)
+
+def rz_matrix(theta: float) -> np.ndarray:
+    """Rotación alrededor del eje Z, construida sin caché."""
+    phase = np.exp(-0.5j * theta)
+    return np.array([[phase, 0], [0, phase.conjugate()]], dtype=complex)
+
+def u3_matrix(theta: float, phi: float, lambda_: float) -> np.ndarray:
+    """Puerta universal U3, construida sin caché."""
+    c, s = np.cos(theta / 2), np.sin(theta / 2)
     return np.array([
-        [np.cos(theta/2), -1j*np.sin(theta/2)],
-        [-1j*np.sin(theta/2), np.cos(theta/2)]
+        [c, -np.exp(1j * lambda_) * s],
+        [np.exp(1j * phi) * s, np.exp(1j * (phi + lambda_)) * c]
     ], dtype=complex)
 
+# Constructores sin caché de cada eje de rotación
+ROTATION_MATRICES = {'x': rx_matrix, 'y': ry_matrix, 'z': rz_matrix}
+
+def _read_only(matrix: np.ndarray) -> np.ndarray:
+    """Marca una matriz de la caché como inmutable."""
+    matrix.setflags(write=False)
+    return matrix
+
+@lru_cache(maxsize=ANGLE_CACHE_SIZE)
+def _cached_rotation(axis: str, theta: float) -> np.ndarray:
+    """Rotación guardada en la caché por eje y ángulo exacto."""
+    return _read_only(ROTATION_MATRICES[axis](theta))
+
+@lru_cache(maxsize=ANGLE_CACHE_SIZE)
+def _cached_u3(theta: float, phi: float, lambda_: float) -> np.ndarray:
+    """U3 guardada en la caché por ángulos exactos."""
+    return _read_only(u3_matrix(theta, phi, lambda_))
+
+@lru_cache(maxsize=ANGLE_CACHE_SIZE)
+def _cached_controlled_rotation(axis: str, theta: float) -> np.ndarray:
+    """Rotación controlada guardada en la caché por eje y ángulo exacto."""
+    return _read_only(controlled_matrix(_cached_rotation(axis, theta)))
+
+def rx(theta: float) -> np.ndarray:
+    """Rotación alrededor del eje X (de solo lectura, guardada por ángulo)."""
+    return _cached_rotation('x', float(theta))
+
 def ry(theta: float) -> np.ndarray:
-    """Rotación alrededor del eje Y."""
-    return np.array([
-        [np.cos(theta/2), -np.sin(theta/2)],
-        [np.sin(theta/2), np.cos(theta/2)]
-    ], dtype=complex)
+    """Rotación alrededor del eje Y (de solo lectura, guardada por ángulo)."""
+    return _cached_rotation('y', float(theta))
 
 def rz(theta: float) -> np.ndarray:
-    """Rotación alrededor del eje Z."""
-    return np.array([
-        [np.exp(-1j*theta/2), 0],
-        [0, np.exp(1j*theta/2)]
-    ], dtype=complex)
+    """Rotación alrededor del eje Z (de solo lectura, guardada por ángulo)."""
+    return _cached_rotation('z', float(theta))
 
 def u3(theta: float, phi: float, lambda_: float) -> np.ndarray:
-    """Puerta universal U3."""
-    return np.array([
-        [np.cos(theta/2), -np.exp(1j*lambda_)*np.sin(theta/2)],
-        [np.exp(1j*phi)*np.sin(theta/2), np.exp(1j*(phi+lambda_))*np.cos(theta/2)]
-    ], dtype=complex)
+    """Puerta universal U3 (de solo lectura, guardada por ángulos)."""
+    return _cached_u3(float(theta), float(phi), float(lambda_))
+
+def cphase(theta: float = np.pi / 2) -> np.ndarray:
+    """Fase controlada: añade e^{iθ} al estado |11⟩."""
+    return np.diag([1, 1, 1, np.exp(1j*theta)]).astype(complex)
 
 def controlled_rotation(axis: str, theta: float) -> np.ndarray:
     """
@@ -74,14 +181,101 @@ def controlled_rotation(axis: str, theta: float) -> np.ndarray:
         theta: Ángulo de rotación
         
     Returns:
-        np.ndarray: Matriz de la puerta
+        np.ndarray: Matriz de la puerta (de solo lectura, guardada por ángulo)
+    """
+    return _cached_controlled_rotation(axis.lower(), float(theta))
+
+def controlled_matrix(matrix: np.ndarray, num_controls: int = 1) -> np.ndarray:
+    """
+    Construye la matriz completa de una puerta con controles.
+
+    Solo es necesaria para backends que trabajan con matrices; el vector
+    denso aplica las puertas controladas sin construirla
+    (`StateVectorRegister.apply_gate` con `controls`).
+
+    Args:
+        matrix: Matriz de la puerta sin controles (2^k × 2^k)
+        num_controls: Número de qubits de control (los más significativos)
+
+    Returns:
+        np.ndarray: Matriz de 2^(c+k) × 2^(c+k)
     """
-    rotation = {'x': rx, 'y': ry, 'z': rz}[axis.lower()](theta)
-    n = rotation.shape[0]
-    result = np.eye(2*n, dtype=complex)
-    result[n:2*n, n:2*n] = rotation
+    n = matrix.shape[0]
+    dim = n * 2**num_controls
+    result = np.eye(dim, dtype=complex)
+    result[dim - n:, dim - n:] = matrix
     return result
 
+# Puertas con nombre fijo, indexadas como en `circuit_operations`
+GATE_MATRICES = {
+    'I': I, 'H': H, 'X': X, 'Y': Y, 'Z': Z, 'S': S, 'T': T,
+    'Sdg': Sdg, 'Tdg': Tdg, 'RHW': RHW,
+    'CNOT': CNOT, 'CX': CNOT, 'CZ': CZ, 'SWAP': SWAP,
+    'TOFFOLI': TOFFOLI, 'CCX': TOFFOLI, 'FREDKIN': FREDKIN, 'CSWAP': FREDKIN
+}
+
+def operation_matrix(op: Dict) -> Tuple[np.ndarray, List[int]]:
+    """
+    Obtiene la matriz y los qubits de una operación de circuito.
+    
+    Args:
+        op: Operación ('single', 'two', 'three', 'rotation' o 'controlled')
+        
+    Returns:
+        Tuple[np.ndarray, List[int]]: Matriz de la puerta y qubits sobre los que actúa
+        
+    Raises:
+        ValueError: Si la puerta no está soportada
+    """
+    if op.get('type') == 'controlled':
+        matrix, controls, targets = operation_controls(op)
+        return controlled_matrix(matrix, len(controls)), controls + targets
+    gate = op.get('gate', '')
+    if op.get('type') == 'rotation' or gate in ('RX', 'RY', 'RZ'):
+        axis = (op.get('axis') or gate[-1]).lower()
+        return {'x': rx, 'y': ry, 'z': rz}[axis](op.get('theta', np.pi / 2)), [op['target']]
+    if gate == 'U3':
+        return u3(op.get('theta', 0.0), op.get('phi', 0.0), op.get('lambda', 0.0)), [op['target']]
+    if gate == 'CPHASE':
+        matrix = cphase(op.get('theta', np.pi / 2))
+    elif gate in GATE_MATRICES:
+        matrix = GATE_MATRICES[gate]
+    else:
+        raise ValueError(f"Puerta {gate} no soportada")
+    if matrix.shape == (8, 8):
+        return matrix, list(op['controls']) + [op['target']]
+    if matrix.shape == (4, 4):
+        return matrix, [op['control'], op['target']]
+    return matrix, [op['target']]
+
+def operation_controls(op: Dict) -> Tuple[np.ndarray, List[int], List[int]]:
+    """
+    Obtiene la puerta sin controles, los controles y los objetivos de una operación.
+
+    Las operaciones 'controlled' aplican la puerta `gate` (de un qubit,
+    una rotación con `theta` o SWAP) sobre `targets` (o `target`) cuando
+    todos los qubits de `controls` valen 1. El resto de operaciones se
+    devuelven sin controles.
+
+    Args:
+        op: Operación de circuito
+
+    Returns:
+        Tuple[np.ndarray, List[int], List[int]]: Matriz, controles y objetivos
+
+    Raises:
+        ValueError: Si la puerta no está soportada
+    """
+    if op.get('type') != 'controlled':
+        matrix, targets = operation_matrix(op)
+        return matrix, [], targets
+    targets = list(op['targets']) if 'targets' in op else [op['target']]
+    matrix, _ = operation_matrix({'gate': op['gate'], 'theta': op.get('theta', np.pi / 2),
+                                  'target': targets[-1], 'control': targets[0]})
+    if matrix.shape[0] != 2**len(targets):
+        raise ValueError(f"La puerta {op['gate']} no actúa sobre {len(targets)} qubits")
+    return matrix, list(op['controls']), targets
+
 def tensor_product(*states: np.ndarray) -> np.ndarray:
     """
     Calcula el producto tensorial de múltiples estados.
@@ -99,7 +293,7 @@ def tensor_product(*states: np.ndarray) -> np.ndarray:
 
 def apply_two_qubit_gate(gate: np.ndarray, control: Qubit, target: Qubit) -> Tuple[np.ndarray, np.ndarray]:
     """
-    Aplica una puerta de dos qubits.
+    Aplica una puerta de dos qubits sobre el registro compartido.
     
     Args:
         gate: Matriz de la puerta
@@ -107,24 +301,40 @@ def apply_two_qubit_gate(gate: np.ndarray, control: Qubit, target: Qubit) -> Tup
         target: Qubit objetivo
         
     Returns:
-        Tuple[np.ndarray, np.ndarray]: Estados resultantes
+        Tuple[np.ndarray, np.ndarray]: Estados (reducidos) resultantes
+        
+    Raises:
+        ValueError: Si los qubits no comparten registro
     """
-    # Calcular estado conjunto
-    state = tensor_product(control.state, target.state)
-    
-    # Aplicar puerta
-    new_state = gate @ state
-    
-    # Separar estados (aproximado)
-    n = len(control.state)
-    control_state = new_state[:n].copy()
-    target_state = new_state[n:].copy()
-    
-    # Normalizar
-    control_state /= np.linalg.norm(control_state)
-    target_state /= np.linalg.norm(target_state)
+    if control.register is not target.register:
+        raise ValueError("Los qubits deben pertenecer al mismo registro")
+        
+    # Aplicar puerta directamente sobre el vector conjunto
+    control.register.apply_gate(gate, [control.index, target.index])
+    control._log_state_change()
+    target._log_state_change()
     
-    return control_state, target_state
+    return control.state, target.state
+
+def apply_controlled_gate(gate: np.ndarray, controls: List[Qubit], targets: List[Qubit]) -> None:
+    """
+    Aplica una puerta con cualquier número de controles sobre el registro compartido.
+
+    Args:
+        gate: Matriz de la puerta sin controles
+        controls: Qubits de control
+        targets: Qubits objetivo
+
+    Raises:
+        ValueError: Si los qubits no comparten registro
+    """
+    qubits = controls + targets
+    register = qubits[0].register
+    if any(q.register is not register for q in qubits):
+        raise ValueError("Los qubits deben pertenecer al mismo registro")
+    register.apply_gate(gate, [q.index for q in targets], [q.index for q in controls])
+    for q in qubits:
+        q._log_state_change()
 
 def optimize_circuit(operations: List[Dict]) -> List[Dict]:
     """
@@ -224,6 +434,10 @@ def optimize_circuit(operations: List[Dict]) -> List[Dict]:
 def verify_circuit_identity(ops1: List[Dict], ops2: List[Dict], n_qubits: int) -> bool:
     """
     Verifica si dos circuitos son equivalentes.
+
+    Usa `core.equivalence.circuits_equivalent`, que aplica U2†·U1 a vectores
+    de estado en memoria O(2^n): la comprobación es exacta hasta
+    EXACT_MAX_QUBITS qubits y probabilística (estados aleatorios) por encima.
     
     Args:
         ops1: Primer circuito
@@ -233,52 +447,8 @@ def verify_circuit_identity(ops1: List[Dict], ops2: List[Dict], n_qubits: int) -
     Returns:
         bool: True si son equivalentes
     """
-    # Construir matrices de los circuitos
-    def build_circuit_matrix(ops: List[Dict]) -> np.ndarray:
-        dim = 2**n_qubits
-        result = np.eye(dim, dtype=complex)
-        
-        for op in ops:
-            if op['type'] == 'single':
-                # Obtener matriz de la puerta
-                gate_matrix = {
-                    'H': H, 'X': X, 'Y': Y, 'Z': Z,
-                    'S': S, 'T': T, 'RHW': RHW
-                }[op['gate']]
-                
-                # Construir matriz completa
-                target = op['target']
-                before = np.eye(2**target, dtype=complex)
-                after = np.eye(2**(n_qubits-target-1), dtype=complex)
-                full_gate = tensor_product(before, gate_matrix, after)
-                result = full_gate @ result
-                
-            elif op['type'] == 'two':
-                gate_matrix = {'CNOT': CNOT, 'CZ': CZ, 'SWAP': SWAP}[op['gate']]
-                control, target = op['control'], op['target']
-                
-                # Reordenar para tener control y target adyacentes
-                perm = list(range(n_qubits))
-                perm[control], perm[target] = target, control
-                
-                # Aplicar permutación
-                perm_matrix = np.zeros((dim, dim), dtype=complex)
-                for i in range(dim):
-                    bits = [int(b) for b in format(i, f'0{n_qubits}b')]
-                    permuted = int(''.join(str(bits[j]) for j in perm), 2)
-                    perm_matrix[permuted,i] = 1
-                    
-                # Aplicar puerta
-                result = perm_matrix.T @ gate_matrix @ perm_matrix @ result
-                
-        return result
-        
-    # Construir y comparar matrices
-    U1 = build_circuit_matrix(ops1)
-    U2 = build_circuit_matrix(ops2)
-    
-    # Comparar con tolerancia numérica
-    return np.allclose(U1, U2, atol=1e-10)
+    from core.equivalence import circuits_equivalent
+    return circuits_equivalent(ops1, ops2, n_qubits, tolerance=1e-10)
 
 def get_circuit_complexity(operations: List[Dict]) -> Dict[str, float]:
     """
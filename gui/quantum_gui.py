@@ -936,8 +936,8 @@ class QuantumGUI:
             return
         qubit_name = self.qubit_list.get(selection[0])
         if qubit_name in qubits:
-            # Eliminar qubit del diccionario
-            del qubits[qubit_name]
+            # Eliminar el qubit del diccionario y del registro compartido
+            interpret(f"DELETE {qubit_name}")
             # Eliminar operaciones del circuito asociadas a ese qubit
             try:
                 from interpreter.qlang_interpreter import circuit_operations
@@ -1,9 +1,23 @@
 from core.qubit import Qubit
 from core.bit import Bit
+from core.bit_register import BitRegister
+from core.state_vector import StateVectorRegister
 from gates.quantum_gates import H, X, Z, Y, RHW, CNOT, SWAP, CZ, apply_two_qubit_gate, get_circuit_qasm
+from gates.gate_registry import GATE_REGISTRY
 from gates.classical_gates import and_gate, or_gate, not_gate, xor_gate, nand_gate, nor_gate
 from visualizer.circuit_visualizer import QuantumVisualizer
 
+# Precisión de la sesión: 'double' (complex128) o 'single' (complex64)
+PRECISION = 'double'
+
+# Renormalizar periódicamente en lugar de tras cada puerta
+register = StateVectorRegister(renormalize_interval=64, precision=PRECISION)
+
+# Entradas de historial por qubit en sesiones interactivas largas
+HISTORY_SIZE = 1000
+
+# Bits clásicos empaquetados en un único registro
+bit_register = BitRegister()
 qubits = {}
 bits = {}
 visualizer = QuantumVisualizer()
@@ -16,9 +30,26 @@ def handle_qubit_command(tokens):
     if name in qubits:
         print(f"El qubit {name} ya existe")
     else:
-        qubits[name] = Qubit(name)
+        if not qubits:
+            # Sin qubits vivos (p. ej. tras limpiar la GUI) se reinicia el registro
+            register.clear()
+        qubits[name] = Qubit(name, register, history_size=HISTORY_SIZE)
         print(f"Qubit {name} creado")
 
+def handle_delete_command(tokens):
+    if len(tokens) != 2:
+        raise ValueError("Uso: DELETE <qubit>")
+    name = tokens[1]
+    if name not in qubits:
+        raise ValueError(f"El qubit {name} no existe")
+    # Medir y sacar el qubit del registro para que no siga ocupando memoria
+    index = qubits.pop(name).index
+    register.remove_qubit(index)
+    for qubit in qubits.values():
+        if qubit.index > index:
+            qubit.index -= 1
+    print(f"Qubit {name} eliminado")
+
 def handle_bit_command(tokens):
     if len(tokens) != 2:
         raise ValueError("Uso: BIT <nombre>")
@@ -26,7 +57,10 @@ def handle_bit_command(tokens):
     if name in bits:
         print(f"El bit {name} ya existe")
     else:
-        bits[name] = Bit(name)
+        if not bits:
+            # Sin bits vivos (p. ej. tras limpiar la GUI) se reinicia el registro
+            bit_register.clear()
+        bits[name] = Bit(name, register=bit_register)
         print(f"Bit {name} creado")
 
 def handle_set_command(tokens):
@@ -54,7 +88,9 @@ def handle_quantum_gate(gate, tokens):
         target = tokens[2]
         if target not in qubits:
             raise ValueError(f"El qubit {target} no existe")
-        gate_matrix = {"H": H, "X": X, "Z": Z, "Y": Y, "RHW": RHW}[gate]
+        # Matriz ya convertida a la precisión del registro (se crea una vez)
+        gate_matrix = GATE_REGISTRY.as_dtype({"H": H, "X": X, "Z": Z, "Y": Y, "RHW": RHW}[gate],
+                                             register.dtype)
         qubits[target].apply_gate(gate_matrix)
         visualizer.add_operation(gate, int(target[1]))
         circuit_operations.append({"type": "single", "gate": gate, "target": int(target[1])})
@@ -68,12 +104,11 @@ def handle_quantum_gate(gate, tokens):
         if control not in qubits or target not in qubits:
             raise ValueError("Uno o ambos qubits no existen")
         
-        gate_matrix = {"CNOT": CNOT, "CZ": CZ, "SWAP": SWAP}[gate]
+        gate_matrix = GATE_REGISTRY.as_dtype({"CNOT": CNOT, "CZ": CZ, "SWAP": SWAP}[gate],
+                                             register.dtype)
         qubits[control].entangled_with.add(target)
         qubits[target].entangled_with.add(control)
-        state1, state2 = apply_two_qubit_gate(gate_matrix, qubits[control].state, qubits[target].state)
-        qubits[control].state = state1
-        qubits[target].state = state2
+        apply_two_qubit_gate(gate_matrix, qubits[control], qubits[target])
         
         visualizer.add_operation(gate, int(target[1]), int(control[1]))
         circuit_operations.append({
@@ -161,6 +196,7 @@ def interpret(command):
 
     handlers = {
         "QUBIT": handle_qubit_command,
+        "DELETE": handle_delete_command,
         "BIT": handle_bit_command,
         "SET": handle_set_command,
         "GATE": handle_gate_command,
@@ -2,6 +2,9 @@ import numpy as np
 from typing import List, Dict, Optional, Tuple, Any
 from core.qubit import Qubit
 from core.bit import Bit
+from core.bit_register import BitRegister
+from core.state_vector import StateVectorRegister
+from core.precision import complex_dtype
 import json
 import logging
 
@@ -35,12 +38,28 @@ class MicrobinaryEngine:
     - Visualización 3D de estados cuánticos
     """
     
-    def __init__(self):
+    def __init__(self, precision: str = 'double', norm_tolerance: Optional[float] = None):
+        """
+        Inicializa el motor.
+        
+        Args:
+            precision: 'double' (complex128) o 'single' (complex64) para
+                el vector de estado y las matrices de las puertas
+            norm_tolerance: Deriva máxima de la norma admitida (None para
+                no comprobarla)
+        """
+        self.precision = precision
+        self.dtype = complex_dtype(precision)
+        self.register = StateVectorRegister(
+            renormalize_interval=64, precision=precision,
+            norm_tolerance=norm_tolerance)  # Vector de estado compartido
         self.qubits = {}  # Dict[str, Qubit]
-        self.bits = {}    # Dict[str, Bit]
+        self.bit_register = BitRegister()  # Bits clásicos empaquetados
+        self.bits = {}    # Dict[str, Bit] (vistas sobre bit_register)
         self.operations = []  # List[Dict]
         self.history = []     # List[Dict]
         self._gate_matrices = self._memoize_gate_matrices()  # Memoización de matrices
+        self._setup_logging()
         
     def _memoize_gate_matrices(self) -> Dict[str, np.ndarray]:
         """
@@ -104,7 +123,10 @@ class MicrobinaryEngine:
         fh.setFormatter(formatter)
         ch.setFormatter(formatter)
         
-        # Limpiar handlers existentes
+        # Cerrar y limpiar handlers existentes (el FileHandler anterior deja
+        # abierto su fichero si solo se descarta)
+        for handler in self.logger.handlers:
+            handler.close()
         self.logger.handlers.clear()
         
         self.logger.addHandler(fh)
@@ -124,7 +146,7 @@ class MicrobinaryEngine:
             if name in self.qubits:
                 self.logger.warning(f"Qubit {name} ya existe")
                 return False
-            self.qubits[name] = Qubit(name)
+            self.qubits[name] = Qubit(name, self.register)
             self._log_operation('create_qubit', {'name': name})
             return True
         except Exception as e:
@@ -145,7 +167,7 @@ class MicrobinaryEngine:
             if name in self.bits:
                 self.logger.warning(f"Bit {name} ya existe")
                 return False
-            self.bits[name] = Bit(name)
+            self.bits[name] = Bit(name, register=self.bit_register)
             self._log_operation('create_bit', {'name': name})
             return True
         except Exception as e:
@@ -259,6 +281,10 @@ class MicrobinaryEngine:
                 
             return True
             
+        except Exception as e:
+            self.logger.error(f"Error al aplicar puerta {gate}: {str(e)}")
+            return False
+
     def _log_performance_metrics(self, algorithm: str, targets: List[str], controls: List[str]):
         """
         Registra métricas de rendimiento para algoritmos avanzados.
@@ -301,10 +327,6 @@ class MicrobinaryEngine:
         }
         
         return base_scores.get(algorithm, 0.8) * (1 - 0.01 * len(targets))
-            
-        except Exception as e:
-            self.logger.error(f"Error al aplicar puerta {gate}: {str(e)}")
-            return False
 
     def measure(self, target: str) -> Optional[int]:
         """
@@ -522,17 +544,18 @@ class MicrobinaryEngine:
         """
         Memoiza las matrices de las puertas cuánticas más comunes para mejorar el rendimiento.
         
+        Las matrices salen del registro de puertas ya validadas, en la
+        precisión del motor.
+        
         Returns:
             Dict[str, np.ndarray]: Diccionario con matrices memoizadas
         """
+        from gates.gate_registry import GATE_REGISTRY
+        from gates.quantum_gates import GATE_MATRICES
+        
         return {
-            'H': 1/np.sqrt(2) * np.array([[1, 1], [1, -1]]),
-            'X': np.array([[0, 1], [1, 0]]),
-            'Y': np.array([[0, -1j], [1j, 0]]),
-            'Z': np.array([[1, 0], [0, -1]]),
-            'CNOT': np.array([[1, 0, 0, 0], [0, 1, 0, 0], [0, 0, 0, 1], [0, 0, 1, 0]]),
-            'CZ': np.array([[1, 0, 0, 0], [0, 1, 0, 0], [0, 0, 1, 0], [0, 0, 0, -1]]),
-            'SWAP': np.array([[1, 0, 0, 0], [0, 0, 1, 0], [0, 1, 0, 0], [0, 0, 0, 1]])
+            name: GATE_REGISTRY.as_dtype(GATE_MATRICES[name], self.dtype)
+            for name in ('H', 'X', 'Y', 'Z', 'RHW', 'CNOT', 'CZ', 'SWAP')
         }
         
     def _remove_identity(self, operations: List[Dict]) -> List[Dict]:
@@ -661,6 +684,7 @@ class MicrobinaryEngine:
             state = {
                 'qubits': {},
                 'bits': {},
+                'register': [[float(x.real), float(x.imag)] for x in self.register.state],
                 'operations': self.operations,
                 'history': self.history
             }
@@ -668,7 +692,8 @@ class MicrobinaryEngine:
             # Convertir estados cuánticos a formato serializable
             for name, qubit in self.qubits.items():
                 state['qubits'][name] = {
-                    'state': [complex(x) for x in qubit.state],
+                    'index': qubit.index,
+                    'state': [[float(x.real), float(x.imag)] for x in qubit.state],
                     'entangled_with': list(qubit.entangled_with)
                 }
                 
@@ -699,20 +724,21 @@ class MicrobinaryEngine:
             with open(filename, 'r') as f:
                 state = json.load(f)
                 
-            # Recrear qubits
+            # Recrear qubits en el orden de sus índices en el registro
             self.qubits = {}
-            for name, data in state['qubits'].items():
-                qubit = Qubit(name)
-                qubit.state = np.array([complex(x) for x in data['state']])
+            self.register.clear()
+            saved = sorted(state['qubits'].items(), key=lambda item: item[1]['index'])
+            for name, data in saved:
+                qubit = Qubit(name, self.register)
                 qubit.entangled_with = set(data['entangled_with'])
                 self.qubits[name] = qubit
+            self.register.state[:] = [complex(re, im) for re, im in state['register']]
                 
             # Recrear bits
             self.bits = {}
+            self.bit_register = BitRegister()
             for name, value in state['bits'].items():
-                bit = Bit(name)
-                bit.set_state(value)
-                self.bits[name] = bit
+                self.bits[name] = Bit(name, value, register=self.bit_register)
                 
             self.operations = state['operations']
             self.history = state['history']
@@ -841,10 +867,7 @@ class MicrobinaryEngine:
         target_qubit.entangled_with.add(control)
         
         from gates.quantum_gates import apply_two_qubit_gate
-        state1, state2 = apply_two_qubit_gate(
-            matrix, control_qubit.state, target_qubit.state)
-        control_qubit.state = state1
-        target_qubit.state = state2
+        apply_two_qubit_gate(matrix, control_qubit, target_qubit)
 
     def _apply_classical_gate(self, gate: str, bit1: str, bit2: str) -> int:
         """
@@ -872,6 +895,62 @@ class MicrobinaryEngine:
         
         return int(gates[gate](self.bits[bit1], self.bits[bit2]))
 
+    def apply_register_gate(self, gate: str, bits1: List[str],
+                            bits2: Optional[List[str]] = None) -> List[int]:
+        """
+        Aplica una puerta clásica a varios bits a la vez.
+        
+        Los bits se copian a registros empaquetados y la puerta se evalúa
+        palabra a palabra. NOT escribe el resultado en `bits1`, como en
+        `apply_gate`.
+        
+        Args:
+            gate: 'NOT', 'AND', 'OR', 'XOR', 'NAND' o 'NOR'
+            bits1: Nombres de los primeros operandos
+            bits2: Nombres de los segundos operandos (puertas binarias)
+            
+        Returns:
+            List[int]: Resultado para cada posición
+            
+        Raises:
+            ValueError: Si la puerta o los bits no son válidos
+        """
+        from gates.classical_gates import (
+            not_gate, and_gate, or_gate, xor_gate, nand_gate, nor_gate
+        )
+        
+        gates = {
+            'AND': and_gate,
+            'OR': or_gate,
+            'XOR': xor_gate,
+            'NAND': nand_gate,
+            'NOR': nor_gate
+        }
+        names = list(bits1) + list(bits2 or [])
+        missing = [name for name in names if name not in self.bits]
+        if missing:
+            raise ValueError(f"Bits inexistentes: {', '.join(missing)}")
+            
+        indices1 = [self.bits[name].index for name in bits1]
+        operand1 = self.bit_register.gather(indices1)
+        if gate == 'NOT':
+            result = not_gate(operand1)
+            self.bit_register.scatter(indices1, result, "NOT")
+        elif gate in gates:
+            if bits2 is None or len(bits2) != len(bits1):
+                raise ValueError(f"{gate} requiere dos listas de bits del mismo tamaño")
+            operand2 = self.bit_register.gather([self.bits[name].index for name in bits2])
+            result = gates[gate](operand1, operand2)
+        else:
+            raise ValueError(f"Puerta {gate} no reconocida")
+            
+        self._log_operation('classical_register_gate', {
+            'gate': gate,
+            'bits1': list(bits1),
+            'bits2': list(bits2 or [])
+        })
+        return result.to_array().tolist()
+
     def _remove_adjacent_pairs(self, ops: List[Dict]) -> List[Dict]:
         """
         Elimina pares de puertas idénticas adyacentes.
@@ -1038,13 +1038,12 @@ def create_custom_hardware_profile(base_profile: HardwareProfile,
     return profile
 
 def simulate_circuit_with_noise(circuit: Any, hardware_profile: HardwareProfile, 
-                              shots: int = 1024, custom_noise: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+                              shots: int = 1024, custom_noise: Optional[Dict[str, Any]] = None,
+                              seed: Optional[int] = None) -> Dict[str, Any]:
     """Simular un circuito con modelo de ruido basado en el perfil de hardware"""
-    # Esta función implementaría:
-    # 1. Creación de modelo de ruido a partir del perfil
-    # 2. Aplicación de ruido al circuito
-    # 3. Ejecución de la simulación con ruido
-    # 4. Recopilación y análisis de resultados
+    from core.executor import run_circuit, BACKENDS
+    from core.stabilizer import is_clifford_circuit
+    from core.sampling import sample_indices, indices_to_bits, apply_readout_error, counts_from_bit_samples
     
     # Crear modelo de ruido base desde el perfil
     noise_model = hardware_profile.create_noise_model()
@@ -1055,15 +1054,53 @@ def simulate_circuit_with_noise(circuit: Any, hardware_profile: HardwareProfile,
         # Por ejemplo, aumentar ciertos tipos de ruido, añadir correlaciones, etc.
         pass
     
-    # Resultados simulados (placeholder)
-    # En una implementación real, esto se integraría con un simulador cuántico
+    # El circuito puede ser una lista de operaciones o un diccionario con
+    # 'operations' y 'num_qubits'
+    if isinstance(circuit, dict):
+        operations = circuit["operations"]
+        num_qubits = circuit.get("num_qubits")
+    else:
+        operations = list(circuit)
+        num_qubits = None
+    if num_qubits is None:
+        num_qubits = 1 + max(max(op.get("target", 0), op.get("control", 0), *op.get("controls", [0]))
+                             for op in operations)
+    
+    backend = hardware_profile.simulator_backend
+    if backend not in BACKENDS:
+        backend = "auto"
+    if backend == "auto":
+        # Resolver aquí, como `run_circuit`, para saber si habrá probabilidades
+        backend = "stabilizer" if is_clifford_circuit(operations) else "statevector"
+    rng = np.random.default_rng(seed)
+    
+    # Simular una sola vez y muestrear todos los disparos de golpe: el vector
+    # denso devuelve probabilidades y se muestrea aquí; el resto muestrea dentro
+    simulation = run_circuit(operations, num_qubits, backend=backend,
+                             shots=0 if backend == "statevector" else shots, seed=seed)
+    if "counts" not in simulation:
+        samples = indices_to_bits(sample_indices(simulation["probabilities"], shots, rng), num_qubits)
+    else:
+        outcomes = simulation["counts"]
+        samples = np.repeat(np.array([[int(b) for b in k] for k in outcomes], dtype=np.uint8),
+                            list(outcomes.values()), axis=0)
+    
+    # Errores de lectura por qubit, aplicados a todas las mediciones a la vez
+    readout_errors = [
+        hardware_profile.qubit_parameters[q].readout_error if q < len(hardware_profile.qubit_parameters) else 0.0
+        for q in range(num_qubits)
+    ]
+    samples = apply_readout_error(samples, readout_errors, rng)
+    
+    circuit_gates = [op["gate"] for op in operations]
     results = {
-        "counts": {"0000": shots // 2, "1111": shots // 2},  # Distribución de resultados
+        "counts": counts_from_bit_samples(samples),  # Distribución de resultados
+        "backend": simulation["backend"],
         "success_probability": estimate_circuit_success_probability(
-            ["H", "CNOT", "X"], [0, 1, 2], hardware_profile
+            circuit_gates, list(range(num_qubits)), hardware_profile
         ),
         "execution_time_ns": estimate_circuit_execution_time(
-            ["H", "CNOT", "X"], hardware_profile
+            circuit_gates, hardware_profile
         ),
         "noise_model": str(noise_model)
     }
@@ -1135,9 +1172,47 @@ def create_benchmark_circuits() -> Dict[str, Dict[str, Any]]:
     
     return benchmark_circuits
 
+# Circuitos de referencia que escalan al número de qubits del hardware
+SCALABLE_BENCHMARKS = ("ghz_state", "error_correction")
+
+def benchmark_circuit_operations(name: str, num_qubits: Optional[int] = None) -> List[Dict[str, Any]]:
+    """Asignar las puertas de un circuito de referencia a qubits concretos"""
+    circuit_info = create_benchmark_circuits()[name]
+    n = num_qubits or circuit_info["num_qubits"]
+    two_qubit_gates = {"CNOT", "CZ", "SWAP", "CPHASE"}
+    
+    # GHZ y corrección de errores escalan a cualquier número de qubits
+    if name == "ghz_state":
+        return [{"type": "single", "gate": "H", "target": 0}] + [
+            {"type": "two", "gate": "CNOT", "control": i, "target": i + 1}
+            for i in range(n - 1)
+        ]
+    if name == "error_correction":
+        encode = [{"type": "two", "gate": "CNOT", "control": 0, "target": i} for i in range(1, n)]
+        errors = [{"type": "single", "gate": "X", "target": n // 2},
+                  {"type": "single", "gate": "Z", "target": n // 2}]
+        return ([{"type": "single", "gate": "H", "target": 0}] + encode + errors +
+                list(reversed(encode)) + [{"type": "single", "gate": "H", "target": 0}])
+    
+    # Resto: disposición lineal con vecinos próximos, repitiendo la secuencia
+    # hasta cubrir todos los qubits
+    repetitions = max(1, -(-n // circuit_info["num_qubits"]))
+    operations = []
+    cursor = 0
+    for gate in circuit_info["gates"] * repetitions:
+        if gate in two_qubit_gates and n > 1:
+            control, target = cursor, (cursor + 1) % n
+            operations.append({"type": "two", "gate": gate, "control": control, "target": target})
+            cursor = target
+        else:
+            operations.append({"type": "single", "gate": gate, "target": cursor})
+    return operations
+
 def evaluate_hardware_with_benchmarks(hardware_profile: HardwareProfile, 
                                     shots: int = 1024) -> Dict[str, Dict[str, Any]]:
     """Evaluar un perfil de hardware con circuitos de referencia"""
+    from core.executor import run_circuit
+    
     benchmark_circuits = create_benchmark_circuits()
     results = {}
     
@@ -1180,8 +1255,18 @@ def evaluate_hardware_with_benchmarks(hardware_profile: HardwareProfile,
         # Puntuación final (promedio ponderado)
         final_score = 0.5 * success_score + 0.3 * time_score + 0.2 * gate_compatibility
         
+        # Simular el circuito; los de Clifford van al backend de estabilizadores,
+        # así que GHZ y corrección de errores se ejecutan con todos los qubits
+        num_qubits = (hardware_profile.num_qubits if circuit_name in SCALABLE_BENCHMARKS
+                      else circuit_info["num_qubits"])
+        simulation = run_circuit(benchmark_circuit_operations(circuit_name, num_qubits),
+                                 num_qubits, backend="auto", shots=shots)
+        
         results[circuit_name] = {
             "status": "compatible",
+            "backend": simulation["backend"],
+            "simulated_qubits": num_qubits,
+            "counts": simulation["counts"],
             "execution_time_ns": execution_time,
             "success_probability": success_prob,
             "missing_gates": list(missing_gates) if missing_gates else None,
@@ -1,11 +1,30 @@
 # Módulo de aprendizaje automático cuántico
 from fastapi.responses import JSONResponse
 from typing import Dict, Any
+from core.parametric import ParametricCircuit
+from core.observables import PauliSum
 
 def main_view(data: Dict[str, Any]):
     """
     Vista principal: Entrenamiento y evaluación de modelos cuánticos.
+
+    Si `data` incluye `circuit`, `num_qubits` y `observable` ({cadena de
+    Pauli: coeficiente}), evalúa el valor esperado exacto del observable
+    para los `parameters` dados.
     """
+    if 'observable' in data and 'circuit' in data:
+        try:
+            circuit = ParametricCircuit(data['circuit'], int(data['num_qubits']))
+            observable = PauliSum(data['observable'])
+            state = circuit.run(data.get('parameters', {}))
+            return JSONResponse(content={
+                "status": "ok",
+                "expectation": float(observable.expectation(state)),
+                "measurement_groups": len(observable.group_commuting()),
+                "parameters": circuit.parameters
+            })
+        except (KeyError, ValueError) as e:
+            return JSONResponse(status_code=400, content={"status": "error", "message": str(e)})
     # Lógica principal (demo)
     return JSONResponse(content={"status": "ok", "message": "Modelo cuántico entrenado (demo)", "data": data})
 
@@ -0,0 +1,379 @@
+"""
+Simulador usado por la aplicación web (`webapp.simulate`).
+
+El circuito llega como una secuencia de puertas separadas por espacios
+(p. ej. "H CX RZ"). Se simula sobre dos qubits: las puertas de un qubit
+actúan sobre q0, las de dos qubits usan q0 como control y q1 como objetivo,
+y las rotaciones RX/RY/RZ usan un ángulo de π/2.
+"""
+import json
+import os
+import sqlite3
+import time
+import numpy as np
+from collections import OrderedDict
+from typing import List, Dict, Any, Optional, Tuple, Union
+from core.executor import run_circuit
+from core.sampling import sample_histogram, histogram_to_counts
+
+NUM_QUBITS = 2
+
+# Presupuesto de la caché de resultados del endpoint /simulate
+RESULT_CACHE_BYTES = 16 * 2**20
+
+# Segundos antes de volver a escribir `last_used` de una entrada leída
+LAST_USED_REFRESH = 60.0
+
+# Consultas de un proceso tras las que se vuelcan sus contadores aunque no inserte
+COUNTER_FLUSH_INTERVAL = 100
+TWO_QUBIT_GATES = {'CX', 'CNOT', 'CZ', 'SWAP'}
+ROTATION_GATES = {'RX', 'RY', 'RZ'}
+
+def parse_circuit(circuit: str) -> List[Dict]:
+    """
+    Convierte el texto del circuito en operaciones.
+
+    Args:
+        circuit: Puertas separadas por espacios
+
+    Returns:
+        List[Dict]: Operaciones en el formato de `circuit_operations`
+    """
+    operations = []
+    for gate in circuit.split():
+        if gate in TWO_QUBIT_GATES:
+            operations.append({'type': 'two', 'gate': gate, 'control': 0, 'target': 1})
+        elif gate in ROTATION_GATES:
+            operations.append({'type': 'rotation', 'gate': gate, 'axis': gate[-1].lower(),
+                               'theta': np.pi / 2, 'target': 0})
+        else:
+            operations.append({'type': 'single', 'gate': gate, 'target': 0})
+    return operations
+
+def run(circuit: str, shots: int, seed: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Simula el circuito una vez y muestrea todas las mediciones de golpe.
+
+    Args:
+        circuit: Puertas separadas por espacios
+        shots: Número de mediciones
+        seed: Semilla del generador aleatorio
+
+    Returns:
+        Dict[str, Any]: Probabilidades, vector de estado y conteos
+    """
+    result = run_circuit(parse_circuit(circuit), NUM_QUBITS, shots=shots, seed=seed)
+    probabilities = {
+        format(i, f'0{NUM_QUBITS}b'): float(p)
+        for i, p in enumerate(result['probabilities'])
+    }
+    return {
+        'probabilities': probabilities,
+        'state_vector': [[float(a.real), float(a.imag)] for a in result['state_vector']],
+        'counts': result.get('counts', {})
+    }
+
+def canonical_circuit(circuit: str) -> str:
+    """
+    Forma canónica del texto de un circuito (espacios normalizados).
+
+    Args:
+        circuit: Puertas separadas por espacios
+
+    Returns:
+        str: Puertas separadas por un único espacio
+    """
+    return ' '.join(circuit.split())
+
+class ResultCache:
+    """
+    Caché LRU de resultados limitada por bytes, con contadores de aciertos.
+
+    El tamaño de cada entrada es la longitud de su serialización JSON, que
+    es como se acaba enviando al cliente.
+    """
+
+    def __init__(self, max_bytes: int = RESULT_CACHE_BYTES):
+        """
+        Crea una caché vacía.
+
+        Args:
+            max_bytes: Presupuesto total de las entradas
+        """
+        if max_bytes <= 0:
+            raise ValueError("El presupuesto de memoria debe ser positivo")
+        self.max_bytes = max_bytes
+        self.bytes_used = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries: 'OrderedDict[Tuple, Tuple[Dict[str, Any], int]]' = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Tuple) -> Optional[Dict[str, Any]]:
+        """
+        Obtiene un resultado y lo marca como usado recientemente.
+
+        Args:
+            key: Clave de la entrada
+
+        Returns:
+            Optional[Dict[str, Any]]: Resultado guardado o None
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[0]
+
+    def put(self, key: Tuple, value: Dict[str, Any]) -> None:
+        """
+        Guarda un resultado, expulsando los menos usados si hace falta.
+
+        Args:
+            key: Clave de la entrada
+            value: Resultado serializable en JSON
+        """
+        size = len(json.dumps(value))
+        if size > self.max_bytes:
+            return
+        if key in self._entries:
+            self.bytes_used -= self._entries.pop(key)[1]
+        self._entries[key] = (value, size)
+        self.bytes_used += size
+        while self.bytes_used > self.max_bytes:
+            _, (_, evicted) = self._entries.popitem(last=False)
+            self.bytes_used -= evicted
+
+    def clear(self) -> None:
+        """Vacía la caché."""
+        self._entries.clear()
+        self.bytes_used = 0
+
+    def get_summary(self) -> Dict[str, int]:
+        """
+        Resume el uso de la caché.
+
+        Returns:
+            Dict[str, int]: Entradas, bytes usados, aciertos y fallos
+        """
+        return {
+            'entries': len(self._entries),
+            'bytes_used': self.bytes_used,
+            'max_bytes': self.max_bytes,
+            'hits': self.hits,
+            'misses': self.misses
+        }
+
+class SQLiteResultCache:
+    """
+    Caché de resultados en un fichero SQLite (modo WAL) compartido entre procesos.
+
+    Todos los trabajadores de gunicorn de una máquina leen y escriben el
+    mismo fichero, de modo que un resultado calculado por uno sirve a los
+    demás. Cada inserción y su expulsión LRU (por `last_used`) van en una
+    única transacción `BEGIN IMMEDIATE`. Las lecturas no escriben: los
+    aciertos y fallos se cuentan en el proceso y se vuelcan a la tabla
+    compartida en la siguiente inserción o resumen (o cada
+    COUNTER_FLUSH_INTERVAL consultas), y `last_used` solo se
+    refresca si tiene más de LAST_USED_REFRESH segundos. Misma interfaz
+    que `ResultCache`.
+
+    No hay una caché aparte de circuitos compilados: compilar un circuito
+    de /simulate cuesta menos que una consulta, y lo que sí se reutiliza,
+    el estado exacto de cada circuito, ya se guarda con la clave
+    ('state', circuito) de `run_cached`.
+    """
+
+    def __init__(self, path: str, max_bytes: int = RESULT_CACHE_BYTES):
+        """
+        Abre (o crea) la caché.
+
+        Args:
+            path: Fichero SQLite
+            max_bytes: Presupuesto total de las entradas
+        """
+        if max_bytes <= 0:
+            raise ValueError("El presupuesto de memoria debe ser positivo")
+        self.path = path
+        self.max_bytes = max_bytes
+        self._conn: Optional[sqlite3.Connection] = None
+        self._pid = None
+        # Aciertos y fallos de este proceso aún no volcados a `counters`
+        self.hits = 0
+        self.misses = 0
+        with self._connection() as conn:
+            conn.execute('CREATE TABLE IF NOT EXISTS entries ('
+                         'key TEXT PRIMARY KEY, value TEXT NOT NULL, '
+                         'size INTEGER NOT NULL, last_used REAL NOT NULL)')
+            conn.execute('CREATE INDEX IF NOT EXISTS entries_lru ON entries (last_used)')
+            conn.execute('CREATE TABLE IF NOT EXISTS counters ('
+                         'name TEXT PRIMARY KEY, value INTEGER NOT NULL)')
+            conn.execute("INSERT OR IGNORE INTO counters VALUES ('hits', 0), ('misses', 0)")
+
+    def _connection(self) -> sqlite3.Connection:
+        """Conexión del proceso actual (se reabre tras un fork)."""
+        if self._conn is None or self._pid != os.getpid():
+            self._conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.execute('PRAGMA synchronous=NORMAL')
+            self._pid = os.getpid()
+            # Los contadores heredados del padre no son de este proceso
+            self.hits = self.misses = 0
+        return self._conn
+
+    def _flush_counters(self, conn: sqlite3.Connection) -> None:
+        """Suma los contadores del proceso a los compartidos (dentro de una transacción)."""
+        if self.hits or self.misses:
+            conn.executemany('UPDATE counters SET value = value + ? WHERE name = ?',
+                             [(self.hits, 'hits'), (self.misses, 'misses')])
+            self.hits = self.misses = 0
+
+    @staticmethod
+    def _key(key: Tuple) -> str:
+        """Serializa la clave de forma estable entre procesos."""
+        return json.dumps(key)
+
+    def __len__(self) -> int:
+        return self._connection().execute('SELECT COUNT(*) FROM entries').fetchone()[0]
+
+    def get(self, key: Tuple) -> Optional[Dict[str, Any]]:
+        """
+        Obtiene un resultado y lo marca como usado recientemente.
+
+        Args:
+            key: Clave de la entrada
+
+        Returns:
+            Optional[Dict[str, Any]]: Resultado guardado o None
+        """
+        conn = self._connection()
+        row = conn.execute('SELECT value, last_used FROM entries WHERE key = ?',
+                           (self._key(key),)).fetchone()
+        if row is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        if self.hits + self.misses >= COUNTER_FLUSH_INTERVAL:
+            self._flush_counters(conn)
+        if row is None:
+            return None
+        now = time.time()
+        if now - row[1] > LAST_USED_REFRESH:
+            # Solo las entradas leídas hace tiempo toman el bloqueo de escritura
+            conn.execute('UPDATE entries SET last_used = ? WHERE key = ?',
+                         (now, self._key(key)))
+        return json.loads(row[0])
+
+    def put(self, key: Tuple, value: Dict[str, Any]) -> None:
+        """
+        Inserta un resultado de forma atómica y expulsa los menos usados.
+
+        Args:
+            key: Clave de la entrada
+            value: Resultado serializable en JSON
+        """
+        text = json.dumps(value)
+        if len(text) > self.max_bytes:
+            return
+        conn = self._connection()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            self._flush_counters(conn)
+            conn.execute('INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?)',
+                         (self._key(key), text, len(text), time.time()))
+            used = conn.execute('SELECT COALESCE(SUM(size), 0) FROM entries').fetchone()[0]
+            if used > self.max_bytes:
+                # Borrar las entradas más antiguas hasta volver al presupuesto
+                conn.execute(
+                    'DELETE FROM entries WHERE key IN ('
+                    'SELECT key FROM (SELECT key, SUM(size) OVER '
+                    '(ORDER BY last_used ROWS UNBOUNDED PRECEDING) AS freed '
+                    'FROM entries ORDER BY last_used) WHERE freed - size < ?)',
+                    (used - self.max_bytes,))
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+
+    @property
+    def bytes_used(self) -> int:
+        """Bytes ocupados por las entradas."""
+        return self._connection().execute(
+            'SELECT COALESCE(SUM(size), 0) FROM entries').fetchone()[0]
+
+    def clear(self) -> None:
+        """Vacía la caché."""
+        self._connection().execute('DELETE FROM entries')
+
+    def get_summary(self) -> Dict[str, int]:
+        """
+        Resume el uso de la caché (de todos los procesos).
+
+        Returns:
+            Dict[str, int]: Entradas, bytes usados, aciertos y fallos
+        """
+        conn = self._connection()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            self._flush_counters(conn)
+            counters = dict(conn.execute('SELECT name, value FROM counters'))
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        return {
+            'entries': len(self),
+            'bytes_used': self.bytes_used,
+            'max_bytes': self.max_bytes,
+            'hits': counters['hits'],
+            'misses': counters['misses']
+        }
+
+# Caché compartida por las peticiones de `webapp.simulate`: con
+# RESULT_CACHE_PATH se comparte entre los trabajadores de la máquina
+RESULT_CACHE = (SQLiteResultCache(os.environ['RESULT_CACHE_PATH'])
+                if os.environ.get('RESULT_CACHE_PATH') else ResultCache())
+
+def run_cached(circuit: str, shots: int, seed: Optional[int] = None,
+               cache: Optional[Union[ResultCache, SQLiteResultCache]] = None) -> Dict[str, Any]:
+    """
+    Igual que `run`, pero reutiliza los resultados de circuitos repetidos.
+
+    Con semilla, el resultado completo es determinista y se guarda con la
+    clave (circuito canónico, shots, semilla). Sin semilla solo se guarda
+    el estado exacto del circuito y las mediciones se vuelven a muestrear
+    en cada petición.
+
+    Args:
+        circuit: Puertas separadas por espacios
+        shots: Número de mediciones
+        seed: Semilla del generador aleatorio
+        cache: Caché a usar (por defecto `RESULT_CACHE`)
+
+    Returns:
+        Dict[str, Any]: Probabilidades, vector de estado y conteos
+    """
+    cache = cache if cache is not None else RESULT_CACHE
+    canonical = canonical_circuit(circuit)
+    if seed is not None:
+        key = ('result', canonical, shots, seed)
+        result = cache.get(key)
+        if result is None:
+            result = run(canonical, shots, seed)
+            cache.put(key, result)
+        return result
+
+    key = ('state', canonical)
+    exact = cache.get(key)
+    if exact is None:
+        exact = run(canonical, 0)
+        exact.pop('counts', None)
+        cache.put(key, exact)
+    probabilities = np.array([exact['probabilities'][format(i, f'0{NUM_QUBITS}b')]
+                              for i in range(2**NUM_QUBITS)])
+    histogram = sample_histogram(probabilities, shots)
+    return dict(exact, counts=histogram_to_counts(histogram, NUM_QUBITS))
@@ -1,6 +1,10 @@
 import re
 from typing import Dict, List, Optional, Tuple
 from gates.quantum_gates import H, X, Y, Z, CNOT, CZ, SWAP
+from core.equivalence import circuits_equivalent
+
+# Instrucciones parseadas que no actúan como puertas sobre el estado
+NON_GATE_INSTRUCTIONS = {'QREG', 'CREG', 'MEASURE', 'BARRIER'}
 
 class QuantumLanguageTranslator:
     """
@@ -135,17 +139,19 @@ class QuantumLanguageTranslator:
             # Extraer operación y qubits
             match = re.match(r'(\w+)\s+(q\[\d+\])\s*(,\s*q\[\d+\])?', line)
             if match:
-                gate, target = match.group(1), match.group(2)
-                control = match.group(3)
+                gate, first = match.group(1), match.group(2)
+                second = match.group(3)
                 
                 op = {
                     'gate': gate.upper(),
-                    'target': target,
+                    'target': first,
                     'type': 'single'
                 }
                 
-                if control:
-                    op['control'] = control.strip(', ')
+                # En QASM el control va primero: "cx control,target"
+                if second:
+                    op['control'] = first
+                    op['target'] = second.strip(', ')
                     op['type'] = 'two'
                     
                 operations.append(op)
@@ -206,7 +212,7 @@ class QuantumLanguageTranslator:
                 continue
                 
             # Buscar operaciones Qiskit
-            match = re.search(r'circuit\.(\w+)\((\[?\w+\]?,?\s*\[?\w+\]?)', line)
+            match = re.search(r'circuit\.(\w+)\((\[?\w+\]?(?:,\s*\[?\w+\]?)?)', line)
             if match:
                 gate, qubits = match.group(1), match.group(2)
                 qubits = [q.strip('[]') for q in qubits.split(',')]
@@ -275,30 +281,38 @@ class QuantumLanguageTranslator:
         """
         try:
             # Convertir ambos circuitos a representación interna
-            ops1 = self._parse_source_code(circuit1, lang1)
-            ops2 = self._parse_source_code(circuit2, lang2)
+            ops1 = self._to_numeric(self._parse_source_code(circuit1, lang1))
+            ops2 = self._to_numeric(self._parse_source_code(circuit2, lang2))
             
-            # Comparar operaciones
-            if len(ops1) != len(ops2):
-                return False
-                
-            for op1, op2 in zip(ops1, ops2):
-                if op1['gate'] != op2['gate'] or op1['type'] != op2['type']:
-                    return False
-                    
-                if op1['type'] == 'two':
-                    if (op1['control'] != op2['control'] or 
-                        op1['target'] != op2['target']):
-                        return False
-                else:
-                    if op1['target'] != op2['target']:
-                        return False
-                        
-            return True
+            # Comparar las unitarias simulando ambos circuitos
+            qubits = [q for op in ops1 + ops2 for q in (op['target'], op.get('control', 0))]
+            n_qubits = max(qubits, default=0) + 1
+            return circuits_equivalent(ops1, ops2, n_qubits)
             
         except Exception:
             return False
 
+    def _to_numeric(self, operations: List[Dict]) -> List[Dict]:
+        """
+        Convierte los qubits ('q[0]', '0') a enteros y descarta las
+        instrucciones que no son puertas (declaraciones y mediciones).
+        
+        Args:
+            operations: Operaciones parseadas
+            
+        Returns:
+            List[Dict]: Operaciones con índices de qubit enteros
+        """
+        result = []
+        for op in operations:
+            if op['gate'] in NON_GATE_INSTRUCTIONS:
+                continue
+            op = dict(op, target=int(re.search(r'\d+', str(op['target'])).group()))
+            if 'control' in op:
+                op['control'] = int(re.search(r'\d+', str(op['control'])).group())
+            result.append(op)
+        return result
+
     def get_supported_languages(self) -> List[str]:
         """
         Obtiene la lista de lenguajes soportados.
@@ -17,6 +17,7 @@ def simulate():
         # Get and validate input
         circuit = request.form.get('circuit', '').strip()
         shots = request.form.get('shots', '100')
+        seed = request.form.get('seed', '').strip()
         
         if not circuit:
             return jsonify({'error': 'Circuit cannot be empty'}), 400
@@ -33,14 +34,24 @@ def simulate():
                 return jsonify({'error': 'Shots must be between 1 and 10000'}), 400
         except ValueError:
             return jsonify({'error': 'Shots must be an integer'}), 400
+
+        # Optional seed for reproducible (and fully cacheable) results
+        try:
+            seed = int(seed) if seed else None
+            if seed is not None and seed < 0:
+                return jsonify({'error': 'Seed must be a non-negative integer'}), 400
+        except ValueError:
+            return jsonify({'error': 'Seed must be an integer'}), 400
         
-        # Run simulation
-        result = quantum_simulator.run(circuit, shots)
+        # Repeated circuits are served from the result cache; otherwise the
+        # circuit is simulated once and all shots are drawn in a single pass
+        result = quantum_simulator.run_cached(circuit, shots, seed)
         
         # Enhanced results structure
         enhanced_result = {
             'probabilities': result.get('probabilities', {}),
             'state_vector': result.get('state_vector', []),
+            'counts': result.get('counts', {}),
             'circuit_diagram': generate_circuit_diagram(circuit),
             'shots': shots
         }
@@ -51,6 +62,11 @@ def simulate():
         app.logger.error(f"Simulation error: {str(e)}")
         return jsonify({'error': 'An error occurred during simulation'}), 500
 
+@app.route('/cache_stats')
+def cache_stats():
+    """Hit/miss counters and memory usage of the simulation result cache"""
+    return jsonify(quantum_simulator.RESULT_CACHE.get_summary())
+
 def generate_circuit_diagram(circuit: str) -> str:
     """Generate a simple ASCII circuit diagram from the circuit string"""
     # This is a placeholder - you might want to use a proper visualization library